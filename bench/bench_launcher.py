@@ -0,0 +1,176 @@
+"""
+Benchmark del launcher con servidores sintéticos (bench/fake_server.py).
+
+Arranca 1, 10 y 50 servidores falsos a través de EsparcraftLauncher.start_server
+y mide, mientras corre el mainloop de Tk:
+
+  - líneas/s ingeridas por _tick_background
+  - latencia extremo a extremo (print del servidor -> línea parseada en la UI)
+  - bloqueos del loop de Tk (latido cada 16 ms que llega tarde)
+  - crecimiento de RSS del proceso del launcher
+
+Uso:
+    python bench/bench_launcher.py [--servers 1 10 50] [--duration 20] [--rate 50]
+                                   [--json bench_output.json]
+
+Los datos del launcher (servers.json, perfiles...) van a un directorio temporal:
+no toca la configuración real del usuario.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+FAKE_SERVER = os.path.join(HERE, "fake_server.py")
+
+_STAMP_RE = re.compile(r"\[t=(\d+\.\d+)\]$")
+
+
+def _percentile(data: list, q: float) -> float:
+    if not data:
+        return 0.0
+    data = sorted(data)
+    return data[min(len(data) - 1, int(len(data) * q))]
+
+
+def run_scenario(n_servers: int, duration: float, rate: float, players: int) -> dict:
+    import psutil
+    import launcher
+
+    tmp = tempfile.mkdtemp(prefix=f"esparcraft_bench_{n_servers}_")
+    app = launcher.EsparcraftLauncher()
+    app.withdraw()
+
+    servers = []
+    for i in range(n_servers):
+        path = os.path.join(tmp, f"srv{i:02d}")
+        os.makedirs(path, exist_ok=True)
+        cfg = launcher.ServerConfig(
+            id=f"bench-{i}",
+            name=f"Bench {i}",
+            jar=FAKE_SERVER,            # ruta absoluta: os.path.join la respeta
+            ram_min=1,
+            ram_max=1,
+            path=path,
+            jvm_args=f"--rate {rate} --players {players} --startup 1 --seed {i} --stamp",
+        )
+        rt = launcher.ServerRuntime(cfg)
+        app.servers[cfg.id] = rt
+        servers.append(rt)
+
+    # ---- contador de ingesta + latencia (envolviendo el parser por línea) ----
+    stats = {"lines": 0, "lat_ms": []}
+    orig_parse = app._try_parse_join_leave_from_log_line
+
+    def counting_parse(server, line):
+        stats["lines"] += 1
+        m = _STAMP_RE.search(line)
+        if m:
+            stats["lat_ms"].append((time.time() - float(m.group(1))) * 1000.0)
+        return orig_parse(server, line)
+
+    app._try_parse_join_leave_from_log_line = counting_parse
+
+    # ---- latido para detectar bloqueos del loop de Tk ----
+    beat = {"last": time.perf_counter(), "stalls": [], "interval": 0.016}
+
+    def heartbeat():
+        now = time.perf_counter()
+        late = now - beat["last"] - beat["interval"]
+        if late > 0.05:
+            beat["stalls"].append(late * 1000.0)
+        beat["last"] = now
+        app.after(int(beat["interval"] * 1000), heartbeat)
+
+    proc = psutil.Process()
+    result = {}
+
+    def start_all():
+        for rt in servers:
+            app.start_server(rt)
+
+    def begin_measure():
+        # ignora el arranque: medimos régimen estable
+        stats["lines"] = 0
+        stats["lat_ms"].clear()
+        beat["stalls"].clear()
+        launcher.PERF.reset()
+        result["rss0"] = proc.memory_info().rss
+        result["t0"] = time.perf_counter()
+        app.after(int(duration * 1000), finish)
+
+    def finish():
+        elapsed = time.perf_counter() - result["t0"]
+        rss1 = proc.memory_info().rss
+        tick = launcher.PERF.summary("tick_background")
+        lat = stats["lat_ms"]
+        result.update({
+            "servers": n_servers,
+            "duration_s": round(elapsed, 2),
+            "lines": stats["lines"],
+            "lines_per_s": round(stats["lines"] / elapsed, 1) if elapsed else 0.0,
+            "latency_ms_p50": round(_percentile(lat, 0.50), 2),
+            "latency_ms_p95": round(_percentile(lat, 0.95), 2),
+            "latency_ms_p99": round(_percentile(lat, 0.99), 2),
+            "stalls": len(beat["stalls"]),
+            "stall_ms_max": round(max(beat["stalls"], default=0.0), 1),
+            "stall_ms_total": round(sum(beat["stalls"]), 1),
+            "tick_ms_p95": round(tick["p95"], 2),
+            "rss_growth_mb": round((rss1 - result["rss0"]) / (1024 * 1024), 2),
+        })
+        for rt in servers:
+            if rt.process and rt.running:
+                try:
+                    rt.process.kill()
+                except Exception:
+                    pass
+        app.after(200, app.destroy)
+
+    app.after(0, start_all)
+    app.after(0, heartbeat)
+    app.after(3000, begin_measure)
+    app.mainloop()
+
+    for k in ("rss0", "t0"):
+        result.pop(k, None)
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark del launcher con servidores sintéticos")
+    ap.add_argument("--servers", type=int, nargs="+", default=[1, 10, 50])
+    ap.add_argument("--duration", type=float, default=20.0, help="segundos medidos por escenario")
+    ap.add_argument("--rate", type=float, default=50.0, help="líneas/s por servidor")
+    ap.add_argument("--players", type=int, default=30)
+    ap.add_argument("--json", default=None, help="guarda los resultados en este archivo")
+    args = ap.parse_args(argv)
+
+    # aislar data_path() antes de importar el launcher
+    os.environ["APPDATA"] = tempfile.mkdtemp(prefix="esparcraft_bench_data_")
+    sys.path.insert(0, ROOT)
+
+    rows = []
+    for n in args.servers:
+        print(f"-> {n} servidor(es), {args.rate:g} líneas/s cada uno, {args.duration:g}s...", flush=True)
+        rows.append(run_scenario(n, args.duration, args.rate, args.players))
+
+    cols = ["servers", "lines_per_s", "latency_ms_p50", "latency_ms_p95", "latency_ms_p99",
+            "stalls", "stall_ms_max", "tick_ms_p95", "rss_growth_mb"]
+    print()
+    print("  ".join(f"{c:>15}" for c in cols))
+    for r in rows:
+        print("  ".join(f"{r[c]:>15}" for c in cols))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
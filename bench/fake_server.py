@@ -0,0 +1,209 @@
+"""
+Servidor de Minecraft sintético para benchmarks del launcher.
+
+Imita la salida de consola de Paper (arranque, plugins, "Done", joins/leaves,
+autosaves, "Can't keep up!") a un ritmo configurable y responde a comandos
+por stdin (stop, list, save-all, save-off, save-on, say, kick, ban...).
+
+El launcher lo ejecuta con el intérprete de Python cuando el .jar del
+servidor termina en ".py"; los "argumentos JVM" se pasan al script:
+
+    --rate 200 --players 30 --stamp
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+PLUGINS = [
+    ("LuckPerms", "5.4.102"), ("Vault", "1.7.3"), ("EssentialsX", "2.20.1"),
+    ("WorldEdit", "7.2.18"), ("WorldGuard", "7.0.9"), ("ProtocolLib", "5.1.0"),
+    ("PlaceholderAPI", "2.11.5"), ("CoreProtect", "22.2"),
+]
+CHAT = ["hola", "alguien para minar?", "lag?", "gg", "tp pls", "xd", "brb", "donde esta el spawn"]
+
+_out_lock = threading.Lock()
+
+
+class FakeServer:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.pool = [f"Player{i:03d}" for i in range(args.players)]
+        self.online: list[str] = []
+        self.entity_id = 100
+        self.autosave = True
+        self.running = True
+        self.emitting = True             # False al recibir "stop"
+        self.ready = threading.Event()   # como el real: los comandos esperan a "Done"
+
+    # ---------- salida ----------
+    def log(self, msg: str, level: str = "INFO"):
+        line = f"[{time.strftime('%H:%M:%S')} {level}]: {msg}"
+        if self.args.stamp:
+            line += f" [t={time.time():.6f}]"
+        with _out_lock:
+            try:
+                sys.stdout.write(line + "\n")
+                sys.stdout.flush()
+            except (BrokenPipeError, OSError):
+                # el launcher cerró la tubería (kill): terminamos
+                self.running = False
+
+    def uuid_for(self, name: str) -> str:
+        r = random.Random(name)
+        h = "%032x" % r.getrandbits(128)
+        return f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+
+    # ---------- fases ----------
+    def boot(self):
+        t0 = time.time()
+        step = self.args.startup / 20.0
+        self.log("Starting minecraft server version 1.20.4")
+        self.log("Loading properties")
+        self.log("This server is running Paper version git-Paper-496 (MC: 1.20.4)")
+        self.log("Server Ping Player Sample Count: 12")
+        self.log("Default game type: SURVIVAL")
+        self.log("Starting Minecraft server on *:25565")
+        for name, ver in PLUGINS:
+            self.log(f"[{name}] Loading server plugin {name} v{ver}")
+            time.sleep(step * 0.25)
+        self.log('Preparing level "world"')
+        for name, ver in PLUGINS:
+            self.log(f"[{name}] Enabling {name} v{ver}")
+            time.sleep(step * 0.5)
+        for dim in ("minecraft:overworld", "minecraft:the_nether", "minecraft:the_end"):
+            self.log(f"Preparing start region for dimension {dim}")
+            for pct in (0, 18, 51, 83):
+                self.log(f"Preparing spawn area: {pct}%")
+                time.sleep(step * 0.3)
+        self.log(f'Done ({time.time() - t0:.3f}s)! For help, type "help"')
+        self.ready.set()
+
+    def save_chunks(self, flush: bool = False):
+        t = self.rng.uniform(0.05, 0.4) if flush else self.rng.uniform(0.01, 0.1)
+        for dim in ("overworld", "the_nether", "the_end"):
+            self.log(f"Saving chunks for level 'ServerLevel[world]'/minecraft:{dim}")
+        time.sleep(t)
+        self.log("ThreadedAnvilChunkStorage (world): All chunks are saved")
+        self.log("ThreadedAnvilChunkStorage (DIM-1): All chunks are saved")
+        self.log("ThreadedAnvilChunkStorage (DIM1): All chunks are saved")
+        self.log("ThreadedAnvilChunkStorage: All dimensions are saved")
+
+    def join(self, name: str):
+        self.log(f"UUID of player {name} is {self.uuid_for(name)}")
+        time.sleep(self.rng.uniform(0.0, 0.02))
+        self.entity_id += 1
+        port = self.rng.randint(40000, 65000)
+        self.log(f"{name}[/127.0.0.1:{port}] logged in with entity id {self.entity_id} "
+                 f"at ([world]{self.rng.uniform(-300, 300):.1f}, 64.0, {self.rng.uniform(-300, 300):.1f})")
+        self.log(f"{name} joined the game")
+        self.online.append(name)
+
+    def leave(self, name: str, reason: str = "Disconnected"):
+        self.log(f"{name} lost connection: {reason}")
+        self.log(f"{name} left the game")
+        if name in self.online:
+            self.online.remove(name)
+
+    def random_event(self):
+        r = self.rng.random()
+        offline = [p for p in self.pool if p not in self.online]
+        if r < 0.04 and offline:
+            self.join(self.rng.choice(offline))
+        elif r < 0.07 and self.online:
+            self.leave(self.rng.choice(self.online))
+        elif r < 0.075:
+            behind = self.rng.randint(2000, 6000)
+            self.log(f"Can't keep up! Is the server overloaded? Running {behind}ms or {behind // 50} ticks behind", "WARN")
+        elif r < 0.077 and self.autosave:
+            self.save_chunks()
+        elif self.online:
+            self.log(f"<{self.rng.choice(self.online)}> {self.rng.choice(CHAT)}")
+        else:
+            self.log("[Essentials] Saving userdata")
+
+    def run_events(self):
+        rate = max(1.0, self.args.rate)
+        interval = 1.0 / rate
+        nxt = time.perf_counter()
+        while self.running:
+            now = time.perf_counter()
+            # emite en ráfagas lo que toque para sostener el ritmo
+            while nxt <= now and self.emitting:
+                self.random_event()
+                nxt += interval
+            if not self.emitting:
+                nxt = now
+            time.sleep(min(0.01, max(0.0, nxt - time.perf_counter())))
+
+    # ---------- comandos ----------
+    def handle(self, cmd: str):
+        parts = cmd.strip().split()
+        if not parts:
+            return
+        op, rest = parts[0].lower(), parts[1:]
+        if op == "stop":
+            self.emitting = False
+            self.log("Stopping the server")
+            self.log("Stopping server")
+            for name in list(self.online):
+                self.leave(name, "Server closed")
+            self.log("Saving players")
+            self.log("Saving worlds")
+            self.save_chunks(flush=True)
+            self.running = False
+        elif op == "list":
+            self.log(f"There are {len(self.online)} of a max of 20 players online: {', '.join(self.online)}")
+        elif op == "save-all":
+            self.log("Saving the game (this may take a moment!)")
+            self.save_chunks(flush="flush" in rest)
+            self.log("Saved the game")
+        elif op == "save-off":
+            self.autosave = False
+            self.log("Automatic saving is now disabled")
+        elif op == "save-on":
+            self.autosave = True
+            self.log("Automatic saving is now enabled")
+        elif op == "say":
+            self.log(f"[Server] {' '.join(rest)}")
+        elif op in ("kick", "ban") and rest:
+            if rest[0] in self.online:
+                self.leave(rest[0], "Kicked by an operator")
+            self.log(f"{'Kicked' if op == 'kick' else 'Banned player'} {rest[0]}")
+        elif op in ("op", "deop", "pardon") and rest:
+            verb = {"op": "Made {} a server operator",
+                    "deop": "Made {} no longer a server operator",
+                    "pardon": "Unbanned {}"}[op]
+            self.log(verb.format(rest[0]))
+        else:
+            self.log("Unknown or incomplete command, see below for error")
+
+    def read_stdin(self):
+        for line in sys.stdin:
+            self.ready.wait()
+            self.handle(line)
+            if not self.running:
+                break
+        self.running = False
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rate", type=float, default=20.0, help="líneas/s en régimen")
+    ap.add_argument("--players", type=int, default=20, help="tamaño del pool de jugadores")
+    ap.add_argument("--startup", type=float, default=2.0, help="segundos hasta 'Done'")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--stamp", action="store_true", help="añade [t=epoch] a cada línea (latencia)")
+    args, _unknown = ap.parse_known_args(argv)   # ignora 'nogui' y demás
+
+    srv = FakeServer(args)
+    threading.Thread(target=srv.read_stdin, daemon=True).start()
+    srv.boot()
+    srv.run_events()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Replay determinista de logs reales a través del pipeline de ingesta del launcher.
+
+Reproduce una captura (.esplog, grabada con "⏺ Grabar" en la consola) o un
+latest.log de Paper/Vanilla por LogIngest._ingest_raw_line (paso del hilo
+lector) y LogIngest._drain_server_queue (paso de _tick_background), sin JVM
+ni ventana. Devuelve el estado final (jugadores, lag) con un digest estable y
+los tiempos de ingesta, para comparar cambios de parseo/render sobre tráfico real.
+
+Uso:
+    python bench/replay.py captura.esplog [--speed 1|10|0] [--repeat 3]
+                           [--json resultado.json] [--compare baseline.json]
+
+--speed 0 = tan rápido como se pueda (por defecto). Con --compare el proceso
+sale con código 1 si el estado o los contadores deterministas (líneas,
+líneas drenadas) difieren del baseline. El rendimiento (lines/s, tiempo de
+reloj) se informa siempre pero solo falla con --max-regression N (en %),
+porque con la misma entrada ya varía más de un 10% entre ejecuciones.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import launcher  # noqa: E402
+
+DRAIN_INTERVAL = 0.08   # igual que _tick_background
+_CLOCK_RE = re.compile(r"^\[(\d{2}):(\d{2}):(\d{2})")
+
+
+def load_lines(path: str) -> list[tuple[float, str]]:
+    """Lee una captura .esplog ("<seg>\\t<línea>") o un log plano con [HH:MM:SS]."""
+    out = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        if path.endswith(".esplog"):
+            for raw in f:
+                off, _, line = raw.rstrip("\n").partition("\t")
+                try:
+                    out.append((float(off), line))
+                except ValueError:
+                    continue
+            return out
+
+        first = None
+        last = 0.0
+        day = 0.0
+        for raw in f:
+            m = _CLOCK_RE.match(raw)
+            if m:
+                t = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + int(m.group(3)) + day
+                if first is None:
+                    first = t
+                if t - first < last - 1:      # pasó la medianoche
+                    day += 86400
+                    t += 86400
+                last = t - first
+            out.append((last, raw))
+    return out
+
+
+class ReplayIngest(launcher.LogIngest):
+    """Ingesta con reloj virtual: now() es el instante de la línea en la captura."""
+
+    def __init__(self):
+        self.clock = 0.0
+
+    def now(self) -> float:
+        return self.clock
+
+
+def replay(lines: list[tuple[float, str]], speed: float, path: str = "") -> dict:
+    cfg = launcher.ServerConfig(id="replay", name="replay", jar="", ram_min=0, ram_max=0,
+                                path=os.path.dirname(os.path.abspath(path)) if path else "")
+    server = launcher.ServerRuntime(cfg)
+    server.running = True
+    server.starting = True
+    server.begin_boot(0.0)
+
+    ing = ReplayIngest()
+    ingest_s = 0.0
+    drain_s = 0.0
+    drains_ms = []
+    pc = time.perf_counter
+
+    drained = 0
+
+    def drain():
+        nonlocal drain_s, drained
+        t = pc()
+        drained += ing._drain_server_queue(server)
+        dt = pc() - t
+        drain_s += dt
+        drains_ms.append(dt * 1000.0)
+
+    wall0 = pc()
+    last_drain = wall0
+    for off, raw in lines:
+        if speed > 0:
+            due = wall0 + off / speed
+            while True:
+                now = pc()
+                if now - last_drain >= DRAIN_INTERVAL:
+                    drain()
+                    last_drain = now
+                if now >= due:
+                    break
+                time.sleep(min(DRAIN_INTERVAL, due - now))
+
+        ing.clock = off
+        t = pc()
+        ing._ingest_raw_line(server, raw)
+        ingest_s += pc() - t
+
+        if pc() - last_drain >= DRAIN_INTERVAL:
+            drain()
+            last_drain = pc()
+    drain()
+    wall = pc() - wall0
+
+    state = {
+        "ready": server.ready,
+        "players_online": sorted(server.players.online_names()),
+        "players_offline": server.players.offline_names(),
+        "known_players": len(server.players),
+        "lag_events": [list(e) for e in server.lag_events],
+        "boot_plugins": server.boot_plugins,
+        "autosaves": list(server.autosaves),
+        "logins": [list(e) for e in server.logins],
+    }
+    digest = hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+    n = len(lines)
+    busy = ingest_s + drain_s
+    drains_ms.sort()
+    return {
+        "lines": n,
+        "drained": drained,
+        "speed": speed,
+        "wall_s": round(wall, 3),
+        "busy_s": round(busy, 4),
+        "lines_per_s": round(n / busy, 1) if busy else 0.0,
+        "ingest_us_per_line": round(ingest_s * 1e6 / n, 3) if n else 0.0,
+        "drain_us_per_line": round(drain_s * 1e6 / n, 3) if n else 0.0,
+        "drain_ms_p95": round(drains_ms[min(len(drains_ms) - 1, int(len(drains_ms) * 0.95))], 3),
+        "drain_ms_max": round(drains_ms[-1], 3),
+        "state_digest": digest,
+        "state": state,
+    }
+
+
+def compare(result: dict, baseline: dict, max_regression=None) -> list[str]:
+    """Falla por estado y contadores deterministas; el tiempo solo si se pide un límite."""
+    problems = []
+    if result["state_digest"] != baseline.get("state_digest"):
+        problems.append("el estado final difiere del baseline")
+    for key in ("lines", "drained"):
+        if key in baseline and result[key] != baseline[key]:
+            problems.append(f"{key}: {baseline[key]} -> {result[key]}")
+    base = baseline.get("lines_per_s") or 0.0
+    if base:
+        delta = (result["lines_per_s"] - base) / base * 100.0
+        print(f"lines/s: {base:.0f} -> {result['lines_per_s']:.0f} ({delta:+.1f}%)")
+        if max_regression is not None and delta < -max_regression:
+            problems.append(f"rendimiento {delta:+.1f}% (límite -{max_regression:g}%)")
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay determinista de logs del servidor")
+    ap.add_argument("capture", help=".esplog grabado por el launcher o un latest.log")
+    ap.add_argument("--speed", type=float, default=0.0, help="1, 10... o 0 = máximo")
+    ap.add_argument("--repeat", type=int, default=3, help="repeticiones (se queda con la más rápida)")
+    ap.add_argument("--json", default=None, help="guarda el resultado en este archivo")
+    ap.add_argument("--compare", default=None, help="baseline JSON a comparar")
+    ap.add_argument("--max-regression", type=float, default=None,
+                    help="% de pérdida de lines/s tolerada (sin él, el tiempo no hace fallar)")
+    args = ap.parse_args(argv)
+
+    lines = load_lines(args.capture)
+    runs = [replay(lines, args.speed, args.capture) for _ in range(max(1, args.repeat))]
+    if len({r["state_digest"] for r in runs}) != 1:
+        print("ERROR: el replay no es determinista entre repeticiones", file=sys.stderr)
+        return 2
+    best = max(runs, key=lambda r: r["lines_per_s"])
+
+    for k, v in best.items():
+        if k != "state":
+            print(f"{k:>20}: {v}")
+    print(f"{'online':>20}: {len(best['state']['players_online'])}  "
+          f"lag: {len(best['state']['lag_events'])}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(best, f, indent=4)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(best, baseline, args.max_regression)
+        for p in problems:
+            print(f"REGRESIÓN: {p}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark de arranque del launcher.
+
+1. `python -X importtime -c "import launcher"`: tiempo total de imports y los
+   módulos más caros (acumulado).
+2. Tiempo hasta el primer frame y hasta el dashboard: lanza el launcher con
+   ESPARCRAFT_STARTUP_BENCH=1, que imprime marcas "STARTUP <nombre> <epoch>"
+   y se cierra solo tras montar el dashboard.
+
+Usa un APPDATA temporal con --servers servidores sintéticos para que el
+resultado sea reproducible. --exe mide el build de PyInstaller en su lugar.
+
+Uso:
+    python bench/startup.py [--runs 5] [--servers 20] [--exe dist/EsparcraftLauncher.exe]
+                            [--json startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+
+def make_appdata(n_servers: int) -> str:
+    base = tempfile.mkdtemp(prefix="esparcraft_startup_")
+    data_dir = os.path.join(base, "EsparcraftLauncher")
+    os.makedirs(data_dir)
+    servers = []
+    for i in range(n_servers):
+        path = os.path.join(base, f"srv{i:02d}")
+        os.makedirs(path)
+        servers.append({
+            "id": f"startup-{i}", "name": f"Servidor {i}", "jar": "server.jar",
+            "ram_min": 1, "ram_max": 2, "path": path,
+        })
+    with open(os.path.join(data_dir, "servers.json"), "w", encoding="utf-8") as f:
+        json.dump(servers, f)
+    return base
+
+
+def import_times(env: dict) -> dict:
+    """Parsea la salida de -X importtime: {módulo: acumulado_us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import launcher"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    out = {}
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            out[name.strip()] = int(cumulative)
+        except ValueError:
+            continue
+    return out
+
+
+def time_to_frame(cmd: list, env: dict, timeout: float = 60.0) -> dict:
+    t0 = time.time()
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, text=True, timeout=timeout)
+    marks = {}
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[0] == "STARTUP":
+            marks[parts[1]] = (float(parts[2]) - t0) * 1000.0
+    return marks
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de arranque del launcher")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--servers", type=int, default=20)
+    ap.add_argument("--exe", default=None, help="ejecutable de PyInstaller a medir")
+    ap.add_argument("--json", default=None)
+    args = ap.parse_args(argv)
+
+    env = dict(os.environ)
+    env["APPDATA"] = make_appdata(args.servers)
+    env["ESPARCRAFT_STARTUP_BENCH"] = "1"
+
+    result = {}
+    if not args.exe:
+        imports = import_times(env)
+        top = sorted(imports.items(), key=lambda kv: kv[1], reverse=True)
+        result["import_launcher_ms"] = round(imports.get("launcher", 0) / 1000.0, 1)
+        result["top_imports_ms"] = {k: round(v / 1000.0, 1) for k, v in top[:12]}
+        print(f"import launcher: {result['import_launcher_ms']} ms")
+        for k, v in result["top_imports_ms"].items():
+            print(f"  {v:>8.1f} ms  {k}")
+
+    cmd = [args.exe] if args.exe else [sys.executable, os.path.join(ROOT, "launcher.py")]
+    frames, dashes = [], []
+    for _ in range(args.runs):
+        marks = time_to_frame(cmd, env)
+        if "first_frame" in marks:
+            frames.append(marks["first_frame"])
+        if "dashboard" in marks:
+            dashes.append(marks["dashboard"])
+
+    if frames:
+        result["first_frame_ms_median"] = round(statistics.median(frames), 1)
+        result["dashboard_ms_median"] = round(statistics.median(dashes), 1) if dashes else None
+        print(f"primer frame: {result['first_frame_ms_median']} ms (mediana de {len(frames)})")
+        print(f"dashboard:    {result['dashboard_ms_median']} ms")
+    else:
+        print("No se recibieron marcas STARTUP (¿hay display?)", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,6 +33,7 @@ py -%PY_VERSION% -m PyInstaller ^
  --windowed ^
  --collect-all customtkinter ^
  --hidden-import=customtkinter ^
+ --hidden-import=psutil ^
  --name "%APP_NAME%" ^
  %MAIN_FILE%
 
@@ -1,25 +1,44 @@
-import customtkinter as ctk
 import subprocess, os, sys, json, threading, queue
 import shutil
-import winreg
-import psutil
+import shlex
 import time
 import re
+import importlib
+import bisect
+from collections import deque
 from dataclasses import dataclass, asdict
 from uuid import uuid4
 from typing import Optional
-from tkinter import filedialog
-from tkinter import messagebox
 
 
+class _LazyModule:
+    """Importa el módulo en el primer acceso (arranque más rápido, sobre todo en el .exe)."""
 
-# ===================== CONFIG =====================
-ctk.set_appearance_mode("dark")
-ctk.set_default_color_theme("dark-blue")
+    def __init__(self, name: str):
+        self._name = name
+        self._mod = None
+
+    def __getattr__(self, attr):
+        if self._mod is None:
+            self._mod = importlib.import_module(self._name)
+        return getattr(self._mod, attr)
+
+
+ctk = _LazyModule("customtkinter")          # la ventana lo carga al crearse (launcher_app_class)
+tkinter = _LazyModule("tkinter")
+psutil = _LazyModule("psutil")
+winreg = _LazyModule("winreg")              # solo Windows: se usa tras comprobar os.name
+filedialog = _LazyModule("tkinter.filedialog")
+messagebox = _LazyModule("tkinter.messagebox")
 
+
+
+# ===================== CONFIG =====================
 APP_NAME = "Esparcraft Server Launcher"
 APP_SIZE = "1300x760"
 DATA_FILE = "servers.json"
+JAVA_CACHE_FILE = "java_cache.json"
+PLUGIN_CACHE_FILE = "plugins_cache.json"
 CREATE_NO_WINDOW = 0x08000000
 JAVA_EXE = None
 JAVA_VERSION_STR = "No detectado"
@@ -52,8 +71,11 @@ def parse_java_major(version_line: str) -> Optional[int]:
         # openjdk version "21.0.2"
         parts = version_line.split('"')
         if len(parts) >= 2:
-            major = parts[1].split(".")[0]
-            return int(major)
+            nums = parts[1].split(".")
+            # java version "1.8.0_392" -> 8
+            if nums[0] == "1" and len(nums) > 1:
+                return int(nums[1])
+            return int(nums[0].split("-")[0])
     except:
         pass
     return None
@@ -66,6 +88,7 @@ def get_java_version(java_exe: str) -> str:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
+            timeout=20,
             creationflags=CREATE_NO_WINDOW
         )
 
@@ -77,24 +100,298 @@ def get_java_version(java_exe: str) -> str:
 
     return "Versión desconocida"
 
+JAVA_REG_PATHS = [
+    r"SOFTWARE\JavaSoft\Java Runtime Environment",
+    r"SOFTWARE\JavaSoft\JDK",
+    r"SOFTWARE\Eclipse Adoptium\JDK",
+    r"SOFTWARE\Eclipse Adoptium\JRE",
+]
+
+
+def _java_stat_key(java_exe: str) -> Optional[list]:
+    """(mtime_ns, tamaño) del ejecutable real; cambia si se actualiza el JDK."""
+    try:
+        st = os.stat(java_exe)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_java_cache() -> dict:
+    """Cache de versiones: {ruta_java: {"key": [mtime_ns, size], "version": str}}"""
+    try:
+        with open(data_path(JAVA_CACHE_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def save_java_cache(cache: dict):
+    path = data_path(JAVA_CACHE_FILE)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=4)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def cached_java_version(java_exe: str, cache: dict) -> Optional[str]:
+    """Versión cacheada si el ejecutable no cambió (misma ruta, mtime y tamaño)."""
+    entry = cache.get(java_exe)
+    if not entry:
+        return None
+    key = _java_stat_key(java_exe)
+    if key is None or entry.get("key") != key:
+        return None
+    return entry.get("version")
+
+
+def probe_java_version(java_exe: str, cache: dict) -> str:
+    """Ejecuta `java -version` (lento) y guarda el resultado en la cache."""
+    version = get_java_version(java_exe)
+    key = _java_stat_key(java_exe)
+    if key is not None and version != "Versión desconocida":
+        cache[java_exe] = {"key": key, "version": version}
+        save_java_cache(cache)
+    return version
+
+
+def _java_exe_name() -> str:
+    return "java.exe" if os.name == "nt" else "java"
+
+
+def _list_subdirs(base: str) -> list[str]:
+    try:
+        with os.scandir(base) as it:
+            return [e.path for e in it if e.is_dir()]
+    except OSError:
+        return []
+
+
+def java_candidate_homes() -> list[str]:
+    """Carpetas donde suele haber JDKs/JREs instalados (pueden no existir)."""
+    homes = []
+    if os.environ.get("JAVA_HOME"):
+        homes.append(os.environ["JAVA_HOME"])
+
+    if os.name == "nt":
+        # todas las versiones registradas, no solo CurrentVersion
+        for root in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+            for reg_path in JAVA_REG_PATHS:
+                try:
+                    with winreg.OpenKey(root, reg_path) as key:
+                        i = 0
+                        while True:
+                            try:
+                                sub = winreg.EnumKey(key, i)
+                            except OSError:
+                                break
+                            i += 1
+                            try:
+                                with winreg.OpenKey(key, sub) as sk:
+                                    homes.append(winreg.QueryValueEx(sk, "JavaHome")[0])
+                            except OSError:
+                                pass
+                except OSError:
+                    pass
+
+        vendors = ("Java", "Eclipse Adoptium", "Microsoft", "Zulu", "Amazon Corretto", "BellSoft")
+        for env in ("ProgramFiles", "ProgramFiles(x86)"):
+            base = os.environ.get(env)
+            if base:
+                for vendor in vendors:
+                    homes.extend(_list_subdirs(os.path.join(base, vendor)))
+    else:
+        for base in ("/usr/lib/jvm", "/usr/java", "/opt/java"):
+            homes.extend(_list_subdirs(base))
+        for d in _list_subdirs("/Library/Java/JavaVirtualMachines"):
+            homes.append(os.path.join(d, "Contents", "Home"))
+
+    # SDKMAN / IntelliJ
+    home = os.path.expanduser("~")
+    for base in (os.path.join(home, ".sdkman", "candidates", "java"), os.path.join(home, ".jdks")):
+        homes.extend(_list_subdirs(base))
+    return homes
+
+
+def read_release_version(java_exe: str) -> Optional[str]:
+    """Lee JAVA_VERSION del archivo `release` del JDK: evita arrancar la JVM."""
+    release = os.path.join(os.path.dirname(os.path.dirname(java_exe)), "release")
+    try:
+        with open(release, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if line.startswith("JAVA_VERSION="):
+                    v = line.split("=", 1)[1].strip().strip('"')
+                    return f'java version "{v}"' if v else None
+    except OSError:
+        pass
+    return None
+
+
+def scan_java_installs(cache: dict) -> list[dict]:
+    """
+    Inventario de runtimes Java: [{path, version, major}], ordenado por major.
+    Las versiones salen de la cache, del archivo `release` o (último recurso)
+    de `java -version`, en paralelo. Actualiza y guarda la cache.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    exes = []
+    seen = set()
+    candidates = [os.path.join(h, "bin", _java_exe_name()) for h in java_candidate_homes()]
+    candidates.append(shutil.which("java"))
+    for exe in candidates:
+        if not exe:
+            continue
+        real = os.path.realpath(exe)
+        if real not in seen and os.path.isfile(real):
+            seen.add(real)
+            exes.append(real)
+
+    def probe(exe):
+        return exe, (cached_java_version(exe, cache) or read_release_version(exe) or get_java_version(exe))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(exes)))) as pool:
+        results = list(pool.map(probe, exes))
+
+    runtimes = []
+    for exe, version in results:
+        major = parse_java_major(version)
+        if major is None:
+            continue
+        key = _java_stat_key(exe)
+        if key is not None:
+            cache[exe] = {"key": key, "version": version}
+        runtimes.append({"path": exe, "version": version, "major": major})
+
+    for k in list(cache.keys()):
+        if not os.path.exists(k):
+            del cache[k]
+    save_java_cache(cache)
+
+    runtimes.sort(key=lambda r: (r["major"], r["path"]))
+    return runtimes
+
+
+# "1.20.4", también tras un punto ("mc.1.21.1") pero no dentro de otra versión ("2.1.0")
+_MC_VERSION_RE = re.compile(r"(?<!\d)(?<!\d\.)1\.(\d{1,2})(?:\.(\d{1,2}))?(?![\d])")
+# claves del manifest que de verdad llevan la versión de Minecraft (no "Manifest-Version: 1.0")
+_MANIFEST_MC_RE = re.compile(
+    r"^(?:Minecraft-Version:\s*(\S+)"
+    r"|Implementation-Version:.*\(MC:\s*([^)\s]+)\)"
+    r"|Specification-Version:\s*(1\.\d+(?:\.\d+)?)-R\d)",
+    re.M,
+)
+
+
+def jar_requirements(jar_paths) -> dict:
+    """{ruta: ((mtime_ns, tamaño) | None, requisito)} de varios jars (lee zips: para hilos de fondo)."""
+    out = {}
+    for path in jar_paths:
+        key = _java_stat_key(path)
+        out[path] = (key, jar_java_requirement(path) if key else (None, None, ""))
+    return out
+
+
+def java_range_for_mc(mc_version: str) -> tuple[Optional[int], Optional[int]]:
+    """(mínimo, máximo) de Java para una versión de Minecraft ("1.8.8", "1.20.6"...)."""
+    m = _MC_VERSION_RE.search(mc_version or "")
+    if not m:
+        return None, None
+    minor = int(m.group(1))
+    patch = int(m.group(2) or 0)
+    if minor < 17:
+        return 8, 11
+    if minor == 17:
+        return 16, None
+    if (minor, patch) < (20, 5):
+        return 17, None
+    return 21, None
+
+
+def jar_java_requirement(jar_path: str) -> tuple[Optional[int], Optional[int], str]:
+    """
+    Java requerido por un jar de servidor: (mínimo, máximo, origen).
+    Orden: version.json (vanilla/paperclip), META-INF/versions.list (paperclip),
+    nombre del archivo, claves de versión del manifest y por último el bytecode de Main-Class.
+    """
+    import zipfile
+
+    try:
+        with zipfile.ZipFile(jar_path) as z:
+            names = set(z.namelist())
+
+            if "version.json" in names:
+                data = json.loads(z.read("version.json").decode("utf-8", "ignore"))
+                jv = data.get("java_version")
+                mc = str(data.get("id") or data.get("name") or "")
+                if jv:
+                    jv = int(jv)
+                    return jv, (11 if jv <= 8 else None), f"MC {mc}".strip()
+                lo, hi = java_range_for_mc(mc)
+                if lo:
+                    return lo, hi, f"MC {mc}"
+
+            if "META-INF/versions.list" in names:
+                # "<hash>\t<id>\t<ruta>"
+                for line in z.read("META-INF/versions.list").decode("utf-8", "ignore").splitlines():
+                    parts = line.split("\t")
+                    if len(parts) >= 2:
+                        lo, hi = java_range_for_mc(parts[1])
+                        if lo:
+                            return lo, hi, f"MC {parts[1]}"
+
+            manifest = ""
+            if "META-INF/MANIFEST.MF" in names:
+                manifest = z.read("META-INF/MANIFEST.MF").decode("utf-8", "ignore")
+
+            m = _MC_VERSION_RE.search(os.path.basename(jar_path))
+            mc = m.group(0) if m else None
+            if mc is None:
+                mm = _MANIFEST_MC_RE.search(manifest)
+                mc = next((g for g in mm.groups() if g), None) if mm else None
+            if mc:
+                lo, hi = java_range_for_mc(mc)
+                if lo:
+                    return lo, hi, f"MC {mc}"
+
+            mm = re.search(r"^Main-Class:\s*(\S+)", manifest, re.M)
+            if mm:
+                cls = mm.group(1).replace(".", "/") + ".class"
+                if cls in names:
+                    head = z.read(cls)[:8]
+                    if head[:4] == b"\xca\xfe\xba\xbe":
+                        major = int.from_bytes(head[6:8], "big") - 44
+                        return major, None, "bytecode"
+    except Exception:
+        pass
+    return None, None, ""
+
+
+def pick_java_runtime(runtimes: list[dict], req_min: Optional[int], req_max: Optional[int]) -> Optional[dict]:
+    """El runtime compatible más cercano al mínimo requerido."""
+    if req_min is None:
+        return None
+    ok = [r for r in runtimes
+          if r["major"] >= req_min and (req_max is None or r["major"] <= req_max)]
+    return min(ok, key=lambda r: r["major"]) if ok else None
+
+
 def find_java_exe() -> Optional[str]:
     # 1️⃣ JAVA_HOME
     java_home = os.environ.get("JAVA_HOME")
     if java_home:
-        java = os.path.join(java_home, "bin", "java.exe")
+        java = os.path.join(java_home, "bin", _java_exe_name())
         if os.path.exists(java):
             return java
 
     # 2️⃣ Registro de Windows (Oracle / OpenJDK / Adoptium)
-    reg_paths = [
-        r"SOFTWARE\JavaSoft\Java Runtime Environment",
-        r"SOFTWARE\JavaSoft\JDK",
-        r"SOFTWARE\Eclipse Adoptium\JDK",
-        r"SOFTWARE\Eclipse Adoptium\JRE",
-    ]
-
-    for root in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
-        for reg_path in reg_paths:
+    roots = (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER) if os.name == "nt" else ()
+    for root in roots:
+        for reg_path in JAVA_REG_PATHS:
             try:
                 with winreg.OpenKey(root, reg_path) as key:
                     current, _ = winreg.QueryValueEx(key, "CurrentVersion")
@@ -120,17 +417,33 @@ def center_window(win, width, height):
     y = (win.winfo_screenheight() // 2) - (height // 2)
     win.geometry(f"{width}x{height}+{x}+{y}")
 
-def get_process_cpu_percent(proc: psutil.Process) -> float:
-    """
-    Devuelve el uso de CPU normalizado al total del sistema (0–100%)
-    """
-    return proc.cpu_percent(interval=None) / psutil.cpu_count()
+def process_cpu_slots(proc: "psutil.Process", cpu_limit: float = 0.0) -> float:
+    """CPUs que el proceso puede usar de verdad: su afinidad, recortada por el límite cgroup."""
+    try:
+        slots = float(len(proc.cpu_affinity()))
+    except (AttributeError, psutil.Error):     # macOS no tiene afinidad
+        slots = float(psutil.cpu_count() or 1)
+    if cpu_limit > 0:
+        slots = min(slots, cpu_limit)
+    return max(slots, 0.01)
 
 
 
+def process_write_bytes(server) -> Optional[int]:
+    """Bytes escritos a disco por el proceso del servidor (psutil), o None si no hay datos."""
+    p = getattr(server, "_ps_process", None)
+    if p is None:
+        return None
+    try:
+        return p.io_counters().write_bytes
+    except Exception:
+        return None
+
+
 def update_server_performance(server):
     if not server.running or not hasattr(server, "_ps_process"):
         server.cached_cpu = None
+        server.cached_cpu_share = None
         server.cached_ram = None
         return
 
@@ -140,287 +453,3111 @@ def update_server_performance(server):
 
     try:
         p = server._ps_process
-        server.cached_cpu = get_process_cpu_percent(p)
+        raw = p.cpu_percent(interval=None)
+        server.cached_cpu = raw / psutil.cpu_count()
+        server.cached_cpu_share = raw / server.cpu_slots if server.cpu_slots else None
         server.cached_ram = p.memory_info().rss / (1024 * 1024)
         server.last_perf_update = now
     except:
         server.cached_cpu = None
+        server.cached_cpu_share = None
         server.cached_ram = None
 
 
 
 
-# ===================== MODELS =====================
-@dataclass
-class ServerConfig:
-    id: str
-    name: str
-    jar: str
-    ram_min: int
-    ram_max: int
-    path: str
-    auto_restart: bool = False
-    jvm_args: str = ""  # 👈 NUEVO CAMPO para argumentos JVM
+# ===================== PLUGIN META =====================
+def _yml_scalar(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
 
 
-class ServerRuntime:
+def _yml_list(value: str) -> list[str]:
+    """Lista en línea: [a, "b", c]"""
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [_yml_scalar(v) for v in value[1:-1].split(",") if v.strip()]
+    return [_yml_scalar(value)] if value else []
 
-    def __init__(self, config: ServerConfig):
-        self.config = config
-        self.process = None
-        self.logs = []
-        self.log_queue = queue.Queue()
-        self.known_players = set()   # jugadores vistos alguna vez (por joins o usercache)
 
-        self.running = False        # proceso existe
-        self.ready = False          # aparece "Done"
-        self.stopping = False       # stop enviado
-        self.starting = False       # arrancando
+def parse_plugin_yml(text: str) -> dict:
+    """
+    Lector mínimo de plugin.yml / paper-plugin.yml (sin PyYAML): claves de primer
+    nivel, listas en línea o con "- ", bloques > / | y dependencies de Paper.
+    """
+    top = {}
+    key = None          # clave de primer nivel en curso
+    block = None        # (clave, líneas) de un escalar multilínea
+    dep_section = None  # paper: dependencies -> server/bootstrap
+    dep_indent = None
+    dep_name = None
+
+    for raw in text.splitlines():
+        if not raw.strip() or raw.lstrip().startswith("#"):
+            continue
+        indent = len(raw) - len(raw.lstrip(" "))
+        line = raw.strip()
+
+        if indent == 0 and not line.startswith("- "):
+            if block:
+                top[block[0]] = " ".join(block[1])
+                block = None
+            k, _, v = line.partition(":")
+            key = k.strip()
+            v = v.strip()
+            dep_section = dep_name = dep_indent = None
+            if v in (">", "|", ">-", "|-"):
+                block = (key, [])
+            elif v.startswith("["):
+                top[key] = _yml_list(v)
+            elif v:
+                top[key] = _yml_scalar(v)
+            continue
+
+        if block:
+            block[1].append(line)
+        elif line.startswith("- "):
+            if isinstance(top.get(key), list) or key not in top:
+                top.setdefault(key, []).append(_yml_scalar(line[2:]))
+        elif key == "dependencies":
+            k, _, v = line.partition(":")
+            k = k.strip()
+            if dep_section is None or indent <= 2:
+                dep_section = k
+                dep_indent = None
+            elif dep_indent is None or indent == dep_indent:
+                dep_indent = indent
+                dep_name = k
+                top.setdefault("depend" if dep_section == "server" else "_bootstrap", []).append(k)
+            elif dep_name and k == "required" and _yml_scalar(v).lower() == "false":
+                # opcional -> softdepend
+                deps = top.get("depend", [])
+                if dep_name in deps:
+                    deps.remove(dep_name)
+                    top.setdefault("softdepend", []).append(dep_name)
+
+    if block:
+        top[block[0]] = " ".join(block[1])
+    return top
+
+
+def read_plugin_meta(jar_path: str) -> dict:
+    """Metadatos de un plugin leyendo solo su descriptor del zip (directorio central + 1 entrada)."""
+    import zipfile
+    meta = {"name": "", "version": "", "main": "", "api_version": "", "authors": [],
+            "depend": [], "softdepend": [], "description": "", "paper": False, "error": ""}
+    try:
+        with zipfile.ZipFile(jar_path) as z:
+            names = set(z.namelist())
+            for desc in ("paper-plugin.yml", "plugin.yml"):
+                if desc in names:
+                    data = parse_plugin_yml(z.read(desc).decode("utf-8", "ignore"))
+                    meta["paper"] = desc == "paper-plugin.yml"
+                    break
+            else:
+                meta["error"] = "sin plugin.yml"
+                return meta
+    except Exception as e:
+        meta["error"] = str(e) or type(e).__name__
+        return meta
 
-        self.last_perf_update = 0
-        self.cached_cpu = None
-        self.cached_ram = None
+    def as_list(v):
+        return v if isinstance(v, list) else _yml_list(v) if isinstance(v, str) else []
 
-            # ---- Players tracking ----
-        self.players_online: list[str] = []
-        self.players_offline: list[str] = []   # historial simple de vistos (no “todos los del server”)
-        self._players_online_set = set()
-        self._players_offline_set = set()
-        self.last_players_update = 0.0
-        self.players_dirty = True  # fuerza render inicial en la vista jugadores
-        self.usercache = {}        # name_lower -> uuid string (sin guiones normalmente)
+    meta["name"] = str(data.get("name", ""))
+    meta["version"] = str(data.get("version", ""))
+    meta["main"] = str(data.get("main", ""))
+    meta["api_version"] = str(data.get("api-version", ""))
+    meta["description"] = str(data.get("description", ""))
+    meta["authors"] = as_list(data.get("authors", [])) or as_list(data.get("author", ""))
+    meta["depend"] = as_list(data.get("depend", []))
+    meta["softdepend"] = as_list(data.get("softdepend", []))
+    return meta
 
-        self.players_changed = set()  # nombres que cambiaron (join/leave)
 
+def _plugin_cache_key(jar_path: str) -> str:
+    # sin ".disabled": activar/desactivar (rename conserva mtime) no invalida
+    return os.path.abspath(jar_path[:-len(".disabled")] if jar_path.endswith(".disabled") else jar_path)
 
-    @property
-    def status(self):
-        return "online" if self.running else "offline"
 
+def load_plugin_meta_cache() -> dict:
+    """Cache de metadatos: {ruta_jar: {"key": [mtime_ns, size], "meta": {...}}}"""
+    try:
+        with open(data_path(PLUGIN_CACHE_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
 
-# ===================== APP =====================
-class EsparcraftLauncher(ctk.CTk):
-    def _players_ui_make_online_card(self, server: ServerRuntime, parent, name: str):
-        """Crea una tarjeta compacta (username + uuid + botones) y la devuelve."""
-        ops_set = { (o.get("name","") or "").lower() for o in self._read_ops(server) }
-        uuid = self._uuid_for_player(server, name)
 
-        name_font = ctk.CTkFont(size=12, weight="bold")
-        sub_font = ctk.CTkFont(size=10)
+def save_plugin_meta_cache(cache: dict):
+    path = data_path(PLUGIN_CACHE_FILE)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
 
-        row = ctk.CTkFrame(parent, corner_radius=12)
-        row.grid_columnconfigure(0, weight=1)
 
-        left = ctk.CTkFrame(row, fg_color="transparent")
-        left.grid(row=0, column=0, sticky="w", padx=10, pady=8)
+def cached_plugin_meta(jar_path: str, cache: dict) -> Optional[dict]:
+    """Metadatos cacheados si el jar no cambió (misma ruta, mtime y tamaño): solo un stat."""
+    entry = cache.get(_plugin_cache_key(jar_path))
+    if not entry:
+        return None
+    if entry.get("key") != _java_stat_key(jar_path):
+        return None
+    return entry.get("meta")
 
-        top = ctk.CTkFrame(left, fg_color="transparent")
-        top.pack(anchor="w")
 
-        name_label = ctk.CTkLabel(top, text=name, font=name_font)
-        name_label.pack(side="left")
+def scan_plugins_meta(jar_paths: list[str]) -> list[tuple]:
+    """
+    Lee en paralelo los metadatos de los jars: [(ruta, clave stat, meta)].
+    No toca la cache (puede correr en un hilo): se fusiona con merge_plugin_meta.
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
-        op_badge = ctk.CTkLabel(
-            top, text="OP", text_color="white",
-            fg_color="#f59e0b", corner_radius=10, padx=7, pady=1
-        )
-        if name.lower() in ops_set:
-            op_badge.pack(side="left", padx=(6, 0))
+    if not jar_paths:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(jar_paths)))) as pool:
+        return list(pool.map(lambda p: (p, _java_stat_key(p), read_plugin_meta(p)), jar_paths))
+
+
+def merge_plugin_meta(cache: dict, results: list[tuple]) -> dict:
+    """Mete en la cache lo leído por scan_plugins_meta, purga jars borrados y la guarda. {ruta: meta}."""
+    out = {}
+    for path, key, meta in results:
+        out[path] = meta
+        if key is not None:
+            cache[_plugin_cache_key(path)] = {"key": key, "meta": meta}
+
+    for k in list(cache.keys()):
+        if not (os.path.exists(k) or os.path.exists(k + ".disabled")):
+            del cache[k]
+    save_plugin_meta_cache(cache)
+    return out
+
+
+# ===================== RESOURCES =====================
+# prioridad -> (clase de Windows en psutil, nice en Linux/macOS)
+PROCESS_PRIORITIES = {
+    "baja": ("IDLE_PRIORITY_CLASS", 19),
+    "por debajo de normal": ("BELOW_NORMAL_PRIORITY_CLASS", 10),
+    "normal": ("NORMAL_PRIORITY_CLASS", 0),
+    "por encima de normal": ("ABOVE_NORMAL_PRIORITY_CLASS", -5),
+    "alta": ("HIGH_PRIORITY_CLASS", -10),
+}
+CGROUP_ROOT = "/sys/fs/cgroup"
+CGROUP_PERIOD = 100000          # µs de cpu.max
+
+
+def parse_cpu_list(spec: str) -> list[int]:
+    """'0-3,8,10-11' -> [0, 1, 2, 3, 8, 10, 11] (formato de cpulist de Linux)."""
+    cpus = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            a, b = part.split("-", 1)
+            cpus.update(range(int(a), int(b) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
 
-        uuid_label = ctk.CTkLabel(left, text=f"UUID: {uuid}", font=sub_font, text_color="#9ca3af")
-        uuid_label.pack(anchor="w", pady=(2, 0))
 
-        right = ctk.CTkFrame(row, fg_color="transparent")
-        right.grid(row=0, column=1, sticky="e", padx=10, pady=8)
+def format_cpu_list(cpus: list[int]) -> str:
+    """Inverso de parse_cpu_list: [0, 1, 2, 3, 8] -> '0-3,8'."""
+    out = []
+    cpus = sorted(set(cpus))
+    i = 0
+    while i < len(cpus):
+        j = i
+        while j + 1 < len(cpus) and cpus[j + 1] == cpus[j] + 1:
+            j += 1
+        out.append(str(cpus[i]) if i == j else f"{cpus[i]}-{cpus[j]}")
+        i = j + 1
+    return ",".join(out)
 
-        def _send_cmd(cmd: str):
-            if not server.running or not server.process:
-                return
-            try:
-                server.process.stdin.write(cmd + "\n")
-                server.process.stdin.flush()
-            except Exception:
-                pass
 
-        def kick_player():
-            if messagebox.askyesno("Kick", f"¿Expulsar a {name}?"):
-                _send_cmd(f"kick {name}")
+def _read_sys(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
 
-        def ban_player():
-            if messagebox.askyesno("Ban", f"¿Banear a {name}?"):
-                _send_cmd(f"ban {name}")
 
-        def deop_player():
-            if messagebox.askyesno("DeOP", f"¿Quitar OP a {name}?"):
-                _send_cmd(f"deop {name}")
+def cpu_nodes() -> list[list[int]]:
+    """
+    CPUs de cada nodo NUMA (Linux), ordenadas por núcleo físico para que los
+    hilos SMT hermanos vayan juntos. Fuera de Linux: un único nodo con todas.
+    """
+    nodes = []
+    base = "/sys/devices/system/node"
+    if sys.platform.startswith("linux") and os.path.isdir(base):
+        for name in sorted(os.listdir(base)):
+            if name.startswith("node") and name[4:].isdigit():
+                cpulist = _read_sys(os.path.join(base, name, "cpulist"))
+                if cpulist:
+                    nodes.append(parse_cpu_list(cpulist))
+    if not nodes:
+        nodes = [list(range(os.cpu_count() or 1))]
 
-        btn_style = dict(width=54, height=24, fg_color="#374151", hover_color="#4b5563")
-        ctk.CTkButton(right, text="Kick", command=kick_player, **btn_style).pack(side="left", padx=(0, 8))
-        ctk.CTkButton(right, text="Ban", command=ban_player,
-                    fg_color="#7f1d1d", hover_color="#450a0a",
-                    width=54, height=24).pack(side="left", padx=(0, 8))
-        ctk.CTkButton(right, text="DeOP", command=deop_player, **btn_style).pack(side="left")
+    def core_key(cpu: int):
+        siblings = _read_sys(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list")
+        return (min(parse_cpu_list(siblings)) if siblings else cpu, cpu)
 
-        # guarda refs para updates
-        row._name_label = name_label
-        row._uuid_label = uuid_label
-        row._op_badge = op_badge
-        return row
+    return [sorted(n, key=core_key) for n in nodes]
 
 
-    def _players_ui_update_online_card(self, server: ServerRuntime, card, name: str):
-        """Actualiza uuid y badge OP de una tarjeta existente."""
-        ops_set = { (o.get("name","") or "").lower() for o in self._read_ops(server) }
-        uuid = self._uuid_for_player(server, name)
+def plan_affinity(servers: list[tuple[str, float]], nodes: list[list[int]], reserve: int = 1) -> dict[str, list[int]]:
+    """
+    Reparte CPUs entre servidores [(id, peso)] sin solapes: cuota proporcional
+    al peso (mínimo 1), cada servidor dentro de un solo nodo NUMA si cabe, y
+    `reserve` CPUs del primer nodo libres para el sistema y el launcher.
+    Si no hay CPUs para todos, los que se quedan sin ellas comparten el nodo más grande.
+    """
+    free = [list(n) for n in nodes]
+    if reserve and sum(len(n) for n in free) > reserve + len(servers):
+        free[0] = free[0][reserve:]
+    total = sum(len(n) for n in free)
+    weight_sum = sum(max(w, 0.1) for _, w in servers) or 1.0
+
+    plan = {}
+    for sid, weight in sorted(servers, key=lambda s: (-s[1], s[0])):
+        want = max(1, int(total * max(weight, 0.1) / weight_sum))
+        node = max(range(len(free)), key=lambda i: len(free[i]))
+        if len(free[node]) >= want:
+            plan[sid] = free[node][:want]
+            free[node] = free[node][want:]
+            continue
+        # no cabe en un nodo: se toma de varios, empezando por el más libre
+        cpus = []
+        for i in sorted(range(len(free)), key=lambda i: -len(free[i])):
+            take = free[i][:want - len(cpus)]
+            cpus += take
+            free[i] = free[i][len(take):]
+            if len(cpus) >= want:
+                break
+        if not cpus:
+            # sin CPUs libres: compartir el nodo completo más grande
+            cpus = list(max(nodes, key=len))
+        plan[sid] = cpus
+    return plan
+
+
+def _cgroup_self() -> Optional[str]:
+    """Ruta cgroup v2 del proceso del launcher ("0::/user.slice/...")."""
+    data = _read_sys("/proc/self/cgroup")
+    if not data:
+        return None
+    for line in data.splitlines():
+        if line.startswith("0::"):
+            return line[3:]
+    return None
 
-        card._name_label.configure(text=name)
-        card._uuid_label.configure(text=f"UUID: {uuid}")
 
-        # mostrar/ocultar OP badge
-        # (pack_info falla si no está packed; usamos try)
-        if name.lower() in ops_set:
-            try:
-                card._op_badge.pack_info()
-            except Exception:
-                card._op_badge.pack(side="left", padx=(6, 0))
-        else:
+def apply_cgroup_limits(pid: int, key: str, cpu_limit: float, memory_gb: int) -> str:
+    """
+    Mete el proceso en un cgroup v2 propio (esparcraft-<key>, hermano del cgroup
+    del launcher) con cpu.max y memory.max. Devuelve la ruta; lanza OSError si
+    no hay cgroup v2 o no hay permiso (p. ej. sin delegación de systemd).
+    """
+    if not os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+        raise OSError("cgroup v2 no disponible")
+    own = _cgroup_self()
+    if own is None:
+        raise OSError("no se pudo leer /proc/self/cgroup")
+    parent = os.path.join(CGROUP_ROOT, os.path.dirname(own).lstrip("/"))
+    group = os.path.join(parent, f"esparcraft-{key}")
+
+    def write(path: str, value: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(value)
+
+    # solo los controladores con límite: el otro puede no estar habilitado y su archivo no existir
+    limits = {}
+    if cpu_limit > 0:
+        limits["cpu"] = ("cpu.max", f"{int(cpu_limit * CGROUP_PERIOD)} {CGROUP_PERIOD}")
+    if memory_gb > 0:
+        limits["memory"] = ("memory.max", str(memory_gb * 1024 ** 3))
+    enabled = (_read_sys(os.path.join(parent, "cgroup.subtree_control")) or "").split()
+    missing = [c for c in limits if c not in enabled]
+    if missing:
+        write(os.path.join(parent, "cgroup.subtree_control"), " ".join("+" + c for c in missing))
+
+    created = not os.path.isdir(group)
+    os.makedirs(group, exist_ok=True)
+    try:
+        for filename, value in limits.values():
+            write(os.path.join(group, filename), value)
+        write(os.path.join(group, "cgroup.procs"), str(pid))
+    except OSError:
+        if created:
             try:
-                card._op_badge.pack_forget()
-            except Exception:
+                os.rmdir(group)     # vacío: no dejar un esparcraft-<id> a medias
+            except OSError:
                 pass
+        raise
+    return group
 
 
-    def _players_ui_sync_online(self, server: ServerRuntime):
-        """
-        Sincroniza ONLINE incremental:
-        - agrega tarjetas nuevas
-        - elimina tarjetas de jugadores que ya no están
-        - reordena según server.players_online (mantiene orden de esa lista)
-        - aplica búsqueda
-        """
-        ui = getattr(self, "_players_ui", None)
-        if not ui or ui.get("server_id") != server.config.id:
-            return
-        if ui["tab_var"].get() != "ONLINE":
-            return
+def apply_process_resources(proc: "psutil.Process", cfg, cpus: Optional[list[int]]) -> list[str]:
+    """Afinidad, prioridad y límites cgroup para el proceso recién lanzado. Devuelve mensajes para el log."""
+    msgs = []
+    if cpus:
+        try:
+            proc.cpu_affinity(cpus)
+            msgs.append(f"CPUs {format_cpu_list(cpus)}")
+        except (AttributeError, ValueError, psutil.Error) as e:     # macOS no tiene afinidad
+            msgs.append(f"no se pudo fijar la afinidad: {e}")
 
-        parent = ui["list_frame"]
-        cards = ui["cards_online"]
-        q = ui["search_var"].get().strip().lower()
+    prio = PROCESS_PRIORITIES.get(cfg.priority)
+    if prio and cfg.priority != "normal":
+        try:
+            proc.nice(getattr(psutil, prio[0]) if os.name == "nt" else prio[1])
+            msgs.append(f"prioridad {cfg.priority}")
+        except (AttributeError, psutil.Error) as e:
+            msgs.append(f"no se pudo cambiar la prioridad ({cfg.priority}): {e}")
 
-        # refrescar usercache (opcional: solo cuando hay cambios)
-        self._load_usercache(server)
-        # sanitizar lista (por si quedaron duplicados)
-        seen = set()
-        clean = []
-        for n in server.players_online:
-            if n not in seen:
-                seen.add(n)
-                clean.append(n)
-        server.players_online = clean
-        server._players_online_set = set(clean)
-        desired = list(server.players_online)
-
-        # eliminar tarjetas de los que ya no están online
-        for name in list(cards.keys()):
-            if name not in server._players_online_set:
-                cards[name].destroy()
-                del cards[name]
+    if (cfg.cpu_limit > 0 or cfg.memory_limit_gb > 0) and sys.platform.startswith("linux"):
+        try:
+            group = apply_cgroup_limits(proc.pid, cfg.id, cfg.cpu_limit, cfg.memory_limit_gb)
+            limits = []
+            if cfg.cpu_limit > 0:
+                limits.append(f"{cfg.cpu_limit:g} CPUs")
+            if cfg.memory_limit_gb > 0:
+                limits.append(f"{cfg.memory_limit_gb} GB")
+            msgs.append(f"cgroup {', '.join(limits)} ({group})")
+        except OSError as e:
+            msgs.append(f"sin límites cgroup: {e}")
+    return msgs
+
+
+# ===================== JVM PROFILES =====================
+# Cada perfil tiene versiones numeradas; "id" usa la última y "id@N" la fija.
+# Una versión es f(ctx) -> (flags, notas) con ctx = {ram_max, java_major, cores, large_pages}.
+def _jvm_g1_minecraft_v1(ctx: dict) -> tuple[list[str], list[str]]:
+    big = ctx["ram_max"] >= 12
+    flags = [
+        "-XX:+UseG1GC", "-XX:+ParallelRefProcEnabled", "-XX:MaxGCPauseMillis=200",
+        "-XX:+UnlockExperimentalVMOptions", "-XX:+DisableExplicitGC", "-XX:+AlwaysPreTouch",
+        f"-XX:G1NewSizePercent={40 if big else 30}", f"-XX:G1MaxNewSizePercent={50 if big else 40}",
+        f"-XX:G1HeapRegionSize={16 if big else 8}M", f"-XX:G1ReservePercent={15 if big else 20}",
+        "-XX:G1HeapWastePercent=5", "-XX:G1MixedGCCountTarget=4",
+        f"-XX:InitiatingHeapOccupancyPercent={20 if big else 15}",
+        "-XX:G1MixedGCLiveThresholdPercent=90", "-XX:G1RSetUpdatingPauseTimePercent=5",
+        "-XX:SurvivorRatio=32", "-XX:+PerfDisableSharedMem", "-XX:MaxTenuringThreshold=1",
+        "-Dusing.aikars.flags=https://mcflags.emc.gs", "-Daikars.new.flags=true",
+    ]
+    return flags, []
+
+
+def _jvm_g1_minecraft_v2(ctx: dict) -> tuple[list[str], list[str]]:
+    """v1 + hilos de GC según las CPUs del servidor + páginas grandes."""
+    flags, notes = _jvm_g1_minecraft_v1(ctx)
+    cores = ctx["cores"]
+    flags += [f"-XX:ParallelGCThreads={cores}", f"-XX:ConcGCThreads={max(1, cores // 4)}"]
+    flags += _jvm_large_page_flags(ctx, notes)
+    return flags, notes
+
+
+def _jvm_zgc_generational_v1(ctx: dict) -> tuple[list[str], list[str]]:
+    major = ctx["java_major"]
+    notes = []
+    if major is not None and major < 21:
+        notes.append(f"Java {major} no tiene ZGC generacional (Java 21+): se usa G1 para Minecraft")
+        flags, more = _jvm_g1_minecraft_v2(ctx)
+        return flags, notes + more
+    flags = ["-XX:+UseZGC"]
+    if major is None or major < 23:
+        flags.append("-XX:+ZGenerational")     # desde Java 23 es el modo por defecto (y el flag está obsoleto)
+    cores = ctx["cores"]
+    flags += [
+        "-XX:+AlwaysPreTouch", "-XX:+DisableExplicitGC", "-XX:+PerfDisableSharedMem",
+        f"-XX:ConcGCThreads={max(1, cores // 4)}",
+        f"-XX:SoftMaxHeapSize={max(1, int(ctx['ram_max'] * 1024 * 0.9))}M",
+    ]
+    flags += _jvm_large_page_flags(ctx, notes)
+    return flags, notes
+
+
+def _jvm_low_memory_v1(ctx: dict) -> tuple[list[str], list[str]]:
+    """Servidores pequeños (≤ 4 GB): Serial si apenas hay CPU o RAM, G1 compacto si no."""
+    notes = []
+    if ctx["ram_max"] <= 2 or ctx["cores"] <= 2:
+        flags = ["-XX:+UseSerialGC"]
+    else:
+        flags = ["-XX:+UseG1GC", "-XX:MaxGCPauseMillis=100", "-XX:G1HeapRegionSize=4M",
+                 "-XX:+ParallelRefProcEnabled", f"-XX:ParallelGCThreads={min(ctx['cores'], 4)}"]
+    flags += ["-XX:+DisableExplicitGC", "-XX:MaxMetaspaceSize=256M",
+              "-XX:ReservedCodeCacheSize=128M", "-XX:+PerfDisableSharedMem"]
+    if flags[0] == "-XX:+UseG1GC" or (ctx["java_major"] or 0) >= 18:
+        flags.append("-XX:+UseStringDeduplication")     # con Serial solo desde Java 18
+    if ctx["ram_max"] > 4:
+        notes.append(f"{ctx['ram_max']:g} GB es mucho para este perfil: mejor G1 para Minecraft")
+    return flags, notes
+
+
+JVM_PROFILES = {
+    "g1-minecraft": {"title": "G1 para Minecraft", "versions": {1: _jvm_g1_minecraft_v1, 2: _jvm_g1_minecraft_v2}},
+    "zgc-generational": {"title": "ZGC generacional (Java 21+)", "versions": {1: _jvm_zgc_generational_v1}},
+    "low-memory": {"title": "Poca memoria (≤ 4 GB)", "versions": {1: _jvm_low_memory_v1}},
+}
+
+
+def parse_jvm_profile(value: str) -> tuple[str, Optional[int]]:
+    """'g1-minecraft@1' -> ('g1-minecraft', 1); sin @ la versión es None (la última)."""
+    name, _, ver = (value or "").strip().partition("@")
+    try:
+        return name, int(ver) if ver else None
+    except ValueError:
+        return name, None
 
-        # crear/actualizar tarjetas requeridas
-        for name in desired:
-            if name not in cards:
-                cards[name] = self._players_ui_make_online_card(server, parent, name)
-            else:
-                self._players_ui_update_online_card(server, cards[name], name)
 
-        # reordenar + filtrar por búsqueda
-        visible_count = 0
-        for i, name in enumerate(desired):
-            card = cards.get(name)
-            if not card:
-                continue
+def detect_large_pages(heap_gb: int) -> Optional[str]:
+    """'hugetlbfs' si hay páginas grandes reservadas para todo el heap, 'thp' si THP está en madvise/always (Linux)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        info = {}
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                info[key] = rest.split()
+        total = int(info.get("HugePages_Total", ["0"])[0])
+        size_kb = int(info.get("Hugepagesize", ["0"])[0])
+        if total and total * size_kb >= heap_gb * 1024 * 1024:
+            return "hugetlbfs"
+    except (OSError, ValueError, IndexError):
+        pass
+    thp = _read_sys("/sys/kernel/mm/transparent_hugepage/enabled") or ""
+    if "[madvise]" in thp or "[always]" in thp:
+        return "thp"
+    return None
 
-            # filtro búsqueda
-            if q and (q not in name.lower()) and (q not in self._uuid_for_player(server, name).lower()):
-                card.grid_forget()
-                continue
 
-            card.grid(row=visible_count, column=0, sticky="ew", padx=10, pady=6)
-            visible_count += 1
+def _jvm_large_page_flags(ctx: dict, notes: list[str]) -> list[str]:
+    kind = ctx.get("large_pages")
+    if kind == "hugetlbfs":
+        notes.append("páginas grandes reservadas (hugetlbfs): -XX:+UseLargePages")
+        return ["-XX:+UseLargePages"]
+    if kind == "thp" and (ctx["java_major"] or 0) >= 15:
+        notes.append("Transparent Huge Pages en madvise/always: -XX:+UseTransparentHugePages")
+        return ["-XX:+UseTransparentHugePages"]
+    return []
+
+
+def split_jvm_args(text: str) -> list[str]:
+    """Argumentos con comillas ("-Dx=a b"); en Windows la barra invertida es literal (rutas)."""
+    lex = shlex.shlex(text or "", posix=True)
+    lex.whitespace_split = True
+    lex.commenters = ""
+    if os.name == "nt":
+        lex.escape = ""
+    return list(lex)
+
+
+def jvm_flag_key(flag: str) -> str:
+    """Clave para sustituir flags: -XX:+Foo / -XX:-Foo / -XX:Foo=1 -> XX:Foo, -Dx=y -> D:x, -Xmx4G -> -Xmx."""
+    if flag.startswith("-XX:"):
+        body = flag[4:].lstrip("+-")
+        return "XX:" + body.split("=", 1)[0]
+    if flag.startswith("-D"):
+        return "D:" + flag[2:].split("=", 1)[0]
+    for prefix in ("-Xmx", "-Xms", "-Xss", "-Xmn"):
+        if flag.startswith(prefix):
+            return prefix
+    return flag
+
+
+def _heap_gb(flag: str) -> Optional[float]:
+    """-Xmx12G / -Xmx12288m / -Xmx1048576k -> GB."""
+    m = re.fullmatch(r"-Xm[sx](\d+)([kKmMgG]?)", flag)
+    if not m:
+        return None
+    scale = {"": 1 / 1024 ** 3, "k": 1 / 1024 ** 2, "m": 1 / 1024, "g": 1}[m.group(2).lower()]
+    return int(m.group(1)) * scale
+
+
+def merge_jvm_flags(base: list[str], overrides: list[str]) -> list[str]:
+    """
+    Los flags propios sustituyen en su sitio a los del perfil con la misma clave
+    (o se añaden al final); "!flag" quita del perfil los de esa clave.
+    """
+    out = list(base)
+    for flag in overrides:
+        if flag.startswith("!"):
+            key = jvm_flag_key(flag[1:])
+            out = [f for f in out if jvm_flag_key(f) != key]
+            continue
+        key = jvm_flag_key(flag)
+        for i, f in enumerate(out):
+            if jvm_flag_key(f) == key:
+                out[i] = flag
+                break
+        else:
+            out.append(flag)
+    return out
+
 
-        ui["counter_label"].configure(text=f"{visible_count} online")
+def build_jvm_flags(cfg, java_major: Optional[int], cores: int,
+                    large_pages: Optional[str] = None) -> tuple[list[str], list[str]]:
+    """
+    Flags de la JVM (sin java ni -jar): -Xms/-Xmx, el perfil elegido y después
+    los flags propios de cfg.jvm_args. Devuelve (flags, notas). ValueError si
+    jvm_args tiene comillas sin cerrar.
+    """
+    notes = []
+    flags = [f"-Xms{cfg.ram_min}G", f"-Xmx{cfg.ram_max}G"]
+    extra = split_jvm_args(cfg.jvm_args)
+    # un -Xmx propio manda también en los cálculos del perfil
+    ram_max = next((_heap_gb(f) for f in reversed(extra) if f.startswith("-Xmx") and _heap_gb(f)), cfg.ram_max)
+    name, pinned = parse_jvm_profile(cfg.jvm_profile)
+    profile = JVM_PROFILES.get(name)
+    if name and profile is None:
+        notes.append(f"perfil desconocido {name!r}: solo flags propios")
+    elif profile:
+        versions = profile["versions"]
+        latest = max(versions)
+        version = pinned if pinned in versions else latest
+        if pinned is not None and pinned not in versions:
+            notes.append(f"{name} no tiene v{pinned}: se usa v{latest}")
+        elif version != latest:
+            notes.append(f"{name} fijado en v{version} (hay v{latest})")
+        ctx = {"ram_max": ram_max, "java_major": java_major, "cores": max(1, cores),
+               "large_pages": large_pages}
+        profile_flags, profile_notes = versions[version](ctx)
+        flags += profile_flags
+        notes += profile_notes
+    return merge_jvm_flags(flags, extra), notes
+
+
+def format_command_line(cmd: list[str]) -> str:
+    return subprocess.list2cmdline(cmd) if os.name == "nt" else shlex.join(cmd)
+
+
+# ===================== PERF =====================
+class _PerfSpan:
+    """Context manager barato: mide un bloque y lo registra en el monitor."""
+    __slots__ = ("monitor", "name", "t0")
+
+    def __init__(self, monitor, name):
+        self.monitor = monitor
+        self.name = name
+        self.t0 = 0.0
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.monitor.record(self.name, (time.perf_counter() - self.t0) * 1000.0)
+        return False
 
-    def _tick_background(self):
-        """
-        Procesa colas de logs de TODOS los servidores:
-        - añade líneas a server.logs
-        - parsea join/leave
-        - marca players_dirty cuando corresponda
-        """
-        for server in self.servers.values():
-            try:
-                while True:
-                    line = server.log_queue.get_nowait()
-                    server.logs.append(line)
 
-                    # parseo de players (en vivo)
-                    self._try_parse_join_leave_from_log_line(server, line)
+class PerfMonitor:
+    """
+    Tiempos (ms) de los loops de la UI, en ventana deslizante por nombre.
+    Pensado para estar siempre activo: solo perf_counter + deque.append.
+    """
+    BUCKETS_MS = (1, 2, 4, 8, 16, 33, 66, 133)
+
+    def __init__(self, window: int = 600):
+        self.window = window
+        self.samples: dict[str, deque] = {}
+        self.calls: dict[str, int] = {}
+        self._profiler = None
+        self._profile_until = 0.0
+        self.last_profile_path: Optional[str] = None
+        self.last_profile_text = ""
+
+    def measure(self, name: str) -> _PerfSpan:
+        return _PerfSpan(self, name)
+
+    def record(self, name: str, ms: float):
+        d = self.samples.get(name)
+        if d is None:
+            d = self.samples[name] = deque(maxlen=self.window)
+        d.append(ms)
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def summary(self, name: str) -> dict:
+        data = sorted(self.samples.get(name, ()))
+        if not data:
+            return {"n": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        n = len(data)
+        return {
+            "n": n,
+            "mean": sum(data) / n,
+            "p50": data[n // 2],
+            "p95": data[min(n - 1, int(n * 0.95))],
+            "max": data[-1],
+        }
 
-                    # (opcional) limitar tamaño de logs para no consumir RAM
-                    if len(server.logs) > 5000:
-                        server.logs = server.logs[-3000:]
-            except queue.Empty:
-                pass
+    def histogram(self, name: str) -> list[int]:
+        """Cuenta de muestras por bucket (<1, <2, ... , >=133 ms)."""
+        counts = [0] * (len(self.BUCKETS_MS) + 1)
+        for ms in self.samples.get(name, ()):
+            for i, edge in enumerate(self.BUCKETS_MS):
+                if ms < edge:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
 
-        self.after(80, self._tick_background)  # 12.5 veces/seg, ligero
-    # ---------- LOG TAGS ----------
-    def _configure_console_tags(self, console):
-        console.tag_config("INFO", foreground="#cfcfcf")
-        console.tag_config("WARN", foreground="#f1c40f")
-        console.tag_config("ERROR", foreground="#e74c3c")
-        console.tag_config("SUCCESS", foreground="#2ecc71")
-        console.tag_config("COMMAND", foreground="#3498db")
-        console.tag_config("SYSTEM", foreground="#9b59b6")
+    def reset(self):
+        self.samples.clear()
+        self.calls.clear()
 
-    def _get_log_tag(self, line: str) -> str:
-        u = line.upper()
-        if u.startswith(">"):
-            return "COMMAND"
-        if "ERROR" in u or "SEVERE" in u or "FATAL" in u:
-            return "ERROR"
-        if "WARN" in u or "WARNING" in u:
-            return "WARN"
-        if any(x in u for x in ["DONE", "STARTED", "LISTENING"]):
-            return "SUCCESS"
-        if any(x in u for x in ["LOADING", "SAVING", "STOPPING"]):
-            return "SYSTEM"
-        return "INFO"
+    # ---------- cProfile de los próximos N segundos ----------
+    @property
+    def profiling(self) -> bool:
+        return self._profiler is not None
 
-    def _insert_colored_log(self, console, line):
-        tag = self._get_log_tag(line)
-        if not self.log_filters.get(tag, True):
+    def start_profile(self, seconds: float):
+        """Activa cProfile en el hilo de Tk; poll_profile() lo cierra al expirar."""
+        if self._profiler is not None:
             return
-        console.insert("end", line + "\n", tag)
+        import cProfile
+        self._profiler = cProfile.Profile()
+        self._profile_until = time.perf_counter() + max(0.5, float(seconds))
+        self._profiler.enable()
+
+    def poll_profile(self) -> bool:
+        """Devuelve True si acaba de terminar una captura."""
+        if self._profiler is None or time.perf_counter() < self._profile_until:
+            return False
+        import io, pstats
+        prof = self._profiler
+        prof.disable()
+        self._profiler = None
+
+        path = data_path(f"profile_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+        try:
+            prof.dump_stats(path)
+            self.last_profile_path = path
+        except OSError:
+            self.last_profile_path = None
 
-    
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(25)
+        self.last_profile_text = buf.getvalue()
+        return True
 
-    # --- patrones globales (a nivel de clase) ---
-    _JOIN_PATTERNS = [
-        # Vanilla / Spigot / Paper: "PlayerName joined the game"
-        re.compile(r"(?i)\b([A-Za-z0-9_]{3,16}) joined the game\b"),
-    ]
 
-    _LEAVE_PATTERNS = [
-        # Vanilla / Spigot / Paper: "PlayerName left the game"
-        re.compile(r"(?i)\b([A-Za-z0-9_]{3,16}) left the game\b"),
-        # Paper: "PlayerName lost connection: ..."
-        re.compile(r"(?i)\b([A-Za-z0-9_]{3,16}) lost connection\b"),
-        # Otros: "PlayerName has disconnected"
-        re.compile(r"(?i)\b([A-Za-z0-9_]{3,16}) has disconnected\b"),
-    ]
-    # --- limpiar códigos de color de Minecraft y escapes ANSI ---
-    _MC_COLOR_RE = re.compile(r"§.")          # elimina §a, §b, §x, §f, etc.
+PERF = PerfMonitor()
+
+
+def perf_timed(name: str):
+    """Decorador: registra la duración de cada llamada en PERF bajo `name`."""
+    def deco(fn):
+        def wrapper(*args, **kwargs):
+            with PERF.measure(name):
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return deco
+
+
+
+
+# ===================== SEARCH =====================
+def normalize_uuid(u: str) -> str:
+    return (u or "").strip().lower().replace("-", "")
+
+
+class SearchIndex:
+    """
+    Índice de búsqueda sobre nombre + UUID, mantenido incrementalmente.
+    - nombres: trigramas (subcadena) y lista ordenada (prefijo, consultas de 1-2 letras)
+    - UUIDs: lista ordenada (prefijo, con o sin guiones)
+    Resultados por relevancia: nombre exacto, prefijo, subcadena (antes cuanto
+    más a la izquierda) y por último coincidencias de UUID.
+    """
+    _HEX = set("0123456789abcdef")
+
+    def __init__(self):
+        self._docs = {}       # id -> (name_lower, uuid_norm)
+        self._grams = {}      # trigrama del nombre -> set(ids)
+        self._names = []      # [(name_lower, id)] ordenada
+        self._uuids = []      # [(uuid_norm, id)] ordenada
+        self._pending = []    # ids añadidos aún no insertados en las listas ordenadas
+
+    @staticmethod
+    def _trigrams(text: str):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id, name: str, uuid: str = ""):
+        doc = ((name or "").strip().lower(), normalize_uuid(uuid))
+        old = self._docs.get(doc_id)
+        if old == doc:
+            return
+        if old is not None:
+            self.remove(doc_id)
+        self._docs[doc_id] = doc
+        for g in self._trigrams(doc[0]):
+            self._grams.setdefault(g, set()).add(doc_id)
+        self._pending.append(doc_id)
+
+    def remove(self, doc_id):
+        self._merge()
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for g in self._trigrams(doc[0]):
+            ids = self._grams.get(g)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self._grams[g]
+        for lst, value in ((self._names, doc[0]), (self._uuids, doc[1])):
+            i = bisect.bisect_left(lst, (value,))
+            while i < len(lst) and lst[i][0] == value:
+                if lst[i][1] == doc_id:
+                    del lst[i]
+                    break
+                i += 1
+
+    def clear(self):
+        self._docs.clear()
+        self._grams.clear()
+        self._names.clear()
+        self._uuids.clear()
+        self._pending.clear()
+
+    def _merge(self):
+        """Pasa los añadidos pendientes a las listas ordenadas (insort o re-sort si son muchos)."""
+        if not self._pending:
+            return
+        pending = [i for i in self._pending if i in self._docs]
+        self._pending = []
+        if len(pending) <= 64:
+            for doc_id in pending:
+                name, uuid = self._docs[doc_id]
+                bisect.insort(self._names, (name, doc_id))
+                if uuid:
+                    bisect.insort(self._uuids, (uuid, doc_id))
+        else:
+            for doc_id in pending:
+                name, uuid = self._docs[doc_id]
+                self._names.append((name, doc_id))
+                if uuid:
+                    self._uuids.append((uuid, doc_id))
+            self._names.sort()
+            self._uuids.sort()
+
+    @staticmethod
+    def _prefix_range(lst: list, prefix: str):
+        i = bisect.bisect_left(lst, (prefix,))
+        while i < len(lst) and lst[i][0].startswith(prefix):
+            yield lst[i][1]
+            i += 1
+
+    def search(self, query: str, limit: Optional[int] = None) -> list:
+        """ids que coinciden con la consulta, ordenados por relevancia."""
+        q = (query or "").strip().lower()
+        if not q:
+            return []
+        self._merge()
+        scored = {}
+
+        # nombres (los de Minecraft no llevan guiones)
+        if "-" not in q:
+            grams = self._trigrams(q)
+            if grams:
+                sets = []
+                for g in grams:
+                    ids = self._grams.get(g)
+                    if not ids:
+                        sets = []
+                        break
+                    sets.append(ids)
+                sets.sort(key=len)
+                candidates = sets[0].intersection(*sets[1:]) if sets else ()
+            else:
+                candidates = self._prefix_range(self._names, q)   # 1-2 letras: solo prefijo
+            for doc_id in candidates:
+                name = self._docs[doc_id][0]
+                pos = name.find(q)
+                if pos == 0:
+                    scored[doc_id] = (0 if len(name) == len(q) else 1, 0, len(name), name)
+                elif pos > 0:
+                    scored[doc_id] = (2, pos, len(name), name)
+
+        # UUID por prefijo (desde 4 hex)
+        q_uuid = q.replace("-", "")
+        if len(q_uuid) >= 4 and set(q_uuid) <= self._HEX:
+            for doc_id in self._prefix_range(self._uuids, q_uuid):
+                if doc_id not in scored:
+                    name = self._docs[doc_id][0]
+                    scored[doc_id] = (3, 0, len(name), name)
+
+        if limit is not None and len(scored) > limit:
+            import heapq
+            return heapq.nsmallest(limit, scored, key=scored.__getitem__)
+        return sorted(scored, key=scored.__getitem__)
+
+
+# ===================== JSON CACHE =====================
+class JsonFileCache:
+    """
+    Caché de ficheros JSON ya parseados, validada por (mtime_ns, tamaño).
+    Solo se vuelve a leer y parsear cuando el fichero cambia de verdad.
+    Los valores devueltos son compartidos: no modificarlos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}   # (path, parser) -> (mtime_ns, size, value)
+        self.trusted_dirs = set()   # carpetas con notificaciones del SO: sin stat en cada acceso
+
+    def get(self, path: str, parser, default=None):
+        if os.path.dirname(os.path.abspath(path)) in self.trusted_dirs:
+            with self._lock:
+                hit = self._entries.get((path, parser))
+            if hit is not None:
+                PERF.record("json_cache_hit", 0.0)
+                return hit[2]
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return default
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = (path, parser)
+        with self._lock:
+            hit = self._entries.get(key)
+        if hit is not None and hit[:2] == stamp:
+            PERF.record("json_cache_hit", 0.0)
+            return hit[2]
+
+        with PERF.measure("json_cache_parse"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    value = parser(json.load(f))
+            except Exception:
+                value = default
+        with self._lock:
+            self._entries[key] = (stamp[0], stamp[1], value)
+        return value
+
+    def invalidate(self, path: Optional[str] = None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == path]:
+                    del self._entries[key]
+
+
+JSON_CACHE = JsonFileCache()
+
+
+def parse_usercache(data) -> dict:
+    """usercache.json -> {"uuids": {name_lower: uuid}, "names": [name, ...]}"""
+    uuids, names = {}, []
+    if isinstance(data, list):
+        for it in data:
+            name = (it.get("name") or "").strip()
+            uuid = (it.get("uuid") or "").strip()
+            if name and uuid:
+                uuids[name.lower()] = uuid
+                names.append(name)
+    return {"uuids": uuids, "names": names}
+
+
+def parse_ops(data) -> dict:
+    """ops.json -> {"list": [{name, uuid, level, bypassesPlayerLimit}], "names": {name_lower}}"""
+    out = []
+    if isinstance(data, list):
+        # normalizar claves que a veces faltan
+        for it in data:
+            out.append({
+                "name": it.get("name", "Unknown"),
+                "uuid": it.get("uuid", ""),
+                "level": it.get("level", ""),
+                "bypassesPlayerLimit": it.get("bypassesPlayerLimit", False),
+            })
+    index = SearchIndex()
+    for i, o in enumerate(out):
+        index.add(i, o["name"], o["uuid"])
+    return {"list": out, "names": {(o["name"] or "").lower() for o in out}, "index": index}
+
+
+def parse_bans(data) -> dict:
+    """banned-players.json -> {"list": [{name, uuid, reason, created, source}], "names": {name_lower}}"""
+    out = []
+    if isinstance(data, list):
+        for it in data:
+            out.append({
+                "name": it.get("name", "Unknown"),
+                "uuid": it.get("uuid", ""),
+                "reason": it.get("reason", ""),
+                "created": it.get("created", ""),
+                "source": it.get("source", ""),
+            })
+    index = SearchIndex()
+    for i, b in enumerate(out):
+        index.add(i, b["name"], b["uuid"])
+    return {"list": out, "names": {(b["name"] or "").lower() for b in out}, "index": index}
+
+
+_EMPTY_USERCACHE = {"uuids": {}, "names": []}
+_EMPTY_LIST = {"list": [], "names": frozenset(), "index": SearchIndex()}
+
+
+# ===================== FS WATCH =====================
+class _InotifyBackend:
+    """
+    inotify (Linux) vía ctypes; un watch no recursivo por carpeta.
+    poll() devuelve (carpeta, nombre); nombre=None -> toda la carpeta cambió o perdió su watch,
+    (None, None) -> la cola del kernel desbordó y se perdieron eventos de cualquier carpeta.
+    """
+    _MASK = (0x00000004 | 0x00000008 | 0x00000040 | 0x00000080 |   # ATTRIB, CLOSE_WRITE, MOVED_FROM, MOVED_TO
+             0x00000100 | 0x00000200 | 0x00000400 | 0x00000800)    # CREATE, DELETE, DELETE_SELF, MOVE_SELF
+    _DELETE_SELF = 0x00000400
+    _MOVE_SELF = 0x00000800
+    _Q_OVERFLOW = 0x00004000
+    _IGNORED = 0x00008000
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self._wd_dir = {}   # wd -> carpeta
+        self._dir_wd = {}
+
+    def add(self, directory: str):
+        if directory in self._dir_wd:
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK)
+        if wd >= 0:
+            self._wd_dir[wd] = directory
+            self._dir_wd[directory] = wd
+
+    def active(self) -> set:
+        """Carpetas con un watch vivo en el kernel."""
+        return set(self._dir_wd)
+
+    def remove(self, directory: str):
+        wd = self._dir_wd.pop(directory, None)
+        if wd is not None:
+            self._wd_dir.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def poll(self, timeout: float) -> list[tuple[str, str]]:
+        import select
+        import struct
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        out = []
+        i = 0
+        while i + 16 <= len(buf):
+            wd, mask, _cookie, length = struct.unpack_from("iIII", buf, i)
+            name = buf[i + 16:i + 16 + length].split(b"\0", 1)[0]
+            i += 16 + length
+            if mask & self._Q_OVERFLOW:
+                out.append((None, None))
+                continue
+            directory = self._wd_dir.get(wd)
+            if directory is None:
+                continue
+            if mask & (self._IGNORED | self._DELETE_SELF | self._MOVE_SELF):
+                # el watch ya no apunta a la carpeta: se suelta y el watcher lo vuelve a crear
+                self._wd_dir.pop(wd, None)
+                self._dir_wd.pop(directory, None)
+                if not mask & self._IGNORED:
+                    self._libc.inotify_rm_watch(self._fd, wd)
+                out.append((directory, None))
+            else:
+                out.append((directory, os.fsdecode(name)))
+        return out
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Fallback portable: compara snapshots de scandir (nombre -> mtime, tamaño)."""
+    INTERVAL = 1.0
+
+    def __init__(self):
+        self._snapshots = {}   # carpeta -> {nombre: (mtime_ns, size)}
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _snapshot(directory: str) -> dict:
+        snap = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    snap[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return snap
+
+    def add(self, directory: str):
+        if directory not in self._snapshots:
+            self._snapshots[directory] = self._snapshot(directory)
+
+    def remove(self, directory: str):
+        self._snapshots.pop(directory, None)
+
+    def poll(self, timeout: float) -> list[tuple[str, str]]:
+        if self._stop.wait(max(timeout, self.INTERVAL)):
+            return []
+        out = []
+        for directory, old in list(self._snapshots.items()):
+            new = self._snapshot(directory)
+            for name in old.keys() | new.keys():
+                if old.get(name) != new.get(name):
+                    out.append((directory, name))
+            self._snapshots[directory] = new
+        return out
+
+    def close(self):
+        self._stop.set()
+
+
+class FsWatcher:
+    """
+    Vigila carpetas (no recursivo) y agrupa los cambios con debounce.
+    callback(key, {carpeta: {nombres} | None}) se llama desde el hilo del watcher;
+    None -> hay que releer la carpeta entera (watch perdido o desbordamiento).
+    on_untrust(carpetas) avisa, también desde el hilo del watcher, de que las
+    notificaciones de esas carpetas dejaron de ser fiables (None -> todas).
+    """
+    DEBOUNCE = 0.3
+    REWATCH_INTERVAL = 2.0
+
+    def __init__(self, callback, on_untrust=None):
+        self.callback = callback
+        self.on_untrust = on_untrust
+        self.native = False          # True si los eventos vienen del SO (inotify)
+        self.failed = False          # el hilo del watcher tuvo un error de lectura
+        self._lock = threading.Lock()
+        self._watches = {}           # key -> {carpeta: set(nombres) | None}
+        self._backend = None
+        self._thread = None
+        self._running = False
+
+    def watch(self, key: str, directory: str, names: Optional[set] = None):
+        """names=None -> cualquier fichero de la carpeta."""
+        directory = os.path.abspath(directory)
+        with self._lock:
+            self._watches.setdefault(key, {})[directory] = set(names) if names else None
+            if self._backend is not None:
+                self._backend.add(directory)
+
+    def unwatch(self, key: str):
+        with self._lock:
+            dirs = self._watches.pop(key, {})
+            if self._backend is None:
+                return
+            still = {d for w in self._watches.values() for d in w}
+            for directory in dirs:
+                if directory not in still:
+                    self._backend.remove(directory)
+
+    def watched_dirs(self) -> set:
+        with self._lock:
+            return {d for w in self._watches.values() for d in w}
+
+    def trusted_dirs(self) -> set:
+        """Carpetas cuyos cambios llegan seguro por inotify (vacío con polling o tras un error)."""
+        if not self.native or self.failed or self._backend is None:
+            return set()
+        with self._lock:
+            return {d for w in self._watches.values() for d in w} & self._backend.active()
+
+    def _untrust(self, directories):
+        if self.on_untrust is not None:
+            try:
+                self.on_untrust(directories)
+            except Exception:
+                pass
+
+    def start(self):
+        if self._thread is not None:
+            return
+        backend = None
+        if sys.platform.startswith("linux"):
+            try:
+                backend = _InotifyBackend()
+                self.native = True
+            except Exception:
+                backend = None
+        if backend is None:
+            backend = _PollingBackend()
+        with self._lock:
+            self._backend = backend
+            for directory in {d for w in self._watches.values() for d in w}:
+                backend.add(directory)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._backend is not None:
+            self._backend.close()
+
+    def _route(self, directory: Optional[str], name: Optional[str], pending: dict):
+        with self._lock:
+            for key, dirs in self._watches.items():
+                for watched, names in dirs.items():
+                    if directory is not None and watched != directory:
+                        continue
+                    changes = pending.setdefault(key, {})
+                    if name is None:
+                        changes[watched] = None   # releer la carpeta entera
+                    elif (names is None or name in names) and changes.get(watched, ()) is not None:
+                        changes.setdefault(watched, set()).add(name)
+
+    def _rewatch(self, pending: dict):
+        """Recrea los watches perdidos (carpeta borrada/movida y vuelta a crear)."""
+        with self._lock:
+            lost = {d for w in self._watches.values() for d in w} - self._backend.active()
+            for directory in lost:
+                self._backend.add(directory)
+            back = lost & self._backend.active()
+        for directory in back:
+            self._route(directory, None, pending)   # lo ocurrido mientras no había watch
+
+    def _run(self):
+        pending = {}
+        last_event = 0.0
+        last_rewatch = 0.0
+        while self._running:
+            try:
+                events = self._backend.poll(self.DEBOUNCE if pending else 0.5)
+            except Exception:
+                # inotify sin descriptor (cerrado) o error de lectura
+                if not self._running:
+                    return
+                events = []
+                if not self.failed:
+                    self.failed = True   # ya no hay garantía de ver los cambios
+                    events = [(None, None)]
+                else:
+                    time.sleep(0.5)
+            lost = {d for d, name in events if name is None}
+            if lost:
+                self._untrust(None if None in lost else lost)
+            for directory, name in events:
+                self._route(directory, name, pending)
+            if self.native and not self.failed and time.monotonic() - last_rewatch >= self.REWATCH_INTERVAL:
+                last_rewatch = time.monotonic()
+                self._rewatch(pending)
+            if events:
+                last_event = time.monotonic()
+            if pending and time.monotonic() - last_event >= self.DEBOUNCE:
+                batch, pending = pending, {}
+                for key, changes in batch.items():
+                    try:
+                        self.callback(key, changes)
+                    except Exception:
+                        pass
+
+
+# ===================== MODELS =====================
+# fases del proceso, en orden (ServerRuntime.set_phase solo avanza)
+LIFECYCLE_PHASES = (
+    "stopped",          # sin proceso
+    "spawned",          # Popen hecho
+    "jvm_up",           # primera línea de salida
+    "loading_world",    # 'Preparing level "world"'
+    "preparing_spawn",  # "Preparing start region" / "Preparing spawn area: N%"
+    "ready",            # "Done (12.345s)!"
+    "stopping",         # stop enviado o "Stopping the server"
+    "saved",            # "All dimensions are saved" tras el stop
+    "exited",           # proceso terminado
+)
+
+@dataclass
+class ServerConfig:
+    id: str
+    name: str
+    jar: str
+    ram_min: int
+    ram_max: int
+    path: str
+    auto_restart: bool = False
+    jvm_args: str = ""  # 👈 NUEVO CAMPO para argumentos JVM
+    java: str = ""      # ruta a java concreto; "" = automático según el jar
+    cpu_affinity: str = ""          # "" = todas, "auto" = plan_affinity, o cpulist "0-3,8"
+    priority: str = "normal"        # clave de PROCESS_PRIORITIES
+    cpu_limit: float = 0.0          # CPUs (cgroup cpu.max, Linux); 0 = sin límite
+    memory_limit_gb: int = 0        # cgroup memory.max (Linux); 0 = sin límite
+    jvm_profile: str = ""           # clave de JVM_PROFILES ("g1-minecraft" o fijado "g1-minecraft@1"); "" = ninguno
+
+
+class PlayerRegistry:
+    """
+    Jugadores de un servidor indexados por nombre normalizado (minúsculas).
+    Cambiar de estado es O(1) (+ búsqueda binaria en la vista ordenada de
+    offline) y los suscriptores reciben (evento, nombre) con evento en
+    "known" | "online" | "offline".
+    """
+
+    def __init__(self):
+        self._display: dict[str, str] = {}    # clave -> nombre tal como se vio
+        self._online: dict[str, None] = {}    # orden de entrada
+        self._offline: list[str] = []         # claves offline, ordenadas
+        self._listeners = []
+        self.changed: set[str] = set()        # claves cambiadas desde el último render
+        self.version = 0
+
+    @staticmethod
+    def key(name: str) -> str:
+        return (name or "").strip().lower()
+
+    # ---------- consultas ----------
+    def __contains__(self, name: str) -> bool:
+        return self.key(name) in self._display
+
+    def __len__(self) -> int:
+        return len(self._display)
+
+    def is_online(self, name: str) -> bool:
+        return self.key(name) in self._online
+
+    def display(self, name: str) -> str:
+        return self._display.get(self.key(name), name)
+
+    @property
+    def online_count(self) -> int:
+        return len(self._online)
+
+    def online_names(self) -> list[str]:
+        """Online en orden de entrada."""
+        d = self._display
+        return [d[k] for k in self._online]
+
+    def offline_names(self) -> list[str]:
+        """Conocidos que no están online, ordenados sin distinguir mayúsculas."""
+        d = self._display
+        return [d[k] for k in self._offline]
+
+    def known_names(self) -> list[str]:
+        return list(self._display.values())
+
+    # ---------- cambios ----------
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def _notify(self, event: str, k: str):
+        self.changed.add(k)
+        self.version += 1
+        name = self._display[k]
+        for cb in list(self._listeners):
+            cb(event, name)
+
+    def _offline_remove(self, k: str):
+        i = bisect.bisect_left(self._offline, k)
+        if i < len(self._offline) and self._offline[i] == k:
+            del self._offline[i]
+
+    def add_known(self, name: str) -> bool:
+        """Registra un jugador (p. ej. desde usercache.json) sin cambiar su estado."""
+        k = self.key(name)
+        if not k:
+            return False
+        if k in self._display:
+            return False
+        self._display[k] = name.strip()
+        bisect.insort(self._offline, k)
+        self._notify("known", k)
+        return True
+
+    def set_online(self, name: str) -> bool:
+        k = self.key(name)
+        if not k:
+            return False
+        self._display[k] = name.strip()   # el join trae el nombre con sus mayúsculas reales
+        if k in self._online:
+            return False
+        self._offline_remove(k)
+        self._online[k] = None
+        self._notify("online", k)
+        return True
+
+    def set_offline(self, name: str) -> bool:
+        k = self.key(name)
+        if not k:
+            return False
+        if k in self._online:
+            del self._online[k]
+            bisect.insort(self._offline, k)
+            self._notify("offline", k)
+            return True
+        if k not in self._display:
+            self._display[k] = name.strip()
+            bisect.insort(self._offline, k)
+            self._notify("known", k)
+            return True
+        return False
+
+
+class ServerRuntime:
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.process = None
+        self.logs = []
+        self.log_queue = queue.Queue()
+
+        self.running = False        # proceso existe
+        self.ready = False          # aparece "Done"
+        self.stopping = False       # stop enviado
+        self.starting = False       # arrancando
+
+        self.last_perf_update = 0
+        self.cached_cpu = None              # % del total de la máquina (lo que se muestra)
+        self.cached_cpu_share = None        # % de las CPUs que el servidor puede usar (afinidad/cgroup)
+        self.cpu_slots = None               # esas CPUs, fijadas al lanzar el proceso
+        self.cached_ram = None
+
+        # ---- Players tracking ----
+        # online / offline / conocidos (joins o usercache), por nombre en minúsculas
+        self.players = PlayerRegistry()
+        self.players.subscribe(self._on_players_event)
+        self.last_players_update = 0.0
+        self.players_dirty = True  # fuerza render inicial en la vista jugadores
+        self.usercache = {}        # name_lower -> uuid string (sin guiones normalmente)
+        self.search = SearchIndex()  # nombre/UUID de todos los conocidos (clave del registro)
+        self._usercache_src = None # último resultado de JSON_CACHE aplicado al registro
+
+        self.sessions: Optional[PlayerSessionDB] = None   # historial persistente (lo asigna la app)
+
+        self.lag_events = deque(maxlen=500)   # (ts, ms detrás, ticks detrás) de "Can't keep up!"
+        self.autosaves = deque(maxlen=200)    # guardados: {ts, kind, duration, bytes, lag_ms, lag_events}
+        self.logins = deque(maxlen=1000)      # (ts, nombre, auth_s, join_s) por login completo
+        self._login_pending = {}              # clave -> {"uuid_t", "login_t"} de logins en curso
+        self.offline_job = None               # tarea sobre el mundo en curso (bloquea el arranque y otras tareas)
+        self._flush_waiter = None             # threading.Event que espera el "Saved the game" de una copia
+        self._save_open = None                # (t0, tipo, write_bytes al empezar) del guardado en curso
+        self._save_tail = None                # (_save_open, cierre) del último guardado cerrado por dimensión (otra puede reabrirlo)
+        self.capture: Optional["LogCapture"] = None   # grabación para replay
+
+        # ---- ciclo de vida: fases con marca de tiempo (ver LIFECYCLE_PHASES) ----
+        self.phase = "stopped"
+        self.phase_times: dict[str, float] = {}   # fase -> primer instante en que se alcanzó
+        self.spawn_progress = 0                   # "Preparing spawn area: N%"
+        self.done_reported_s: Optional[float] = None   # segundos que informa el propio "Done (Xs)!"
+        self._boot_recorded = False               # el arranque actual ya está en boot_history
+
+        # ---- arranque: tiempo por plugin ([Plugin] Loading/Enabling) ----
+        self.boot_started = 0.0
+        self.boot_plugins: dict[str, dict] = {}   # nombre -> {"version", "load", "enable"} (segundos)
+        self._boot_span = None                    # (fase, nombre, t0) en curso
+        self.boot_history: Optional["BootHistory"] = None   # boots_<id>.json (lo asigna la app)
+
+    def begin_boot(self, ts: float):
+        self.boot_started = ts
+        self.boot_plugins = {}
+        self._boot_span = None
+        self.phase = "stopped"
+        self.phase_times = {}
+        self.spawn_progress = 0
+        self.done_reported_s = None
+        self._boot_recorded = False
+        self._save_open = None
+        self._save_tail = None
+        self.set_phase("spawned", ts)
+
+    def set_phase(self, phase: str, ts: float) -> bool:
+        """Avanza el ciclo de vida (nunca retrocede; "exited" siempre vale). Devuelve si cambió."""
+        order = LIFECYCLE_PHASES
+        if phase != "exited" and self.phase in order and order.index(phase) <= order.index(self.phase):
+            return False
+        self.phase = phase
+        self.phase_times.setdefault(phase, ts)
+        return True
+
+    def phase_offsets(self) -> dict[str, float]:
+        """Fases en segundos desde que se lanzó el proceso."""
+        t0 = self.phase_times.get("spawned", self.boot_started)
+        return {p: round(t - t0, 3) for p, t in self.phase_times.items()}
+
+
+    def _on_players_event(self, event: str, name: str):
+        self.players_dirty = True
+        # add() no hace nada si el documento no cambió
+        self.search.add(PlayerRegistry.key(name), name, self.usercache.get(name.lower(), ""))
+
+    @property
+    def status(self):
+        return "online" if self.running else "offline"
+
+
+# ===================== PLAYER DB =====================
+def format_duration(seconds: float) -> str:
+    seconds = int(max(0, seconds or 0))
+    h, rem = divmod(seconds, 3600)
+    m = rem // 60
+    return f"{h}h {m:02d}m" if h else f"{m}m"
+
+
+def latency_summary(values: list) -> dict:
+    """n, p50, p95, p99 y máximo (rango más cercano, como PerfMonitor.summary)."""
+    data = sorted(v for v in values if v is not None)
+    if not data:
+        return {"n": 0, "p50": None, "p95": None, "p99": None, "max": None}
+    n = len(data)
+    return {
+        "n": n,
+        "p50": data[n // 2],
+        "p95": data[min(n - 1, int(n * 0.95))],
+        "p99": data[min(n - 1, int(n * 0.99))],
+        "max": data[-1],
+    }
+
+
+def login_latency_report(rows: list[tuple], peaks: Optional[dict] = None) -> dict:
+    """
+    rows = [(ts, auth_ms, join_ms)]. Percentiles globales y por hora (con el pico
+    de jugadores de esa hora, para cruzar logins lentos con carga).
+    """
+    peaks = peaks or {}
+    by_hour = {}
+    for ts, auth_ms, join_ms in rows:
+        by_hour.setdefault(int(ts // 3600), []).append((auth_ms, join_ms))
+
+    def summarize(items):
+        total = [a + j for a, j in items if a is not None and j is not None]
+        return {
+            "auth": latency_summary([a for a, _ in items]),
+            "join": latency_summary([j for _, j in items]),
+            "total": latency_summary(total),
+        }
+
+    hours = []
+    for hour in sorted(by_hour, reverse=True):
+        entry = summarize(by_hour[hour])
+        entry["hour"] = hour
+        entry["peak"] = peaks.get(hour)
+        hours.append(entry)
+    return {"all": summarize([(a, j) for _, a, j in rows]), "hours": hours}
+
+
+class PlayerSessionDB:
+    """
+    Sesiones de jugadores en SQLite (una base por servidor, en data_path()).
+    Las escrituras se encolan y un hilo las aplica por lotes en una sola
+    transacción; las lecturas usan otra conexión (WAL: no se bloquean).
+    """
+    BATCH_WINDOW = 0.5
+    TICK = 60.0              # sin escrituras, cada TICK s se arrastra el pico a la hora nueva
+    CARRY_MAX_HOURS = 24 * 7
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS players (
+            key TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            uuid TEXT,
+            first_seen REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            playtime REAL NOT NULL DEFAULT 0,
+            sessions INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_players_last_seen ON players(last_seen);
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY,
+            key TEXT NOT NULL,
+            join_ts REAL NOT NULL,
+            leave_ts REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_key ON sessions(key, join_ts);
+        CREATE INDEX IF NOT EXISTS idx_sessions_open ON sessions(key) WHERE leave_ts IS NULL;
+        CREATE TABLE IF NOT EXISTS hourly_peak (
+            hour INTEGER PRIMARY KEY,      -- epoch // 3600
+            peak INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS logins (
+            key TEXT NOT NULL,
+            ts REAL NOT NULL,              -- instante del "joined the game"
+            auth_ms INTEGER,               -- "UUID of player" -> "logged in"
+            join_ms INTEGER                -- "logged in" -> "joined the game"
+        );
+        CREATE INDEX IF NOT EXISTS idx_logins_ts ON logins(ts);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._q = queue.Queue()
+        self._thread = None
+        self._read_conn = None
+        self._online = 0         # jugadores online según la última escritura (hilo escritor)
+        self._hour = None        # última hora con pico escrito
+
+    def _connect(self):
+        import sqlite3
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.SCHEMA)
+        return conn
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, daemon=True)
+            self._thread.start()
+
+    # ---------- escrituras (desde cualquier hilo) ----------
+    def record_join(self, key: str, name: str, ts: float, online_count: int):
+        self._q.put(("join", key, name, ts, online_count))
+
+    def record_leave(self, key: str, ts: float, online_before: int):
+        self._q.put(("leave", key, ts, online_before))
+
+    def record_login(self, key: str, ts: float, auth_s: Optional[float], join_s: Optional[float]):
+        self._q.put(("login", key, ts, auth_s, join_s))
+
+    def flush(self, timeout: float = 2.0):
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._q.put(("flush", done))
+        done.wait(timeout)
+
+    def close(self):
+        self.flush()
+        if self._thread is not None:
+            self._q.put(None)
+        if self._read_conn is not None:
+            self._read_conn.close()
+            self._read_conn = None
+
+    def _writer(self):
+        conn = self._connect()
+        # sesiones abiertas de un cierre brusco: se cierran sin tiempo jugado
+        conn.execute("UPDATE sessions SET leave_ts = join_ts WHERE leave_ts IS NULL")
+        conn.commit()
+
+        while True:
+            try:
+                batch = [self._q.get(timeout=self.TICK)]
+            except queue.Empty:
+                with conn:
+                    self._carry_peak(conn, int(time.time() // 3600))
+                continue
+            deadline = time.monotonic() + self.BATCH_WINDOW
+            while batch[-1] is not None and batch[-1][0] != "flush":
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            waiters = []
+            stop = False
+            with conn:
+                for item in batch:
+                    if item is None:
+                        stop = True
+                    elif item[0] == "flush":
+                        waiters.append(item[1])
+                    elif item[0] == "join":
+                        self._apply_join(conn, *item[1:])
+                    elif item[0] == "leave":
+                        self._apply_leave(conn, *item[1:])
+                    elif item[0] == "login":
+                        self._apply_login(conn, *item[1:])
+            for ev in waiters:
+                ev.set()
+            if stop:
+                conn.close()
+                return
+
+    @staticmethod
+    def _close_open(conn, key: str, ts: float):
+        row = conn.execute(
+            "SELECT id, join_ts FROM sessions WHERE key = ? AND leave_ts IS NULL "
+            "ORDER BY join_ts DESC LIMIT 1", (key,)
+        ).fetchone()
+        if not row:
+            return
+        sid, join_ts = row
+        conn.execute("UPDATE sessions SET leave_ts = ? WHERE id = ?", (ts, sid))
+        conn.execute(
+            "UPDATE players SET playtime = playtime + ?, last_seen = ? WHERE key = ?",
+            (max(0.0, ts - join_ts), ts, key)
+        )
+
+    def _write_peak(self, conn, hour: int, count: int):
+        conn.execute(
+            "INSERT INTO hourly_peak(hour, peak) VALUES (?, ?) "
+            "ON CONFLICT(hour) DO UPDATE SET peak = max(peak, excluded.peak)",
+            (hour, count)
+        )
+
+    def _carry_peak(self, conn, hour: int):
+        """Las horas sin joins/leaves también tienen pico: los que seguían online."""
+        if self._hour is not None and self._online > 0:
+            for h in range(max(self._hour + 1, hour - self.CARRY_MAX_HOURS), hour + 1):
+                self._write_peak(conn, h, self._online)
+        if self._hour is None or hour > self._hour:
+            self._hour = hour
+
+    def _apply_join(self, conn, key: str, name: str, ts: float, online_count: int):
+        self._close_open(conn, key, ts)   # join sin leave previo
+        conn.execute(
+            "INSERT INTO players(key, name, first_seen, last_seen, sessions) VALUES (?, ?, ?, ?, 1) "
+            "ON CONFLICT(key) DO UPDATE SET name = excluded.name, last_seen = excluded.last_seen, "
+            "sessions = sessions + 1",
+            (key, name, ts, ts)
+        )
+        conn.execute("INSERT INTO sessions(key, join_ts) VALUES (?, ?)", (key, ts))
+        self._carry_peak(conn, int(ts // 3600))
+        self._write_peak(conn, int(ts // 3600), online_count)
+        self._online = online_count
+
+    def _apply_leave(self, conn, key: str, ts: float, online_before: int):
+        self._close_open(conn, key, ts)
+        self._carry_peak(conn, int(ts // 3600))
+        self._write_peak(conn, int(ts // 3600), online_before)   # el que sale contaba en esta hora
+        self._online = max(0, online_before - 1)
+
+    @staticmethod
+    def _apply_login(conn, key: str, ts: float, auth_s: Optional[float], join_s: Optional[float]):
+        to_ms = lambda v: None if v is None else int(round(v * 1000))
+        conn.execute("INSERT INTO logins(key, ts, auth_ms, join_ms) VALUES (?, ?, ?, ?)",
+                     (key, ts, to_ms(auth_s), to_ms(join_s)))
+
+    # ---------- lecturas (hilo de UI) ----------
+    def _reader(self):
+        if self._read_conn is None:
+            self._read_conn = self._connect()
+        return self._read_conn
+
+    def known_names(self) -> list[str]:
+        return [r[0] for r in self._reader().execute("SELECT name FROM players")]
+
+    def players_stats(self, keys: list[str]) -> dict[str, dict]:
+        """{key: {first_seen, last_seen, playtime, sessions}} por clave primaria."""
+        out = {}
+        conn = self._reader()
+        keys = list(keys)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for key, first, last, playtime, sessions in conn.execute(
+                f"SELECT key, first_seen, last_seen, playtime, sessions FROM players WHERE key IN ({marks})",
+                chunk
+            ):
+                out[key] = {"first_seen": first, "last_seen": last,
+                            "playtime": playtime, "sessions": sessions}
+        return out
+
+    def player_count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def logins_since(self, ts: float) -> list[tuple]:
+        """[(ts, auth_ms, join_ms)] desde ts, por orden."""
+        return self._reader().execute(
+            "SELECT ts, auth_ms, join_ms FROM logins WHERE ts >= ? ORDER BY ts", (ts,)
+        ).fetchall()
+
+    def hourly_peaks_since(self, ts: float) -> dict[int, int]:
+        return dict(self._reader().execute(
+            "SELECT hour, peak FROM hourly_peak WHERE hour >= ?", (int(ts // 3600),)
+        ))
+
+    def peak_since(self, ts: float) -> int:
+        row = self._reader().execute(
+            "SELECT MAX(peak) FROM hourly_peak WHERE hour >= ?", (int(ts // 3600),)
+        ).fetchone()
+        return row[0] or 0
+
+
+# ===================== BOOT HISTORY =====================
+class BootHistory:
+    """
+    Historial de arranques de un servidor (boots_<id>.json en data_path, últimos MAX).
+    Se escribe desde el hilo de UI; guarda copias de los registros y devuelve copias,
+    así nadie comparte los dicts vivos del servidor (boot_plugins) ni los del historial.
+    """
+    MAX = 100
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._boots = None
+
+    def _load(self):
+        if self._boots is not None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._boots = data if isinstance(data, list) else []
+        except Exception:
+            self._boots = []
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._boots, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def boots(self) -> list[dict]:
+        with self._lock:
+            self._load()
+            return [dict(b) for b in self._boots]
+
+    def append(self, record: dict):
+        record = dict(record)
+        if isinstance(record.get("plugins"), dict):
+            record["plugins"] = {k: dict(v) for k, v in record["plugins"].items()}
+        with self._lock:
+            self._load()
+            self._boots.append(record)
+            del self._boots[:-self.MAX]
+            self._save()
+
+    def update_last(self, started: float, **fields):
+        """Completa el último arranque (si es el mismo) con datos de la parada."""
+        with self._lock:
+            self._load()
+            if self._boots and self._boots[-1].get("started") == started:
+                self._boots[-1].update(fields)
+                self._save()
+                return True
+            return False
+
+
+def boot_timeline_report(boots: list[dict], window: int = 10) -> list[dict]:
+    """
+    Arranques más recientes primero, con tiempo hasta Done y hasta parar; marca
+    los que superan en un 25% la mediana de los `window` anteriores.
+    """
+    import statistics
+    rows = []
+    for i, b in enumerate(boots):
+        prev_ready = [p["ready_s"] for p in boots[max(0, i - window):i] if p.get("ready_s") is not None]
+        prev_stop = [p["stop_s"] for p in boots[max(0, i - window):i] if p.get("stop_s") is not None]
+        ready_s, stop_s = b.get("ready_s"), b.get("stop_s")
+        rows.append({
+            "started": b.get("started", 0.0),
+            "ready_s": ready_s,
+            "done_reported_s": b.get("done_reported_s"),
+            "stop_s": stop_s,
+            "exit_code": b.get("exit_code"),
+            "phases": b.get("phases", {}),
+            "slow_ready": bool(prev_ready) and ready_s is not None and ready_s > 1.25 * statistics.median(prev_ready),
+            "slow_stop": bool(prev_stop) and stop_s is not None and stop_s > 1.25 * statistics.median(prev_stop),
+        })
+    rows.reverse()
+    return rows
+
+
+def plugin_boot_report(boots: list[dict], window: int = 10) -> list[dict]:
+    """
+    Plugins del último arranque ordenados por tiempo total, comparados con la
+    mediana de los `window` arranques anteriores. Marca los que van más lentos
+    y si cambiaron de versión (una actualización suele ser la causa).
+    """
+    import statistics
+    if not boots:
+        return []
+    last = boots[-1].get("plugins", {})
+    prev = [b.get("plugins", {}) for b in boots[-1 - window:-1]]
+
+    rows = []
+    for name, rec in last.items():
+        total = rec.get("load", 0.0) + rec.get("enable", 0.0)
+        hist = [p[name].get("load", 0.0) + p[name].get("enable", 0.0) for p in prev if name in p]
+        median = statistics.median(hist) if hist else None
+        prev_version = next((p[name].get("version") for p in reversed(prev) if name in p), None)
+        rows.append({
+            "name": name,
+            "version": rec.get("version", ""),
+            "load": rec.get("load", 0.0),
+            "enable": rec.get("enable", 0.0),
+            "total": total,
+            "median": median,
+            "trend": hist + [total],
+            "slower": median is not None and total > max(median * 1.5, median + 0.5),
+            "updated": prev_version is not None and prev_version != rec.get("version", ""),
+            "prev_version": prev_version,
+        })
+    rows.sort(key=lambda r: -r["total"])
+    return rows
+
+
+# ===================== JOBS =====================
+JOB_IO_LIMITS = {                  # bytes/s por defecto según el tipo de tarea
+    "scan": 64 * 1024 * 1024,
+    "prune": 32 * 1024 * 1024,
+    "backup": 64 * 1024 * 1024,
+}
+JOB_CPU_BACKOFF = 85.0             # % de las CPUs permitidas al servidor a partir del que se frena
+JOB_PERF_MAX_AGE = 5.0             # muestra de CPU más vieja que esto no cuenta
+JOB_LAG_WINDOW = 10.0              # un "Can't keep up" en los últimos N s frena
+JOB_MIN_FACTOR = 1 / 16            # como mucho se baja a 1/16 del límite
+JOB_RECOVER_AFTER = 5.0            # segundos sanos para volver a doblar la velocidad
+
+# ioprio_set por arquitectura (no está en os)
+_IOPRIO_SYSCALL = {"x86_64": 251, "aarch64": 30, "i686": 289, "armv7l": 314}
+
+
+def lower_thread_priority():
+    """CPU e I/O al mínimo para el hilo actual: nice 19 + ionice idle (Linux), modo background (Windows)."""
+    import ctypes
+
+    if os.name == "nt":
+        k32 = ctypes.windll.kernel32
+        k32.SetThreadPriority(k32.GetCurrentThread(), 0x00010000)    # THREAD_MODE_BACKGROUND_BEGIN
+        return
+    if not sys.platform.startswith("linux"):
+        return
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, 19)     # en Linux nice es por hilo
+    except OSError:
+        pass
+    nr = _IOPRIO_SYSCALL.get(os.uname().machine)
+    if nr is not None:
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.syscall(nr, 1, tid, 3 << 13)        # IOPRIO_WHO_PROCESS, IOPRIO_CLASS_IDLE
+        except (OSError, AttributeError):
+            pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class MaintenanceJob:
+    """
+    Tarea pesada sobre la carpeta de un servidor (análisis, poda, copia). El trabajo
+    llama a throttle(bytes) antes de cada lectura/escritura: ahí se aplica el límite
+    de I/O, la pausa, la cancelación y el frenado si el servidor va justo.
+    """
+
+    def __init__(self, kind: str, title: str, server, fn, io_limit: Optional[int] = None, on_done=None,
+                 defer_priority: bool = False):
+        self.kind = kind
+        self.title = title
+        self.server = server
+        self.fn = fn                                  # fn(job) -> resultado
+        self.io_limit = io_limit if io_limit is not None else JOB_IO_LIMITS.get(kind, 32 * 1024 * 1024)
+        self.on_done = on_done                        # on_done(resultado, error) desde el hilo de la tarea
+        self.state = "queued"                         # queued | running | paused | done | error | cancelled
+        self.progress = (0, 0)
+        self.bytes_done = 0
+        self.factor = 1.0                             # < 1 mientras el servidor va con lag/CPU alta
+        self.critical = False                         # sección que no se debe alargar (save-off de una copia)
+        self.defer_priority = defer_priority          # fn baja la prioridad de su hilo al salir de la sección crítica
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._paused = False
+        self._cancelled = False
+        self._avail_at = 0.0
+        self._last_check = 0.0
+        self._healthy_since = None
+        self._cond = threading.Condition()
+
+    # --- control desde la UI ---
+    def pause(self):
+        with self._cond:
+            self._paused = True
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def backing_off(self) -> bool:
+        return self.factor < 1.0
+
+    def set_progress(self, done: int, total: int):
+        self.progress = (done, total)
+
+    # --- desde el trabajo ---
+    def _server_busy(self) -> bool:
+        server = self.server
+        if server is None or not server.running:
+            return False
+        # solo lee la muestra: el muestreo de psutil es del hilo de UI (_tick_background)
+        share = server.cached_cpu_share
+        if (share is not None and share >= JOB_CPU_BACKOFF
+                and time.time() - server.last_perf_update <= JOB_PERF_MAX_AGE):
+            return True
+        return bool(server.lag_events) and server.lag_events[-1][0] >= time.time() - JOB_LAG_WINDOW
+
+    def _update_backoff(self, now: float):
+        if now - self._last_check < 0.5:
+            return
+        self._last_check = now
+        if self._server_busy():
+            self.factor = max(JOB_MIN_FACTOR, self.factor / 2)
+            self._healthy_since = None
+        elif self.factor < 1.0:
+            if self._healthy_since is None:
+                self._healthy_since = now
+            elif now - self._healthy_since >= JOB_RECOVER_AFTER:
+                self.factor = min(1.0, self.factor * 2)
+                self._healthy_since = now
+
+    def throttle(self, nbytes: int):
+        """Bloquea lo necesario antes de mover nbytes; lanza JobCancelled si se canceló."""
+        with self._cond:
+            while self._paused and not self._cancelled and not self.critical:
+                self.state = "paused"
+                self._cond.wait(0.5)
+            if self._cancelled:
+                raise JobCancelled()
+            self.state = "running"
+
+            self.bytes_done += nbytes
+            if self.critical or self.io_limit <= 0:
+                return   # en la sección crítica se va a toda velocidad
+            now = time.monotonic()
+            self._update_backoff(now)
+            rate = self.io_limit * self.factor
+            start = max(self._avail_at, now)
+            self._avail_at = start + nbytes / rate
+            # los hilos del pool esperan su turno en orden; el wait deja despertar al cancelar
+            while not self._cancelled and time.monotonic() < start:
+                self._cond.wait(start - time.monotonic())
+            if self._cancelled:
+                raise JobCancelled()
+
+
+class JobRunner:
+    """Lanza cada tarea en su hilo con prioridad baja y guarda las últimas para la UI."""
+    HISTORY = 30
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.jobs: list[MaintenanceJob] = []
+
+    def submit(self, job: MaintenanceJob) -> MaintenanceJob:
+        with self._lock:
+            self.jobs.append(job)
+            finished = [j for j in self.jobs if j.finished is not None]
+            for old in finished[:max(0, len(self.jobs) - self.HISTORY)]:
+                self.jobs.remove(old)
+        threading.Thread(target=self._run, args=(job,), daemon=True).start()
+        return job
+
+    def for_server(self, server) -> list[MaintenanceJob]:
+        with self._lock:
+            return [j for j in self.jobs if j.server is server]
+
+    def active(self, server=None) -> list[MaintenanceJob]:
+        with self._lock:
+            return [j for j in self.jobs
+                    if j.finished is None and (server is None or j.server is server)]
+
+    def _run(self, job: MaintenanceJob):
+        if not job.defer_priority:
+            lower_thread_priority()
+        job.started = time.time()
+        job.state = "running"
+        result = None
+        try:
+            with PERF.measure(f"job_{job.kind}"):
+                result = job.fn(job)
+            job.state = "done"
+        except JobCancelled:
+            job.state = "cancelled"
+            job.error = "cancelada"
+        except Exception as e:
+            job.state = "error"
+            job.error = str(e)
+        job.finished = time.time()
+        if job.on_done:
+            job.on_done(result, job.error)
+
+
+JOBS = JobRunner()
+
+
+# ===================== WORLD =====================
+# Formato Anvil (.mca): cabecera de 4096 bytes con [offset(3) | sectores(1)] por
+# chunk, 4096 bytes de timestamps y datos en sectores de 4 KiB. Cada chunk empieza
+# con longitud(4) + compresión(1); si compresión & 0x80 está en c.X.Z.mcc aparte.
+REGION_SECTOR = 4096
+REGION_MAX_CHUNK_SECTORS = 255      # el campo de sectores de la cabecera es de 1 byte
+REGION_SKIP_DIRS = {"plugins", "logs", "libraries", "cache", "versions", "crash-reports", "bundler", "config"}
+CHUNK_OVERSIZED = 1024 * 1024    # un chunk de más de 1 MiB ya es patológico
+
+_NBT_FIXED = {1: 1, 2: 2, 3: 4, 4: 8, 5: 4, 6: 8}
+_NBT_COUNT_KEYS = {b"Entities": "entities", b"TileEntities": "tiles", b"block_entities": "tiles"}
+PRUNE_SIBLING_DIRS = ("entities", "poi")    # regiones paralelas que se podan junto a region/
+
+
+def format_size(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def find_region_dirs(server_path: str, max_depth: int = 4) -> list[tuple[str, str]]:
+    """[(dimensión, carpeta region)] bajo la carpeta del servidor (world, DIM-1, DIM1, mundos extra...)."""
+    out = []
+    base_depth = server_path.rstrip(os.sep).count(os.sep)
+    for root, dirs, files in os.walk(server_path):
+        depth = root.count(os.sep) - base_depth
+        if depth == 0:
+            dirs[:] = [d for d in dirs if d.lower() not in REGION_SKIP_DIRS]
+        if depth >= max_depth:
+            dirs[:] = []
+        if os.path.basename(root) == "region" and any(f.endswith(".mca") for f in files):
+            dim = os.path.relpath(os.path.dirname(root), server_path).replace(os.sep, "/")
+            out.append((dim, root))
+            dirs[:] = []
+    out.sort()
+    return out
+
+
+def _region_coords(filename: str) -> Optional[tuple[int, int]]:
+    parts = filename.split(".")
+    if len(parts) != 4 or parts[0] != "r" or parts[3] != "mca":
+        return None
+    try:
+        return int(parts[1]), int(parts[2])
+    except ValueError:
+        return None
+
+
+def _region_chunks(mm) -> list[tuple[int, int, int]]:
+    """[(índice, offset en bytes, sectores)] de los chunks presentes según la cabecera."""
+    out = []
+    if len(mm) < 2 * REGION_SECTOR:
+        return out
+    header = mm[:REGION_SECTOR]
+    for i in range(1024):
+        entry = int.from_bytes(header[i * 4:i * 4 + 4], "big")
+        if entry:
+            out.append((i, (entry >> 8) * REGION_SECTOR, entry & 0xFF))
+    return out
+
+
+def _region_chunk_payload(mm, region_dir: str, offset: int, cx: int, cz: int):
+    """(compresión, bytes comprimidos, externo) del chunk, o None si está corrupto."""
+    if offset + 5 > len(mm):
+        return None
+    length = int.from_bytes(mm[offset:offset + 4], "big")
+    ctype = mm[offset + 4]
+    if ctype & 0x80:
+        try:
+            with open(os.path.join(region_dir, f"c.{cx}.{cz}.mcc"), "rb") as f:
+                return ctype & 0x7F, f.read(), True
+        except OSError:
+            return None
+    if length < 1 or offset + 4 + length > len(mm):
+        return None
+    return ctype, mm[offset + 5:offset + 4 + length], False
+
+
+def _chunk_decompress(ctype: int, data: bytes) -> Optional[bytes]:
+    import zlib
+    try:
+        if ctype == 2:
+            return zlib.decompress(data)
+        if ctype == 1:
+            import gzip
+            return gzip.decompress(data)
+        if ctype == 3:
+            return bytes(data)
+        if ctype == 4:
+            import lz4.block    # opcional (Paper 1.20.5+ con region-file-compression=lz4)
+            return lz4.block.decompress(data)
+    except Exception:
+        pass
+    return None
+
+
+def _nbt_walk(buf, pos: int, tag: int, counts: dict, name: bytes = b"", depth: int = 0) -> int:
+    """Salta un payload NBT desde pos y devuelve la nueva posición; cuenta las listas de _NBT_COUNT_KEYS."""
+    size = _NBT_FIXED.get(tag)
+    if size is not None:
+        if tag == 4 and name == b"InhabitedTime" and depth <= 2:
+            counts["inhabited"] = int.from_bytes(buf[pos:pos + 8], "big", signed=True)
+        return pos + size
+    if tag == 8:
+        return pos + 2 + int.from_bytes(buf[pos:pos + 2], "big")
+    if tag in (7, 11, 12):
+        n = max(0, int.from_bytes(buf[pos:pos + 4], "big", signed=True))
+        return pos + 4 + n * (1 if tag == 7 else 4 if tag == 11 else 8)
+    if tag == 9:
+        elem = buf[pos]
+        n = max(0, int.from_bytes(buf[pos + 1:pos + 5], "big", signed=True))
+        pos += 5
+        key = _NBT_COUNT_KEYS.get(name) if depth <= 2 else None
+        if key:
+            counts[key] = counts.get(key, 0) + n
+        size = _NBT_FIXED.get(elem)
+        if size is not None:
+            return pos + n * size
+        for _ in range(n):
+            pos = _nbt_walk(buf, pos, elem, counts, b"", depth + 1)
+        return pos
+    if tag == 10:
+        while True:
+            child = buf[pos]
+            pos += 1
+            if child == 0:
+                return pos
+            ln = int.from_bytes(buf[pos:pos + 2], "big")
+            child_name = bytes(buf[pos + 2:pos + 2 + ln])
+            pos = _nbt_walk(buf, pos + 2 + ln, child, counts, child_name, depth + 1)
+    raise ValueError(f"tag NBT desconocido {tag}")
+
+
+def nbt_chunk_summary(raw: bytes) -> Optional[dict]:
+    """{"entities", "tiles", "inhabited"} de un chunk ya descomprimido (Level/Entities, block_entities...)."""
+    counts = {"entities": 0, "tiles": 0, "inhabited": None}
+    try:
+        if raw[0] != 10:
+            return None
+        ln = int.from_bytes(raw[1:3], "big")
+        _nbt_walk(raw, 3 + ln, 10, counts)
+    except (IndexError, ValueError, RecursionError):
+        return None
+    return counts
+
+
+def scan_region_file(path: str, dim: str, nbt: bool = False, top: int = 50) -> dict:
+    """
+    Analiza un r.X.Z.mca con mmap. Solo se quedan los `top` peores chunks por tamaño
+    y por entidades, así la memoria no crece con el número de chunks del mundo.
+    Con nbt=True cuenta entidades y tile entities (y las de entities/r.X.Z.mca, 1.17+).
+    """
+    import heapq
+    import mmap
+
+    region_dir = os.path.dirname(path)
+    coords = _region_coords(os.path.basename(path)) or (0, 0)
+    res = {"file": path, "dim": dim, "chunks": 0, "bytes": 0, "used": 0,
+           "external": 0, "oversized": 0, "corrupt": 0, "entities": 0, "tiles": 0,
+           "top_size": [], "top_entities": []}
+    try:
+        res["bytes"] = os.path.getsize(path)
+        if res["bytes"] < 2 * REGION_SECTOR:
+            return res
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ent_counts = _region_entity_file_counts(path) if nbt else {}
+            for i, offset, _sectors in _region_chunks(mm):
+                cx, cz = coords[0] * 32 + (i & 31), coords[1] * 32 + (i >> 5)
+                payload = _region_chunk_payload(mm, region_dir, offset, cx, cz)
+                if payload is None:
+                    res["corrupt"] += 1
+                    continue
+                ctype, data, external = payload
+                size = len(data)
+                res["chunks"] += 1
+                res["used"] += size
+                res["external"] += external
+                res["oversized"] += size >= CHUNK_OVERSIZED
+
+                entities = tiles = None
+                if nbt:
+                    raw = _chunk_decompress(ctype, data)
+                    counts = nbt_chunk_summary(raw) if raw else None
+                    if counts:
+                        entities = counts["entities"] + ent_counts.get(i, 0)
+                        tiles = counts["tiles"]
+                        res["entities"] += entities
+                        res["tiles"] += tiles
+
+                rec = (size, dim, cx, cz, external, entities, tiles)
+                heap = res["top_size"]
+                if len(heap) < top:
+                    heapq.heappush(heap, rec)
+                elif size > heap[0][0]:
+                    heapq.heapreplace(heap, rec)
+                if entities is not None:
+                    load = entities + tiles
+                    heap = res["top_entities"]
+                    if len(heap) < top:
+                        heapq.heappush(heap, (load, rec))
+                    elif load > heap[0][0]:
+                        heapq.heapreplace(heap, (load, rec))
+    except (OSError, ValueError):
+        res["corrupt"] += 1
+    res["top_entities"] = [r for _, r in res["top_entities"]]
+    return res
+
+
+def _region_entity_file_counts(region_path: str) -> dict[int, int]:
+    """{índice de chunk: entidades} de la región hermana en entities/ (mundos 1.17+)."""
+    import mmap
+
+    ent_path = os.path.join(os.path.dirname(os.path.dirname(region_path)), "entities",
+                            os.path.basename(region_path))
+    out = {}
+    try:
+        if os.path.getsize(ent_path) < 2 * REGION_SECTOR:
+            return out
+        coords = _region_coords(os.path.basename(region_path)) or (0, 0)
+        with open(ent_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ent_dir = os.path.dirname(ent_path)
+            for i, offset, _sectors in _region_chunks(mm):
+                payload = _region_chunk_payload(mm, ent_dir, offset,
+                                                coords[0] * 32 + (i & 31), coords[1] * 32 + (i >> 5))
+                raw = _chunk_decompress(payload[0], payload[1]) if payload else None
+                counts = nbt_chunk_summary(raw) if raw else None
+                if counts:
+                    out[i] = counts["entities"]
+    except (OSError, ValueError):
+        pass
+    return out
+
+
+def parse_protected_areas(text: str) -> list[tuple]:
+    """
+    Una zona por línea: "[dimensión] x1 z1 x2 z2" en coordenadas de bloque
+    (sin dimensión = todas). Devuelve [(dim|None, min_cx, min_cz, max_cx, max_cz)] en chunks.
+    """
+    areas = []
+    for line in text.splitlines():
+        parts = line.replace(",", " ").split("#", 1)[0].split()
+        if not parts:
+            continue
+        dim = None
+        if len(parts) == 5:
+            dim = parts.pop(0)
+        if len(parts) != 4:
+            raise ValueError(f"Zona inválida: {line.strip()!r}")
+        x1, z1, x2, z2 = (int(v) for v in parts)
+        areas.append((dim, min(x1, x2) >> 4, min(z1, z2) >> 4, max(x1, x2) >> 4, max(z1, z2) >> 4))
+    return areas
+
+
+def _chunk_protected(dim: str, cx: int, cz: int, areas: list[tuple]) -> bool:
+    for adim, x1, z1, x2, z2 in areas:
+        if (adim is None or adim == dim or dim.endswith("/" + adim)) and x1 <= cx <= x2 and z1 <= cz <= z2:
+            return True
+    return False
+
+
+def _region_rewrite(path: str, drop: set, dry_run: bool) -> tuple[int, int]:
+    """
+    Reescribe una región sin los chunks de `drop` (índices 0..1023), compactando
+    los sectores. Devuelve (bytes antes, bytes después); en dry_run no toca nada.
+    Si no queda ningún chunk se borra el archivo.
+    """
+    import mmap
+
+    try:
+        before = os.path.getsize(path)
+    except OSError:
+        return 0, 0
+    if before < 2 * REGION_SECTOR or not drop:
+        return before, before
+
+    region_dir = os.path.dirname(path)
+    coords = _region_coords(os.path.basename(path)) or (0, 0)
+    header = bytearray(2 * REGION_SECTOR)
+    blobs = []
+    dropped_mcc = []
+    sector = 2
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header[REGION_SECTOR:] = mm[REGION_SECTOR:2 * REGION_SECTOR]    # timestamps
+        for i, offset, sectors in _region_chunks(mm):
+            external = offset + 5 <= len(mm) and mm[offset + 4] & 0x80
+            if i in drop:
+                header[REGION_SECTOR + i * 4:REGION_SECTOR + i * 4 + 4] = b"\0\0\0\0"
+                if external:
+                    cx, cz = coords[0] * 32 + (i & 31), coords[1] * 32 + (i >> 5)
+                    dropped_mcc.append(os.path.join(region_dir, f"c.{cx}.{cz}.mcc"))
+                continue
+            if not dry_run:
+                blob = mm[offset:offset + sectors * REGION_SECTOR]
+                blobs.append(blob + b"\0" * (sectors * REGION_SECTOR - len(blob)))
+            header[i * 4:i * 4 + 4] = ((sector << 8) | sectors).to_bytes(4, "big")
+            sector += sectors
+
+    after = sector * REGION_SECTOR if sector > 2 else 0
+    if dry_run:
+        return before, after
+    if after == 0:
+        os.remove(path)
+    else:
+        tmp = path + ".prune.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(header)
+                for blob in blobs:
+                    f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())   # en disco antes de sustituir la región original
+            os.replace(tmp, path)
+        finally:
+            try:
+                os.remove(tmp)        # solo queda si algo falló antes del replace
+            except OSError:
+                pass
+    for mcc in dropped_mcc:
+        try:
+            os.remove(mcc)
+        except OSError:
+            pass
+    return before, after
+
+
+def prune_region_file(path: str, dim: str, min_inhabited: int, areas: list[tuple],
+                      dry_run: bool = True) -> dict:
+    """
+    Poda los chunks con InhabitedTime < min_inhabited (ticks) fuera de las zonas
+    protegidas, en region/ y en las regiones hermanas (entities/, poi/).
+    Los chunks que no se pueden leer se conservan.
+    """
+    import mmap
+
+    region_dir = os.path.dirname(path)
+    coords = _region_coords(os.path.basename(path)) or (0, 0)
+    res = {"file": path, "dim": dim, "chunks": 0, "dropped": 0, "unreadable": 0, "before": 0, "after": 0}
+    drop = set()
+    try:
+        if os.path.getsize(path) >= 2 * REGION_SECTOR:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for i, offset, _sectors in _region_chunks(mm):
+                    cx, cz = coords[0] * 32 + (i & 31), coords[1] * 32 + (i >> 5)
+                    res["chunks"] += 1
+                    if _chunk_protected(dim, cx, cz, areas):
+                        continue
+                    payload = _region_chunk_payload(mm, region_dir, offset, cx, cz)
+                    raw = _chunk_decompress(payload[0], payload[1]) if payload else None
+                    summary = nbt_chunk_summary(raw) if raw else None
+                    if summary is None or summary["inhabited"] is None:
+                        res["unreadable"] += 1
+                        continue
+                    if summary["inhabited"] < min_inhabited:
+                        drop.add(i)
+    except (OSError, ValueError):
+        res["unreadable"] += 1
+        return res
+
+    res["dropped"] = len(drop)
+    dim_dir = os.path.dirname(region_dir)
+    targets = [path] + [os.path.join(dim_dir, d, os.path.basename(path)) for d in PRUNE_SIBLING_DIRS]
+    for target in targets:
+        if os.path.exists(target):
+            before, after = _region_rewrite(target, drop, dry_run)
+            res["before"] += before
+            res["after"] += after
+    return res
+
+
+def _job_file_io(job, path: str, factor: int = 1):
+    """Cobra a la tarea el tamaño del archivo antes de tocarlo (límite de I/O, pausa, cancelación)."""
+    if job is not None:
+        try:
+            job.throttle(os.path.getsize(path) * factor)
+        except OSError:
+            job.throttle(0)
+
+
+def _world_region_files(server_path: str) -> list[tuple[str, str]]:
+    files = []
+    for dim, region_dir in find_region_dirs(server_path):
+        try:
+            names = [e.name for e in os.scandir(region_dir) if e.name.endswith(".mca")]
+        except OSError:
+            continue
+        files.extend((dim, os.path.join(region_dir, n)) for n in names)
+    return files
+
+
+def prune_world(server_path: str, min_inhabited: int, areas: list[tuple],
+                dry_run: bool = True, progress=None, job=None) -> dict:
+    """Poda en paralelo (una región por tarea). Con el servidor parado: reescribe archivos del mundo."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    def task(dim, path):
+        _job_file_io(job, path, 1 if dry_run else 2)    # leer + reescribir
+        return prune_region_file(path, dim, min_inhabited, areas, dry_run)
+
+    files = _world_region_files(server_path)
+    dims = {}
+    done = 0
+    workers = max(1, min(8, os.cpu_count() or 4, len(files)))
+    with ThreadPoolExecutor(max_workers=workers, initializer=lower_thread_priority if job else None) as pool:
+        futures = [pool.submit(task, dim, path) for dim, path in files]
+        for fut in as_completed(futures):
+            r = fut.result()
+            d = dims.setdefault(r["dim"], {"dim": r["dim"], "regions": 0, "chunks": 0, "dropped": 0,
+                                           "unreadable": 0, "before": 0, "after": 0})
+            d["regions"] += 1
+            for k in ("chunks", "dropped", "unreadable", "before", "after"):
+                d[k] += r[k]
+            done += 1
+            if job:
+                job.set_progress(done, len(files))
+            if progress:
+                progress(done, len(files))
+    dims = sorted(dims.values(), key=lambda d: d["dim"])
+    return {"dims": dims, "dry_run": dry_run,
+            "saved": sum(d["before"] - d["after"] for d in dims),
+            "dropped": sum(d["dropped"] for d in dims)}
+
+
+def scan_world(server_path: str, nbt: bool = False, top: int = 50, progress=None, job=None) -> dict:
+    """
+    Recorre todas las dimensiones en paralelo (un r.X.Z.mca por tarea) y fusiona
+    los peores chunks. progress(hechos, total) se llama desde los hilos del pool.
+    """
+    import heapq
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    files = _world_region_files(server_path)
+    dims = {}
+    top_size, top_entities = [], []
+    done = 0
+    workers = max(1, min(8, os.cpu_count() or 4, len(files)))
+    def task(dim, path):
+        _job_file_io(job, path)
+        return scan_region_file(path, dim, nbt, top)
+
+    with ThreadPoolExecutor(max_workers=workers, initializer=lower_thread_priority if job else None) as pool:
+        futures = [pool.submit(task, dim, path) for dim, path in files]
+        for fut in as_completed(futures):
+            r = fut.result()
+            d = dims.setdefault(r["dim"], {"dim": r["dim"], "regions": 0, "chunks": 0, "bytes": 0,
+                                           "used": 0, "external": 0, "oversized": 0, "corrupt": 0,
+                                           "entities": 0, "tiles": 0})
+            d["regions"] += 1
+            for k in ("chunks", "bytes", "used", "external", "oversized", "corrupt", "entities", "tiles"):
+                d[k] += r[k]
+            top_size = heapq.nlargest(top, top_size + r["top_size"])
+            top_entities = heapq.nlargest(top, top_entities + r["top_entities"],
+                                          key=lambda rec: rec[5] + rec[6])
+            done += 1
+            if job:
+                job.set_progress(done, len(files))
+            if progress:
+                progress(done, len(files))
+    return {"dims": sorted(dims.values(), key=lambda d: d["dim"]), "top_size": top_size,
+            "top_entities": top_entities, "nbt": nbt, "regions": len(files)}
+
+
+# ===================== BACKUP =====================
+BACKUP_FLUSH_TIMEOUT = 120.0     # espera máxima al "Saved the game" tras save-all flush
+BACKUP_SKIP_FILES = {"session.lock"}
+
+
+def backup_world_roots(server_path: str) -> list[str]:
+    """Carpetas de mundo (relativas) a copiar: las que tienen level.dat o contienen regiones."""
+    roots = set()
+    try:
+        for e in os.scandir(server_path):
+            if e.is_dir() and os.path.exists(os.path.join(e.path, "level.dat")):
+                roots.add(e.name)
+    except OSError:
+        pass
+    for dim, _region_dir in find_region_dirs(server_path):
+        roots.add(dim.split("/", 1)[0])
+    return sorted(roots)
+
+
+def clone_file(src: str, dst: str):
+    """Copia src en dst: reflink (FICLONE) si el sistema de archivos lo permite, si no copia normal."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    try:
+        import fcntl
+
+        with open(src, "rb") as fi, open(dst, "wb") as fo:
+            fcntl.ioctl(fo.fileno(), 0x40049409, fi.fileno())   # FICLONE: comparte bloques, O(1)
+        return
+    except (ImportError, OSError):
+        pass
+    shutil.copyfile(src, dst)
+
+
+class BackupStore:
+    """
+    Copias incrementales por contenido (backups_<id>/ en data_path).
+    objects/ab/<sha256> guarda cada bloque una sola vez; snapshots/<id>.json es
+    el manifiesto de cada copia e index.json el resumen de todas. Los .mca se
+    trocean por chunk: una región con dos chunks cambiados solo añade esos dos.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects = os.path.join(root, "objects")
+        self.snap_dir = os.path.join(root, "snapshots")
+        self._lock = threading.Lock()
+
+    # --- objetos ---
+    def _obj_path(self, digest: str) -> str:
+        return os.path.join(self.objects, digest[:2], digest)
+
+    def put(self, data) -> tuple[str, int]:
+        """(hash, bytes nuevos escritos): 0 si el bloque ya estaba."""
+        import hashlib
+
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._obj_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return digest, len(data)
+
+    def get(self, digest: str) -> bytes:
+        with open(self._obj_path(digest), "rb") as f:
+            return f.read()
+
+    # --- índice / manifiestos ---
+    def snapshots(self) -> list[dict]:
+        try:
+            with open(os.path.join(self.root, "index.json"), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except Exception:
+            return []
+
+    def _write_json(self, path: str, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def annotate(self, snap_id: str, **fields):
+        with self._lock:
+            snaps = self.snapshots()
+            for s in snaps:
+                if s["id"] == snap_id:
+                    s.update(fields)
+            self._write_json(os.path.join(self.root, "index.json"), snaps)
+
+    def manifest(self, snap_id: str) -> dict:
+        with open(os.path.join(self.snap_dir, snap_id + ".json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # --- copia ---
+    def _store_file(self, path: str, st) -> tuple[dict, int]:
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        if path.endswith(".mca") and st.st_size >= 2 * REGION_SECTOR:
+            import mmap
+
+            new = 0
+            chunks = []
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                entry["ts"], n = self.put(mm[REGION_SECTOR:2 * REGION_SECTOR])
+                new += n
+                for i, offset, _sectors in _region_chunks(mm):
+                    if offset + 5 > len(mm):
+                        continue
+                    length = int.from_bytes(mm[offset:offset + 4], "big")
+                    digest, n = self.put(mm[offset:min(len(mm), offset + 4 + length)])
+                    chunks.append([i, digest])
+                    new += n
+            entry["chunks"] = chunks
+            return entry, new
+        with open(path, "rb") as f:
+            entry["hash"], n = self.put(f.read())
+        return entry, n
+
+    def snapshot(self, base: str, roots: list[str], progress=None, job=None, captured=None) -> dict:
+        """
+        Copia las carpetas `roots` de `base`. Los archivos con el mismo tamaño y
+        mtime que en la copia anterior se reutilizan sin leerlos; el resto se
+        trocean y hashean en paralelo. Con captured (servidor en save-off) los
+        cambiados se copian antes tal cual a staging/, se llama a captured() para
+        reactivar el guardado y el troceado/hash se hace después sobre esa copia.
+        """
+        t0 = time.perf_counter()
+        snaps = self.snapshots()
+        prev = {}
+        if snaps:
+            try:
+                prev = self.manifest(snaps[-1]["id"])["files"]
+            except Exception:
+                prev = {}
+
+        files, todo = {}, []
+        for root in roots:
+            for dirpath, _dirs, names in os.walk(os.path.join(base, root)):
+                for name in names:
+                    if name in BACKUP_SKIP_FILES or name.endswith(".tmp"):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    rel = os.path.relpath(path, base).replace(os.sep, "/")
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    old = prev.get(rel)
+                    if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                        files[rel] = old
+                    else:
+                        todo.append((rel, path, st))
+        changed = len(todo)
+
+        staging = os.path.join(self.root, "staging") if captured is not None else None
+        try:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+                staged = []
+                for rel, path, st in todo:
+                    if job is not None:
+                        job.throttle(st.st_size)
+                    dest = os.path.join(staging, *rel.split("/"))
+                    try:
+                        clone_file(path, dest)
+                    except OSError:
+                        if rel in prev:
+                            files[rel] = prev[rel]
+                        continue
+                    staged.append((rel, dest, st))
+                todo = staged
+                captured()
+            new_bytes = self._store_changed(todo, files, prev, progress, job)
+        finally:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+
+        snap_id = time.strftime("%Y%m%d_%H%M%S")
+        if any(s["id"] == snap_id for s in snaps):
+            snap_id += f"_{len(snaps)}"
+        summary = {
+            "id": snap_id,
+            "ts": time.time(),
+            "files": len(files),
+            "changed": changed,
+            "size": sum(e["size"] for e in files.values()),
+            "new_bytes": new_bytes,
+            "duration": round(time.perf_counter() - t0, 3),
+        }
+        self._write_json(os.path.join(self.snap_dir, snap_id + ".json"), {"summary": summary, "files": files})
+        with self._lock:
+            snaps = self.snapshots()
+            snaps.append(summary)
+            self._write_json(os.path.join(self.root, "index.json"), snaps)
+        return summary
+
+    def _store_changed(self, todo: list, files: dict, prev: dict, progress=None, job=None) -> int:
+        """Trocea y guarda (rel, ruta, stat) en paralelo; rellena files y devuelve los bytes nuevos."""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        new_bytes = 0
+        done = 0
+        workers = max(1, min(8, os.cpu_count() or 4, len(todo)))
+        def task(path, st):
+            if job is not None:
+                job.throttle(st.st_size)
+            return self._store_file(path, st)
+
+        with ThreadPoolExecutor(max_workers=workers, initializer=lower_thread_priority if job else None) as pool:
+            futures = {pool.submit(task, path, st): rel for rel, path, st in todo}
+            for fut in as_completed(futures):
+                try:
+                    entry, n = fut.result()
+                except OSError:
+                    rel = futures[fut]
+                    if rel in prev:
+                        files[rel] = prev[rel]    # no se pudo leer: se conserva la versión anterior
+                    continue
+                files[futures[fut]] = entry
+                new_bytes += n
+                done += 1
+                if job:
+                    job.set_progress(done, len(todo))
+                if progress:
+                    progress(done, len(todo))
+        return new_bytes
+
+    # --- restauración ---
+    def restore(self, snap_id: str, target: str) -> int:
+        """Reconstruye la copia en `target` (regiones compactadas). Devuelve archivos escritos."""
+        files = self.manifest(snap_id)["files"]
+        for rel, entry in files.items():
+            path = os.path.join(target, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                if "chunks" not in entry:
+                    f.write(self.get(entry["hash"]))
+                    continue
+                header = bytearray(REGION_SECTOR)
+                blobs = []
+                sector = 2
+                for i, digest in entry["chunks"]:
+                    blob = self.get(digest)
+                    if len(blob) > REGION_MAX_CHUNK_SECTORS * REGION_SECTOR:
+                        blob = self._restore_external(path, i, blob)
+                    pad = (-len(blob)) % REGION_SECTOR
+                    sectors = (len(blob) + pad) // REGION_SECTOR
+                    header[i * 4:i * 4 + 4] = ((sector << 8) | sectors).to_bytes(4, "big")
+                    blobs.append(blob + b"\0" * pad)
+                    sector += sectors
+                f.write(header)
+                f.write(self.get(entry["ts"]))
+                for blob in blobs:
+                    f.write(blob)
+        return len(files)
+
+    @staticmethod
+    def _restore_external(path: str, i: int, blob: bytes) -> bytes:
+        """
+        Chunk que no cabe en los 255 sectores de la cabecera: los datos van a
+        c.X.Z.mcc junto a la región (como hace el servidor) y en la región queda
+        solo longitud(4)=1 + compresión | 0x80. Devuelve ese resguardo.
+        """
+        coords = _region_coords(os.path.basename(path))
+        if coords is None or len(blob) < 5:
+            raise ValueError(f"{os.path.basename(path)}: chunk {i} demasiado grande para la región")
+        cx, cz = coords[0] * 32 + (i & 31), coords[1] * 32 + (i >> 5)
+        with open(os.path.join(os.path.dirname(path), f"c.{cx}.{cz}.mcc"), "wb") as f:
+            f.write(blob[5:])
+        return (1).to_bytes(4, "big") + bytes([blob[4] | 0x80])
+
+
+# ===================== LOG INGEST =====================
+class LogIngest:
+    """
+    Pipeline de ingesta de logs, sin dependencias de Tk:
+    hilo lector -> _ingest_raw_line -> log_queue (línea, instante) -> _drain_server_queue.
+    Todo el estado por servidor (guardados, lag, fases...) se actualiza en el drenado,
+    en el hilo de UI, con el instante en que el hilo lector recibió la línea.
+    Lo usa la app y también bench/replay.py para reproducir capturas sin JVM.
+    """
+
+    # "Can't keep up! Is the server overloaded? Running 2500ms or 50 ticks behind"
+    _LAG_RE = re.compile(r"Can't keep up!.*?Running (\d+)ms or (\d+) ticks behind")
+
+    def now(self) -> float:
+        """Reloj de la ingesta (el replay lo sustituye por el tiempo de la captura)."""
+        return time.time()
+
+    def _ingest_raw_line(self, server: "ServerRuntime", raw: str):
+        """Paso del hilo lector: limpia, graba (si hay captura) y encola (línea, instante)."""
+        raw = raw.rstrip("\r\n")
+        now = self.now()
+        cap = server.capture    # la UI puede soltarla entre la comprobación y la escritura
+        if cap is not None:
+            cap.write(raw, now)
+
+        line = self._clean_log_line(raw)   # ← limpiar códigos de color
+        # la copia de seguridad espera esto con el guardado parado: sin pasar por la UI
+        waiter = server._flush_waiter
+        if waiter is not None and "Saved the game" in line:
+            waiter.set()
+        server.log_queue.put((line, now))
+
+    # "Steve[/127.0.0.1:51234] logged in with entity id 123 at (...)"
+    _LOGGED_IN_RE = re.compile(r"\b([A-Za-z0-9_]{3,16})\[/[^\]]*\] logged in with entity id")
+
+    def _login_track_line(self, server: "ServerRuntime", line: str, now: float):
+        """
+        Latencia de login: "UUID of player" (auth hecha) -> "logged in" (auth_s)
+        -> "joined the game" (join_s). Hilo de UI; now = instante de ingesta de la línea.
+        """
+        pending = server._login_pending
+
+        m = self._UUID_OF_RE.search(line)
+        if m:
+            pending[PlayerRegistry.key(m.group(1))] = {"uuid_t": now}
+            return
+        m = self._LOGGED_IN_RE.search(line)
+        if m:
+            pending.setdefault(PlayerRegistry.key(m.group(1)), {})["login_t"] = now
+            return
+        for rx in self._JOIN_PATTERNS:
+            m = rx.search(line)
+            if m:
+                name = self._normalize_player_name(m.group(1))
+                p = pending.pop(PlayerRegistry.key(name), None)
+                if not p:
+                    return
+                uuid_t, login_t = p.get("uuid_t"), p.get("login_t")
+                auth_s = round(login_t - uuid_t, 4) if uuid_t is not None and login_t is not None else None
+                join_s = round(now - login_t, 4) if login_t is not None else None
+                server.logins.append((now, name, auth_s, join_s))
+                if server.sessions is not None:
+                    server.sessions.record_login(PlayerRegistry.key(name), now, auth_s, join_s)
+                return
+        for rx in self._LEAVE_PATTERNS:
+            m = rx.search(line)
+            if m:
+                # desconectado antes de entrar: login abortado
+                pending.pop(PlayerRegistry.key(self._normalize_player_name(m.group(1))), None)
+                return
+
+    # el aviso de lag llega cuando termina el tick atascado: se atribuye al
+    # guardado si cae dentro del guardado o hasta SAVE_LAG_GRACE s después
+    SAVE_LAG_GRACE = 5.0
+
+    def _save_track_line(self, server: "ServerRuntime", line: str, now: float):
+        """
+        Mide guardados de mundo: "Saving chunks..." / "Saving the game" -> "All dimensions are saved".
+        "ThreadedAnvilChunkStorage (...): All chunks are saved" (una por dimensión, y el único
+        cierre en versiones antiguas) cierra el guardado, pero otra dimensión lo reabre si
+        llega antes de SAVE_LAG_GRACE s; más tarde ya es otro guardado.
+        """
+        chunks_saved = "ThreadedAnvilChunkStorage" in line and "All chunks are saved" in line
+        closing = "All dimensions are saved" in line or "Saved the game" in line or chunks_saved
+        if server._save_open is None:
+            tail = server._save_tail
+            if tail is not None and (not server.autosaves or now - tail[1] > self.SAVE_LAG_GRACE):
+                server._save_tail = tail = None   # el guardado anterior ya terminó del todo
+            if tail is not None and (closing or "Saving chunks for level" in line):
+                # otra dimensión del mismo guardado: se reabre y se vuelve a cerrar más tarde
+                server.autosaves.pop()
+                server._save_open, server._save_tail = tail[0], None
+                if not closing:
+                    return
+            elif "Saving the game" in line:
+                kind = "manual"          # /save-all
+                server._save_open = (now, kind, process_write_bytes(server))
+                server._save_tail = None
+                return
+            elif "Saving chunks for level" in line:
+                kind = "shutdown" if server.phase == "stopping" else "autosave"
+                server._save_open = (now, kind, process_write_bytes(server))
+                server._save_tail = None
+                return
+            else:
+                return
+
+        if closing:
+            t0, kind, bytes0 = server._save_open
+            server._save_tail = (server._save_open, now) if chunks_saved else None
+            server._save_open = None
+            bytes1 = process_write_bytes(server)
+            entry = {
+                "ts": t0,
+                "kind": kind,
+                "duration": round(now - t0, 3),
+                "bytes": (bytes1 - bytes0) if bytes0 is not None and bytes1 is not None else None,
+                "lag_ms": 0,
+                "lag_events": 0,
+            }
+            for ev in server.lag_events:
+                if t0 <= ev[0] <= now:
+                    entry["lag_ms"] += ev[1]
+                    entry["lag_events"] += 1
+            server.autosaves.append(entry)
+
+    def _save_attribute_lag(self, server: "ServerRuntime", ev: tuple):
+        """Aviso de lag justo después de un guardado: cuenta como solapado con él."""
+        if not server.autosaves or server._save_open is not None:
+            return   # con un guardado abierto se cuenta al cerrarlo
+        last = server.autosaves[-1]
+        if ev[0] <= last["ts"] + last["duration"] + self.SAVE_LAG_GRACE and ev[0] > last["ts"] + last["duration"]:
+            last["lag_ms"] += ev[1]
+            last["lag_events"] += 1
+
+    # 'Done (12.345s)! For help, type "help"' (algunos forks usan coma decimal)
+    _DONE_RE = re.compile(r"Done \((\d+(?:[.,]\d+)?)s\)!")
+    _SPAWN_PCT_RE = re.compile(r"Preparing spawn area: (\d+)%")
+
+    def _lifecycle_line(self, server: "ServerRuntime", line: str, now: float):
+        """Avanza las fases del ciclo de vida según la salida del servidor."""
+        if server.phase == "spawned":
+            server.set_phase("jvm_up", now)
+
+        if server.starting and not server.ready:
+            self._boot_track_line(server, line, now)
+
+            if "Preparing" in line:
+                if "Preparing level" in line:
+                    server.set_phase("loading_world", now)
+                elif "Preparing start region" in line or "Preparing spawn area" in line:
+                    server.set_phase("preparing_spawn", now)
+                    m = self._SPAWN_PCT_RE.search(line)
+                    if m:
+                        server.spawn_progress = int(m.group(1))
+
+            if "Done (" in line:
+                m = self._DONE_RE.search(line)
+                if m:
+                    server.ready = True
+                    server.starting = False
+                    server.spawn_progress = 100
+                    server.done_reported_s = float(m.group(1).replace(",", "."))
+                    server.set_phase("ready", now)
+                    self._boot_finish(server, now)
+            return
+
+        if "Stopping the server" in line or "Stopping server" in line:
+            server.set_phase("stopping", now)
+        elif server.phase == "stopping" and "All dimensions are saved" in line:
+            # tras "Saving worlds": el guardado final terminó
+            server.set_phase("saved", now)
+
+    def _lifecycle_exit(self, server: "ServerRuntime", code: Optional[int], now: float):
+        """
+        Proceso terminado (hilo de UI, tras drenar la cola): cierra el ciclo y completa
+        el historial (tiempo de parada, código). now = instante en que terminó el proceso.
+        """
+        server.set_phase("exited", now)
+        server._save_open = None   # un guardado sin cerrar no pasa al siguiente arranque
+        server._save_tail = None
+        fields = {
+            "phases": server.phase_offsets(),
+            "exit_code": code,
+            "uptime_s": round(now - server.boot_started, 3),
+        }
+        stop_t = server.phase_times.get("stopping")
+        if stop_t is not None:
+            fields["stop_s"] = round(now - stop_t, 3)
+            saved_t = server.phase_times.get("saved")
+            if saved_t is not None:
+                fields["save_s"] = round(saved_t - stop_t, 3)
+        if server.boot_history is None:
+            return
+        if server._boot_recorded:
+            server.boot_history.update_last(server.boot_started, **fields)
+        else:
+            # no llegó a "Done" (crash / detenido durante el arranque)
+            server.boot_history.append({"started": server.boot_started, "ready_s": None,
+                                        "plugins": server.boot_plugins, **fields})
+            server._boot_recorded = True
+
+    # "[LuckPerms] Loading server plugin LuckPerms v5.4.102" / "[LuckPerms] Enabling LuckPerms v5.4.102"
+    _PLUGIN_BOOT_RE = re.compile(r"\[([^\]]+)\] (Loading|Enabling) (?:server plugin )?(.+?) v(\S+)\s*$")
+    # líneas que cierran el tramo del último plugin (el mundo no cuenta como plugin)
+    _BOOT_MILESTONES = ("Preparing level", "Preparing start region", "Running delayed init tasks", "Done (")
+
+    def _boot_track_line(self, server: "ServerRuntime", line: str, now: float):
+        """Atribuye el tiempo entre líneas [Plugin] Loading/Enabling al plugin en curso."""
+        if "Loading" in line or "Enabling" in line:
+            m = self._PLUGIN_BOOT_RE.search(line)
+            if m and m.group(1).strip().lower() == m.group(3).strip().lower():
+                self._boot_close_span(server, now)
+                name = m.group(3).strip()
+                rec = server.boot_plugins.setdefault(name, {"version": "", "load": 0.0, "enable": 0.0})
+                rec["version"] = m.group(4)
+                server._boot_span = ("load" if m.group(2) == "Loading" else "enable", name, now)
+                return
+        if server._boot_span is not None and any(k in line for k in self._BOOT_MILESTONES):
+            self._boot_close_span(server, now)
+
+    def _boot_close_span(self, server: "ServerRuntime", now: float):
+        span = server._boot_span
+        if span is None:
+            return
+        phase, name, t0 = span
+        rec = server.boot_plugins[name]
+        rec[phase] = round(rec[phase] + max(0.0, now - t0), 3)
+        server._boot_span = None
+
+    def _boot_finish(self, server: "ServerRuntime", now: float):
+        self._boot_close_span(server, now)
+        if server.boot_history is not None:
+            server.boot_history.append({
+                "started": server.boot_started,
+                "ready_s": round(now - server.boot_started, 3),
+                "done_reported_s": server.done_reported_s,
+                "phases": server.phase_offsets(),
+                "plugins": server.boot_plugins,
+            })
+            server._boot_recorded = True
+
+    def _track_server_line(self, server: "ServerRuntime", line: str, ts: float):
+        """Métricas de una línea del servidor (hilo de UI); ts = instante de ingesta."""
+        self._lifecycle_line(server, line, ts)   # antes que los guardados: el tipo depende de la fase
+
+        if "Can't keep up" in line:
+            m = self._LAG_RE.search(line)
+            if m:
+                ev = (ts, int(m.group(1)), int(m.group(2)))
+                server.lag_events.append(ev)
+                self._save_attribute_lag(server, ev)
+
+        if "Sav" in line or "saved" in line:
+            self._save_track_line(server, line, ts)
+
+        if "UUID of player" in line or " logged in with entity id" in line or " the game" in line \
+                or "lost connection" in line:
+            self._login_track_line(server, line, ts)
+
+    def _drain_server_queue(self, server: "ServerRuntime") -> int:
+        """Paso del hilo de UI: vacía la cola, guarda en server.logs y parsea jugadores."""
+        n = 0
+        try:
+            while True:
+                item = server.log_queue.get_nowait()
+                if isinstance(item, tuple):
+                    line, ts = item
+                    self._track_server_line(server, line, ts)
+                else:
+                    line = item     # mensaje del launcher (SYSTEM/ERROR)
+                server.logs.append(line)
+                n += 1
+
+                # parseo de players (en vivo)
+                self._try_parse_join_leave_from_log_line(server, line)
+
+                # (opcional) limitar tamaño de logs para no consumir RAM
+                if len(server.logs) > 5000:
+                    server.logs = server.logs[-3000:]
+        except queue.Empty:
+            pass
+        return n
+
+    # --- patrones globales (a nivel de clase) ---
+    _JOIN_PATTERNS = [
+        # Vanilla / Spigot / Paper: "PlayerName joined the game"
+        re.compile(r"(?i)\b([A-Za-z0-9_]{3,16}) joined the game\b"),
+    ]
+
+    _LEAVE_PATTERNS = [
+        # Vanilla / Spigot / Paper: "PlayerName left the game"
+        re.compile(r"(?i)\b([A-Za-z0-9_]{3,16}) left the game\b"),
+        # Paper: "PlayerName lost connection: ..."
+        re.compile(r"(?i)\b([A-Za-z0-9_]{3,16}) lost connection\b"),
+        # Otros: "PlayerName has disconnected"
+        re.compile(r"(?i)\b([A-Za-z0-9_]{3,16}) has disconnected\b"),
+    ]
+    # --- limpiar códigos de color de Minecraft y escapes ANSI ---
+    _MC_COLOR_RE = re.compile(r"§.")          # elimina §a, §b, §x, §f, etc.
     _ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")  # elimina secuencias tipo ESC[0m, ESC[31m...
 
     def _clean_log_line(self, line: str) -> str:
@@ -433,78 +3570,401 @@ class EsparcraftLauncher(ctk.CTk):
         # Desactivado: ya no usamos "list", solo logs join/leave
         return
 
+    _PLAYER_NAME_RE = re.compile(r"[A-Za-z0-9_]{3,16}")
+
+    # Paper / vanilla al hacer login: "UUID of player Steve is 069a79f4-44e9-4726-a5be-fca90e38aaf5"
+    _UUID_OF_RE = re.compile(r"UUID of player ([A-Za-z0-9_]{3,16}) is ([0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12})\b")
+
+    def _player_set_uuid(self, server: "ServerRuntime", name: str, uuid: str):
+        """name->uuid en memoria al momento (usercache.json se escribe mucho más tarde)."""
+        k = PlayerRegistry.key(name)
+        if server.usercache.get(k) == uuid:
+            return
+        server.usercache[k] = uuid
+        if not server.players.add_known(name):
+            # ya conocido: solo cambia la UUID (tarjetas e índice)
+            server.search.add(k, server.players.display(name), uuid)
+            server.players_dirty = True
+
     def _player_set_online(self, server: "ServerRuntime", name: str):
         name = self._normalize_player_name(name)
-        
-        if not re.fullmatch(r"[A-Za-z0-9_]{3,16}", name):
+
+        if not self._PLAYER_NAME_RE.fullmatch(name):
+            return
+        if server.players.set_online(name):
+            now = self.now()
+            server.last_players_update = now
+            if server.sessions is not None:
+                server.sessions.record_join(PlayerRegistry.key(name), name, now, server.players.online_count)
+    
+    def _normalize_player_name(self, name: str) -> str:
+        name = (name or "").strip()
+
+        # Si viene con prefijo numérico (ej: 93mLoconothor) -> Loconothor
+        m = re.match(r"^\d+[A-Za-z]([A-Za-z0-9_]{2,15})$", name)
+        if m:
+            candidate = m.group(1)
+            # candidate ya empieza con letra, longitud 3-16 total garantizada por el regex
+            return candidate
+
+        return name
+
+    def _player_set_offline(self, server: "ServerRuntime", name: str):
+        name = self._normalize_player_name(name)
+
+        if not self._PLAYER_NAME_RE.fullmatch(name):
+            return
+        if server.players.set_offline(name):
+            now = self.now()
+            server.last_players_update = now
+            if server.sessions is not None:
+                server.sessions.record_leave(PlayerRegistry.key(name), now, server.players.online_count + 1)
+
+    def _try_parse_join_leave_from_log_line(self, server: "ServerRuntime", line: str) -> bool:
+        s = line.strip()
+
+        if "UUID of player" in s:
+            m = self._UUID_OF_RE.search(s)
+            if m:
+                self._player_set_uuid(server, m.group(1), m.group(2))
+                return True
+
+        for rx in self._JOIN_PATTERNS:
+            m = rx.search(s)
+            if m:
+                self._player_set_online(server, m.group(1))
+                return True
+
+        for rx in self._LEAVE_PATTERNS:
+            m = rx.search(s)
+            if m:
+                self._player_set_offline(server, m.group(1))
+                return True
+
+        return False
+
+    def _try_parse_players_from_log_line(self, server: "ServerRuntime", line: str) -> bool:
+        # Desactivado: ya no usamos salida de "list"
+        return False
+
+
+class LogCapture:
+    """
+    Grabación de la salida cruda de un servidor para reproducirla luego
+    (bench/replay.py). Formato: una línea por evento, "<segundos>\t<línea>".
+    """
+
+    def __init__(self, path: str, t0: float):
+        self.path = path
+        self.t0 = t0
+        self.lines = 0
+        self._f = open(path, "w", encoding="utf-8", newline="\n")
+        self._lock = threading.Lock()
+
+    def write(self, raw: str, t: float):
+        with self._lock:
+            if self._f is None:
+                return
+            self._f.write(f"{t - self.t0:.3f}\t{raw}\n")
+            self.lines += 1
+
+    def close(self):
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+
+# ===================== VIRTUAL LIST =====================
+_UNBOUND = object()
+
+
+class VirtualList:
+    """
+    Lista virtual de filas de altura fija. Solo existen las filas que caben en
+    pantalla (un pool reutilizable); al hacer scroll se re-enlazan a otros datos
+    y solo se vuelve a pintar una fila cuando su dato cambió.
+    make_row(parent) -> fila, bind_row(fila, item) la rellena,
+    prefetch(items_visibles) opcional antes de enlazar (p. ej. consultas en lote).
+    """
+
+    def __init__(self, parent, row_height: int, make_row, bind_row, prefetch=None, gap: int = 12):
+        self.row_height = row_height
+        self.gap = gap
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.prefetch = prefetch
+        self.items = []
+        self.first = 0
+        self.pool = []       # filas creadas
+        self.bound = []      # item enlazado en cada fila (_UNBOUND = oculta)
+
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.frame.grid_rowconfigure(0, weight=1)
+
+        self.body = ctk.CTkFrame(self.frame, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew", padx=(10, 4), pady=6)
+        self.scrollbar = ctk.CTkScrollbar(self.frame, command=self._yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns", pady=6)
+
+        self.empty_label = ctk.CTkLabel(self.body, text="", text_color="#9ca3af",
+                                        font=ctk.CTkFont(size=14, weight="bold"))
+
+        self.body.bind("<Configure>", lambda e: self.refresh(), add="+")
+        self._bind_wheel(self.body)
+
+    # ---------- datos ----------
+    def set_items(self, items, stale=None, empty_text: str = ""):
+        """items: lista de valores comparables; stale: items a re-enlazar aunque no cambien."""
+        self.items = items if isinstance(items, list) else list(items)
+        self.empty_label.configure(text=empty_text)
+        self.refresh(stale=stale)
+
+    def refresh(self, force: bool = False, stale=None):
+        if not self.frame.winfo_exists():
+            return
+        cap = self._capacity()
+        n = len(self.items)
+        self.first = max(0, min(self.first, n - cap + 1))
+
+        while len(self.pool) < min(cap, n):
+            row = self.make_row(self.body)
+            row.configure(height=self.row_height - self.gap)
+            row.grid_propagate(False)
+            row.pack_propagate(False)
+            self._bind_wheel(row)
+            self.pool.append(row)
+            self.bound.append(_UNBOUND)
+
+        view = self.items[self.first:self.first + cap]
+        if self.prefetch is not None and view:
+            self.prefetch(view)
+
+        for i, row in enumerate(self.pool):
+            if i < len(view):
+                item = view[i]
+                was = self.bound[i]
+                if force or was is _UNBOUND or was != item or (stale and item in stale):
+                    self.bind_row(row, item)
+                    if was is _UNBOUND:
+                        row.place(x=0, y=i * self.row_height, relwidth=1)
+                    self.bound[i] = item
+            elif self.bound[i] is not _UNBOUND:
+                row.place_forget()
+                self.bound[i] = _UNBOUND
+
+        if n:
+            self.empty_label.place_forget()
+            self.scrollbar.set(self.first / n, min(1.0, (self.first + cap - 1) / n))
+        else:
+            self.empty_label.place(relx=0.5, y=30, anchor="n")
+            self.scrollbar.set(0.0, 1.0)
+
+    def destroy(self):
+        self.frame.destroy()
+
+    # ---------- scroll ----------
+    def _capacity(self) -> int:
+        h = self.body.winfo_height() / self.body._get_widget_scaling()
+        if h <= 1:
+            h = 600   # aún sin geometría
+        return max(1, int(h // self.row_height) + 1)
+
+    def _yview(self, *args):
+        n = len(self.items)
+        if not n or not args:
+            return
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * n)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= max(1, self._capacity() - 1)
+            self.first += step
+        self.refresh()
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self._yview("scroll", step * 3, "units")
+        return "break"
+
+    def _bind_wheel(self, widget):
+        # bind de tkinter en cada widget real (los CTk reenvían su bind a los internos)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tkinter.Misc.bind(widget, seq, self._on_wheel, "+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+
+# ===================== APP =====================
+class _LauncherApp(LogIngest):
+    """Toda la app; launcher_app_class() la combina con ctk.CTk (EsparcraftLauncher)."""
+
+    def _players_ui_make_online_row(self, server: ServerRuntime, parent):
+        """Fila reutilizable (username + uuid + botones); se enlaza con _players_ui_bind_online_row."""
+        name_font = ctk.CTkFont(size=12, weight="bold")
+        sub_font = ctk.CTkFont(size=10)
+
+        row = ctk.CTkFrame(parent, corner_radius=12)
+        row.grid_columnconfigure(0, weight=1)
+        row._name = ""
+
+        left = ctk.CTkFrame(row, fg_color="transparent")
+        left.grid(row=0, column=0, sticky="w", padx=10, pady=8)
+
+        top = ctk.CTkFrame(left, fg_color="transparent")
+        top.pack(anchor="w")
+
+        name_label = ctk.CTkLabel(top, text="", font=name_font)
+        name_label.pack(side="left")
+
+        op_badge = ctk.CTkLabel(
+            top, text="OP", text_color="white",
+            fg_color="#f59e0b", corner_radius=10, padx=7, pady=1
+        )
+
+        uuid_label = ctk.CTkLabel(left, text="", font=sub_font, text_color="#9ca3af")
+        uuid_label.pack(anchor="w", pady=(2, 0))
+
+        right = ctk.CTkFrame(row, fg_color="transparent")
+        right.grid(row=0, column=1, sticky="e", padx=10, pady=8)
+
+        def _send_cmd(cmd: str):
+            if not server.running or not server.process:
+                return
+            try:
+                server.process.stdin.write(cmd + "\n")
+                server.process.stdin.flush()
+            except Exception:
+                pass
+
+        # los botones leen el jugador enlazado ahora mismo (la fila se recicla)
+        def kick_player():
+            name = row._name
+            if messagebox.askyesno("Kick", f"¿Expulsar a {name}?"):
+                _send_cmd(f"kick {name}")
+
+        def ban_player():
+            name = row._name
+            if messagebox.askyesno("Ban", f"¿Banear a {name}?"):
+                _send_cmd(f"ban {name}")
+
+        def deop_player():
+            name = row._name
+            if messagebox.askyesno("DeOP", f"¿Quitar OP a {name}?"):
+                _send_cmd(f"deop {name}")
+
+        btn_style = dict(width=54, height=24, fg_color="#374151", hover_color="#4b5563")
+        ctk.CTkButton(right, text="Kick", command=kick_player, **btn_style).pack(side="left", padx=(0, 8))
+        ctk.CTkButton(right, text="Ban", command=ban_player,
+                    fg_color="#7f1d1d", hover_color="#450a0a",
+                    width=54, height=24).pack(side="left", padx=(0, 8))
+        ctk.CTkButton(right, text="DeOP", command=deop_player, **btn_style).pack(side="left")
+
+        # guarda refs para updates
+        row._name_label = name_label
+        row._uuid_label = uuid_label
+        row._op_badge = op_badge
+        return row
+
+    @staticmethod
+    def _players_ui_set_badge(badge, visible: bool, **pack_kw):
+        # (pack_info falla si no está packed; usamos try)
+        if visible:
+            try:
+                badge.pack_info()
+            except Exception:
+                badge.pack(**pack_kw)
+        else:
+            try:
+                badge.pack_forget()
+            except Exception:
+                pass
+
+    def _players_ui_bind_online_row(self, row, item: tuple):
+        """item = (name, uuid, is_op)"""
+        name, uuid, is_op = item
+        row._name = name
+        row._name_label.configure(text=name)
+        row._uuid_label.configure(text=f"UUID: {uuid}")
+        self._players_ui_set_badge(row._op_badge, is_op, side="left", padx=(6, 0))
+
+    def _players_ui_sync_online(self, server: ServerRuntime, stale=None):
+        """
+        Sincroniza ONLINE: calcula los items (en orden de server.players) y
+        aplica la búsqueda; la lista virtual solo re-pinta filas que cambiaron.
+        """
+        ui = getattr(self, "_players_ui", None)
+        if not ui or ui.get("server_id") != server.config.id:
             return
-        server.known_players.add(name)
-        if not name:
+        if ui["tab_var"].get() != "ONLINE":
             return
-        server.players_changed.add(name)
-        if name not in server._players_online_set:
-            server._players_online_set.add(name)
-            server.players_online.append(name)
-
-        if name in server._players_offline_set:
-            server._players_offline_set.discard(name)
-            server.players_offline = [n for n in server.players_offline if n != name]
-
-        server.last_players_update = time.time()
-        server.players_dirty = True
-    
-    def _normalize_player_name(self, name: str) -> str:
-        name = (name or "").strip()
 
-        # Si viene con prefijo numérico (ej: 93mLoconothor) -> Loconothor
-        m = re.match(r"^\d+[A-Za-z]([A-Za-z0-9_]{2,15})$", name)
-        if m:
-            candidate = m.group(1)
-            # candidate ya empieza con letra, longitud 3-16 total garantizada por el regex
-            return candidate
+        q = ui["search_var"].get().strip().lower()
 
-        return name
+        ops_set = self._ops_names(server)
 
-    def _player_set_offline(self, server: "ServerRuntime", name: str):
-        name = self._normalize_player_name(name)
-        
-        if not re.fullmatch(r"[A-Za-z0-9_]{3,16}", name):
-            return
-        server.known_players.add(name)
-        if not name:
-            return
-        server.players_changed.add(name)
-        if name in server._players_online_set:
-            server._players_online_set.discard(name)
-            server.players_online = [n for n in server.players_online if n != name]
+        names = self._search_players(server, q, online=True) if q else server.players.online_names()
+        items = [(name, self._uuid_for_player(server, name), name.lower() in ops_set) for name in names]
 
-        if name not in server._players_offline_set:
-            server._players_offline_set.add(name)
-            server.players_offline.append(name)
+        ui["vlist"].set_items(items, empty_text="No hay jugadores online.")
+        ui["counter_label"].configure(text=f"{len(items)} online")
 
-        server.last_players_update = time.time()
-        server.players_dirty = True
+    @perf_timed("tick_background")
+    def _tick_background(self):
+        """
+        Procesa colas de logs de TODOS los servidores:
+        - añade líneas a server.logs
+        - parsea join/leave
+        - marca players_dirty cuando corresponda
+        """
+        for server in self.servers.values():
+            self._drain_server_queue(server)
+            # muestra de CPU/RAM aunque el dashboard esté oculto (la usan las tareas
+            # de mantenimiento); como mucho una lectura de psutil cada 1.2 s
+            update_server_performance(server)
 
-    def _try_parse_join_leave_from_log_line(self, server: "ServerRuntime", line: str) -> bool:
-        s = line.strip()
+        # cierra la captura de cProfile aunque el overlay esté cerrado
+        if PERF.profiling:
+            PERF.poll_profile()
 
-        for rx in self._JOIN_PATTERNS:
-            m = rx.search(s)
-            if m:
-                self._player_set_online(server, m.group(1))
-                return True
+        self.after(80, self._tick_background)  # 12.5 veces/seg, ligero
+    # ---------- LOG TAGS ----------
+    def _configure_console_tags(self, console):
+        console.tag_config("INFO", foreground="#cfcfcf")
+        console.tag_config("WARN", foreground="#f1c40f")
+        console.tag_config("ERROR", foreground="#e74c3c")
+        console.tag_config("SUCCESS", foreground="#2ecc71")
+        console.tag_config("COMMAND", foreground="#3498db")
+        console.tag_config("SYSTEM", foreground="#9b59b6")
 
-        for rx in self._LEAVE_PATTERNS:
-            m = rx.search(s)
-            if m:
-                self._player_set_offline(server, m.group(1))
-                return True
+    def _get_log_tag(self, line: str) -> str:
+        u = line.upper()
+        if u.startswith(">"):
+            return "COMMAND"
+        if "ERROR" in u or "SEVERE" in u or "FATAL" in u:
+            return "ERROR"
+        if "WARN" in u or "WARNING" in u:
+            return "WARN"
+        if any(x in u for x in ["DONE", "STARTED", "LISTENING"]):
+            return "SUCCESS"
+        if any(x in u for x in ["LOADING", "SAVING", "STOPPING"]):
+            return "SYSTEM"
+        return "INFO"
 
-        return False
+    def _insert_colored_log(self, console, line):
+        tag = self._get_log_tag(line)
+        if not self.log_filters.get(tag, True):
+            return
+        console.insert("end", line + "\n", tag)
 
-    def _try_parse_players_from_log_line(self, server: "ServerRuntime", line: str) -> bool:
-        # Desactivado: ya no usamos salida de "list"
-        return False
+    
 
     def open_players_manager(self, server: ServerRuntime):
         self.current_players = server.config.id
@@ -513,100 +3973,53 @@ class EsparcraftLauncher(ctk.CTk):
     def _load_usercache(self, server: ServerRuntime):
         """
         Carga usercache.json para mapear name->uuid.
-        Se puede llamar al abrir la vista o al refrescar.
+        Las UUIDs nuevas llegan del log ("UUID of player"); esto solo reconcilia
+        al arrancar, al abrir la vista o cuando el watcher ve cambiar el fichero.
+        Si el fichero no cambió (JSON_CACHE), no se vuelve a parsear ni a recorrer.
         """
         path = os.path.join(server.config.path, "usercache.json")
-        if not os.path.exists(path):
-            server.usercache = {}
+        parsed = JSON_CACHE.get(path, parse_usercache, _EMPTY_USERCACHE)
+        if parsed is server._usercache_src:
             return
-
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            cache = {}
-            if isinstance(data, list):
-                for it in data:
-                    name = (it.get("name") or "").strip()
-                    uuid = (it.get("uuid") or "").strip()
-                    if name and uuid:
-                        cache[name.lower()] = uuid
-                        server.known_players.add(name)
-            server.usercache = cache
-        
-        except Exception:
-            server.usercache = {}
+        server._usercache_src = parsed
+        # fusionar: el ingest ya añadió en caliente las UUIDs de los últimos logins
+        server.usercache.update(parsed["uuids"])
+        for name in parsed["names"]:
+            server.players.add_known(name)
+            server.search.add(PlayerRegistry.key(name), server.players.display(name), parsed["uuids"][name.lower()])
 
     def _get_offline_players(self, server: ServerRuntime) -> list[str]:
-        # offline = conocidos - online (comparación case-insensitive)
-        online_lower = {n.lower() for n in server._players_online_set}
-
-        offline = []
-        seen_lower = set()
-
-        for n in server.known_players:
-            nl = n.lower()
-            if nl in online_lower:
-                continue
-            if nl in seen_lower:
-                continue
-            seen_lower.add(nl)
-            offline.append(n)
+        # offline = conocidos - online; el registro ya lo mantiene ordenado
+        return server.players.offline_names()
 
-        offline.sort(key=str.lower)
-        return offline
     def _uuid_for_player(self, server: ServerRuntime, name: str) -> str:
         raw = server.usercache.get(name.lower(), "")
         return format_uuid_pretty(raw) if raw else "—"
 
     def _read_ops(self, server: ServerRuntime) -> list[dict]:
         """Lee ops.json. Devuelve lista de dicts: {name, uuid, level, bypassesPlayerLimit}"""
-        ops_file = os.path.join(server.config.path, "ops.json")
-        if not os.path.exists(ops_file):
-            return []
+        return JSON_CACHE.get(os.path.join(server.config.path, "ops.json"), parse_ops, _EMPTY_LIST)["list"]
 
-        try:
-            with open(ops_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # data suele ser lista
-            if isinstance(data, list):
-                # normalizar claves que a veces faltan
-                out = []
-                for it in data:
-                    out.append({
-                        "name": it.get("name", "Unknown"),
-                        "uuid": it.get("uuid", ""),
-                        "level": it.get("level", ""),
-                        "bypassesPlayerLimit": it.get("bypassesPlayerLimit", False),
-                    })
-                return out
-        except Exception:
-            return []
+    def _ops_names(self, server: ServerRuntime) -> set:
+        """Nombres de ops.json en minúsculas (conjunto cacheado)."""
+        return JSON_CACHE.get(os.path.join(server.config.path, "ops.json"), parse_ops, _EMPTY_LIST)["names"]
 
-        return []
     def _read_bans(self, server: ServerRuntime) -> list[dict]:
         """Lee banned-players.json. Devuelve lista de dicts: {name, uuid, reason, created, source}"""
-        bans_file = os.path.join(server.config.path, "banned-players.json")
-        if not os.path.exists(bans_file):
-            return []
+        return JSON_CACHE.get(os.path.join(server.config.path, "banned-players.json"), parse_bans, _EMPTY_LIST)["list"]
 
-        try:
-            with open(bans_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                out = []
-                for it in data:
-                    out.append({
-                        "name": it.get("name", "Unknown"),
-                        "uuid": it.get("uuid", ""),
-                        "reason": it.get("reason", ""),
-                        "created": it.get("created", ""),
-                        "source": it.get("source", ""),
-                    })
-                return out
-        except Exception:
-            return []
+    def _search_json_list(self, server: ServerRuntime, filename: str, parser, query: str) -> list[dict]:
+        """ops/bans filtrados por nombre o UUID y ordenados por relevancia (índice cacheado)."""
+        parsed = JSON_CACHE.get(os.path.join(server.config.path, filename), parser, _EMPTY_LIST)
+        if not query.strip():
+            return parsed["list"]
+        return [parsed["list"][i] for i in parsed["index"].search(query)]
 
-        return []
+    def _search_players(self, server: ServerRuntime, query: str, online: bool) -> list[str]:
+        """Nombres online/offline que coinciden con la búsqueda, por relevancia."""
+        players = server.players
+        hits = server.search.search(query)
+        return [players.display(k) for k in hits if k in players and players.is_online(k) == online]
 
     
 
@@ -645,16 +4058,19 @@ class EsparcraftLauncher(ctk.CTk):
         }
         self._plugins_cache = {}          # plugins_dir -> list[dict]
         self._plugins_search_after_id = None
-
-        global JAVA_EXE, JAVA_VERSION_STR, JAVA_MAJOR
-
-        JAVA_EXE = find_java_exe()
-        if JAVA_EXE:
-            JAVA_VERSION_STR = get_java_version(JAVA_EXE)
-            JAVA_MAJOR = parse_java_major(JAVA_VERSION_STR)
-        else:
-            JAVA_VERSION_STR = "Java no encontrado"
-
+        self._plugins_view = None         # {"server_id", "dir", "render"} mientras la vista está abierta
+        self._plugin_meta_cache = None    # plugins_cache.json (se carga al abrir Plugins)
+        self._plugins_scanning = set()    # plugins_dir con escaneo de metadatos en curso
+
+        # cambios en disco (SFTP, plugins que editan ops.json...) -> invalidar cachés/vistas
+        self._fs_watcher = FsWatcher(self._on_fs_changes, on_untrust=self._on_fs_untrust)
+
+        # Java: solo localizar (barato) + cache; `java -version` va en segundo plano
+        self.java_runtimes: list[dict] = []      # inventario (scan_java_installs)
+        self._jar_req_cache = {}                 # jar_path -> (stat, requisito); solo hilo de UI
+        self._jar_req_pending = set()            # jar_path con lectura en segundo plano
+        self._java_cache = {}                    # solo hilo de UI; los hilos trabajan con copias
+        self._console_last_index = 0
 
         self._build_ui()
         self._load_servers()
@@ -663,12 +4079,266 @@ class EsparcraftLauncher(ctk.CTk):
         if self.servers:
             self.current_console = next(iter(self.servers))
 
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # overlay de rendimiento (F12)
+        self._perf_overlay = None
+        self.bind_all("<F12>", lambda e: self.toggle_perf_overlay())
+
+        # primer frame con un esqueleto; el dashboard y Java se montan después
+        self._startup_done = False
+        self._show_startup_skeleton()
+        self.bind("<Map>", self._on_first_map, add="+")
+        self.after(1000, self._finish_startup)   # por si la ventana nunca se mapea (withdraw)
+
+    def _show_startup_skeleton(self):
+        self._startup_skeleton = ctk.CTkLabel(
+            self.content,
+            text="Cargando servidores...",
+            text_color="#9ca3af",
+            font=ctk.CTkFont(size=16)
+        )
+        self._startup_skeleton.pack(expand=True)
+
+    def _on_first_map(self, _event=None):
+        """La ventana ya es visible: terminar el arranque en el siguiente ciclo."""
+        # <Map> del toplevel también llega por cada hijo que se mapea
+        if getattr(self, "_first_mapped", False):
+            return
+        self._first_mapped = True
+        self._startup_mark("first_frame")
+        self.after(10, self._finish_startup)
+
+    def _finish_startup(self):
+        if self._startup_done:
+            return
+        self._startup_done = True
+        self._init_java_from_cache()
+
         # empezamos en el dashboard
         self.show_dashboard()
+        self._startup_mark("dashboard")
 
         self.after(100, self._tick_background)
-        self._console_last_index = 0
+        self._fs_watcher.start()
+        JSON_CACHE.trusted_dirs = self._fs_watcher.trusted_dirs()
+
+        # historial de jugadores: escalonado para no bloquear el primer frame
+        for i, server in enumerate(list(self.servers.values())):
+            self.after(50 * (i + 1), lambda s=server: self._sessions_preload(s))
+
+        # revalidar Java cuando la ventana ya está visible
+        self.after(300, self._revalidate_java_async)
+
+        if os.environ.get("ESPARCRAFT_STARTUP_BENCH"):
+            self.after(50, self.destroy)
+
+    def _startup_mark(self, name: str):
+        """Marca de tiempo para bench/startup.py (solo con ESPARCRAFT_STARTUP_BENCH)."""
+        if os.environ.get("ESPARCRAFT_STARTUP_BENCH"):
+            print(f"STARTUP {name} {time.time():.6f}", flush=True)
+
+
+    # ===================== PERF OVERLAY =====================
+    def toggle_perf_overlay(self):
+        """Muestra/oculta la ventana con los histogramas de los loops (F12)."""
+        ov = self._perf_overlay
+        if ov and ov.get("win") and ov["win"].winfo_exists():
+            ov["win"].destroy()
+            self._perf_overlay = None
+            return
+
+        win = ctk.CTkToplevel(self)
+        win.title("Rendimiento UI")
+        win.geometry("760x520")
+        win.attributes("-topmost", True)
+
+        top = ctk.CTkFrame(win, fg_color="transparent")
+        top.pack(fill="x", padx=10, pady=(10, 4))
+
+        ctk.CTkLabel(top, text="cProfile (s):").pack(side="left")
+        secs_var = ctk.StringVar(value="5")
+        ctk.CTkEntry(top, textvariable=secs_var, width=50).pack(side="left", padx=(6, 8))
+
+        status = ctk.CTkLabel(top, text="", text_color="#9ca3af")
+
+        def capture():
+            try:
+                secs = float(secs_var.get())
+            except ValueError:
+                secs = 5.0
+            PERF.start_profile(secs)
+            status.configure(text=f"Capturando {secs:.0f}s...")
+
+        ctk.CTkButton(top, text="⏺ Capturar", width=90, fg_color="#7c3aed", command=capture)\
+            .pack(side="left", padx=(0, 8))
+        ctk.CTkButton(top, text="Reset", width=60, fg_color="#374151", command=PERF.reset)\
+            .pack(side="left")
+        status.pack(side="left", padx=(10, 0))
+
+        text = ctk.CTkTextbox(win, font=ctk.CTkFont(family="Consolas", size=12), wrap="none")
+        text.pack(fill="both", expand=True, padx=10, pady=(4, 10))
+
+        self._perf_overlay = {"win": win, "text": text, "status": status}
+        win.protocol("WM_DELETE_WINDOW", self.toggle_perf_overlay)
+        self._perf_overlay_refresh()
+
+    def _perf_overlay_render(self) -> str:
+        edges = PerfMonitor.BUCKETS_MS
+        head = "".join(f"<{e:<4}" for e in edges) + f">={edges[-1]}"
+        out = [f"{'loop':<24}{'n':>6}{'p50':>8}{'p95':>8}{'max':>8}   {head}"]
+        for name in sorted(PERF.samples):
+            st = PERF.summary(name)
+            hist = PERF.histogram(name)
+            total = max(1, sum(hist))
+            # cada bucket se pinta como barra de 0-4 bloques
+            bars = "".join(f"{'█' * round(4 * c / total):<5}" for c in hist)
+            out.append(
+                f"{name:<24}{st['n']:>6}{st['p50']:>8.2f}{st['p95']:>8.2f}{st['max']:>8.2f}   {bars}"
+            )
+        if PERF.last_profile_text:
+            out.append("")
+            out.append(f"--- cProfile: {PERF.last_profile_path or '(sin guardar)'} ---")
+            out.append(PERF.last_profile_text)
+        return "\n".join(out)
+
+    def _perf_overlay_refresh(self):
+        ov = self._perf_overlay
+        if not ov or not ov["win"].winfo_exists():
+            self._perf_overlay = None
+            return
+
+        if PERF.poll_profile():
+            ov["status"].configure(text="Captura guardada")
+
+        text = ov["text"]
+        y = text.yview()[0]
+        text.configure(state="normal")
+        text.delete("1.0", "end")
+        text.insert("end", self._perf_overlay_render())
+        text.configure(state="disabled")
+        text.yview_moveto(y)
+
+        ov["win"].after(500, self._perf_overlay_refresh)
+
+    # ===================== JAVA =====================
+    def _init_java_from_cache(self):
+        """Rellena JAVA_* sin lanzar la JVM: usa la cache si el ejecutable no cambió."""
+        global JAVA_EXE, JAVA_VERSION_STR, JAVA_MAJOR
+
+        self._java_cache = load_java_cache()
+        JAVA_EXE = find_java_exe()
+        if not JAVA_EXE:
+            JAVA_VERSION_STR = "Java no encontrado"
+            JAVA_MAJOR = None
+            return
+
+        version = cached_java_version(JAVA_EXE, self._java_cache)
+        if version:
+            JAVA_VERSION_STR = version
+            JAVA_MAJOR = parse_java_major(version)
+        else:
+            JAVA_VERSION_STR = "Detectando..."
+            JAVA_MAJOR = None
+
+    def _revalidate_java_async(self):
+        """
+        Comprueba la cache en un hilo y solo ejecuta `java -version` si hace falta.
+        El hilo trabaja con una copia de la cache y lee también los requisitos de
+        los jars; todo se publica en el hilo de UI (_apply_java_info).
+        """
+        cache = dict(self._java_cache)
+        jars = [os.path.join(s.config.path, s.config.jar) for s in self.servers.values()]
+        self._jar_req_pending.update(jars)
+
+        def work():
+            java = find_java_exe()
+            if not java:
+                result = (None, "Java no encontrado")
+            else:
+                version = cached_java_version(java, cache)
+                if not version:
+                    version = probe_java_version(java, cache)
+                result = (java, version)
+
+            # inventario completo de JDKs (mismo hilo: comparte la copia de la cache)
+            runtimes = scan_java_installs(cache)
+            reqs = jar_requirements(jars)
+            self.after(0, lambda: self._apply_java_info(*result, runtimes, cache, reqs))
 
+        threading.Thread(target=work, daemon=True).start()
+
+    def _apply_java_info(self, java: Optional[str], version: str, runtimes: Optional[list] = None,
+                         cache: Optional[dict] = None, jar_reqs: Optional[dict] = None):
+        global JAVA_EXE, JAVA_VERSION_STR, JAVA_MAJOR
+        changed = (java, version) != (JAVA_EXE, JAVA_VERSION_STR)
+        JAVA_EXE = java
+        JAVA_VERSION_STR = version
+        JAVA_MAJOR = parse_java_major(version) if java else None
+        if cache is not None:
+            self._java_cache = cache
+        if runtimes is not None and runtimes != self.java_runtimes:
+            self.java_runtimes = runtimes
+            changed = True
+        if jar_reqs:
+            changed = self._merge_jar_requirements(jar_reqs) or changed
+
+        # el dashboard pinta la versión de Java: refrescar si está visible
+        if changed:
+            self._dash_refresh()
+
+    def _jar_requirement(self, cfg: ServerConfig, blocking: bool = False) -> tuple[Optional[int], Optional[int], str]:
+        """
+        jar_java_requirement con cache por (ruta, mtime, tamaño). Sin blocking no lee
+        el jar en el hilo de UI: lo pide en segundo plano y devuelve lo último conocido
+        (o sin requisito); al llegar se refresca el dashboard.
+        """
+        jar_path = os.path.join(cfg.path, cfg.jar)
+        key = _java_stat_key(jar_path)
+        hit = self._jar_req_cache.get(jar_path)
+        if hit and hit[0] == key:
+            return hit[1]
+        if blocking:
+            self._merge_jar_requirements(jar_requirements([jar_path]))
+            return self._jar_req_cache[jar_path][1]
+        if key is not None and jar_path not in self._jar_req_pending:
+            self._jar_req_pending.add(jar_path)
+
+            def work():
+                reqs = jar_requirements([jar_path])
+                self.after(0, lambda: self._merge_jar_requirements(reqs) and self._dash_refresh())
+
+            threading.Thread(target=work, daemon=True).start()
+        return hit[1] if hit else (None, None, "")
+
+    def _merge_jar_requirements(self, reqs: dict) -> bool:
+        """Publica requisitos leídos en segundo plano (hilo de UI). Devuelve si cambió alguno."""
+        changed = False
+        for jar_path, entry in reqs.items():
+            self._jar_req_pending.discard(jar_path)
+            old = self._jar_req_cache.get(jar_path)
+            if old is None or old[1] != entry[1]:
+                changed = True
+            self._jar_req_cache[jar_path] = entry
+        return changed
+
+    def _java_for_server(self, cfg: ServerConfig, blocking: bool = False) -> tuple[Optional[str], Optional[int], str]:
+        """Runtime a usar para un servidor: (ruta, major, motivo)."""
+        by_path = {r["path"]: r for r in self.java_runtimes}
+
+        if cfg.java:
+            if os.path.exists(cfg.java):
+                r = by_path.get(os.path.realpath(cfg.java))
+                major = r["major"] if r else parse_java_major(
+                    cached_java_version(cfg.java, self._java_cache) or "")
+                return cfg.java, major, "manual"
+            return None, None, f"no existe {cfg.java}"
+
+        lo, hi, origin = self._jar_requirement(cfg, blocking)
+        r = pick_java_runtime(self.java_runtimes, lo, hi)
+        if r:
+            return r["path"], r["major"], f"auto, {origin}"
+        return JAVA_EXE, JAVA_MAJOR, "por defecto"
 
     # ===================== UI =====================
     def _build_ui(self):
@@ -824,6 +4494,7 @@ class EsparcraftLauncher(ctk.CTk):
         self._sidebar_players_render()
         self.after(600, self._sidebar_players_loop)
 
+    @perf_timed("sidebar_players_loop")
     def _sidebar_players_loop(self):
         """Auto-refresh del panel de jugadores de la barra lateral."""
         st = getattr(self, "_sidebar_players_state", None)
@@ -841,6 +4512,7 @@ class EsparcraftLauncher(ctk.CTk):
         self._sidebar_players_render()
         self.after(800, self._sidebar_players_loop)
 
+    @perf_timed("sidebar_players_render")
     def _sidebar_players_render(self):
         """Actualiza incrementalmente la lista de jugadores en el panel lateral."""
         st = getattr(self, "_sidebar_players_state", None)
@@ -863,35 +4535,26 @@ class EsparcraftLauncher(ctk.CTk):
             return
 
         server = self.servers[server_id]
-        self._load_usercache(server)
 
-        ops = self._read_ops(server)
-        bans = self._read_bans(server)
-
-        op_set = {(o.get("name") or "").lower() for o in ops}
+        op_set = self._ops_names(server)
 
         players: list[dict] = []
 
         # ---- modo Baneados ----
         if filter_mode == "Baneados":
-            for b in bans:
+            for b in self._search_json_list(server, "banned-players.json", parse_bans, q):
                 name = (b.get("name") or "").strip()
                 if not name:
                     continue
-                if q and q not in name.lower():
-                    continue
                 players.append({
                     "name": name,
                     "role": "BANEADO",
                     "uuid": format_uuid_pretty(b.get("uuid", "")) if b.get("uuid") else "—",
                 })
         else:
-            # solo jugadores ONLINE
-            seen = set()
-            for name in server.players_online:
-                if not name or name in seen:
-                    continue
-                seen.add(name)
+            # solo jugadores ONLINE (con búsqueda: ya vienen por relevancia)
+            names = self._search_players(server, q, online=True) if q else server.players.online_names()
+            for name in names:
                 nl = name.lower()
                 is_op = nl in op_set
 
@@ -901,9 +4564,6 @@ class EsparcraftLauncher(ctk.CTk):
                     continue
 
                 uuid = self._uuid_for_player(server, name)
-                if q and (q not in nl) and (q not in uuid.lower()):
-                    continue
-
                 role = "OP" if is_op else "JUGADOR"
 
                 players.append({
@@ -913,9 +4573,12 @@ class EsparcraftLauncher(ctk.CTk):
                     "is_op": is_op,
                 })
 
-            # prioridad: OP -> JUGADOR
-            players.sort(key=lambda p: (0 if p.get("is_op") else 1,
-                                        p["name"].lower()))
+            # prioridad: OP -> JUGADOR (sort estable: conserva la relevancia)
+            if q:
+                players.sort(key=lambda p: 0 if p.get("is_op") else 1)
+            else:
+                players.sort(key=lambda p: (0 if p.get("is_op") else 1,
+                                            p["name"].lower()))
 
         # clave de estado para evitar trabajo si nada cambió
         state_key = (
@@ -1139,11 +4802,31 @@ class EsparcraftLauncher(ctk.CTk):
             )
 
     # ===================== DASHBOARD =====================
+    DASH_COLUMNS = 3          # puedes cambiar a 2 o 4
+    DASH_CARD_W = 300
+    DASH_CARD_H = 360
+    DASH_CARD_PAD = 22
+    DASH_TICK_MS = 250        # visibilidad; los datos se refrescan cada 4 ticks (1 s)
+
     def show_dashboard(self):
+        """
+        Dashboard persistente: una tarjeta por servidor que se crea al entrar
+        en pantalla y se actualiza campo a campo desde un único tick compartido.
+        """
         self._clear_content()
         self._show_sidebar_players_panel(False)
 
-        container = ctk.CTkScrollableFrame(self.content)
+        dash = getattr(self, "_dash", None)
+        if dash is None or not dash["root"].winfo_exists():
+            dash = self._dash_build()
+
+        dash["root"].pack(fill="both", expand=True)
+        self._dash_sync_slots()
+
+    def _dash_build(self) -> dict:
+        root = ctk.CTkFrame(self.content, fg_color="transparent", corner_radius=0)
+
+        container = ctk.CTkScrollableFrame(root)
         container.pack(fill="both", expand=True, padx=30, pady=30)
 
         header = ctk.CTkFrame(container)
@@ -1158,47 +4841,179 @@ class EsparcraftLauncher(ctk.CTk):
             command=lambda: self.open_server_modal()
         ).pack(side="right")
 
-
-
         grid = ctk.CTkFrame(container)
         grid.pack(fill="both", expand=True)
 
-        columns = 3  # puedes cambiar a 2 o 4
-        for i in range(columns):
+        for i in range(self.DASH_COLUMNS):
             grid.grid_columnconfigure(i, weight=1, uniform="cards")
 
-        row = col = 0
+        self._dash = {
+            "root": root,
+            "container": container,
+            "grid": grid,
+            "slots": {},      # server_id -> {"server", "slot", "built", "w", "state"}
+            "order": [],
+            "n": 0,
+        }
+        # al hacer scroll, materializar en cuanto cambie la vista
+        container._parent_canvas.bind("<Configure>", lambda e: self._dash_materialize(), add="+")
+        self.after(self.DASH_TICK_MS, self._dash_tick)
+        return self._dash
+
+    def _dash_sync_slots(self):
+        """Añade/quita huecos según self.servers y los recoloca si cambió el orden."""
+        dash = self._dash
+        slots = dash["slots"]
+
+        for sid in list(slots.keys()):
+            if sid not in self.servers:
+                slots.pop(sid)["slot"].destroy()
+
+        for sid, server in self.servers.items():
+            entry = slots.get(sid)
+            if entry is None:
+                slot = ctk.CTkFrame(
+                    dash["grid"],
+                    width=self.DASH_CARD_W,
+                    height=self.DASH_CARD_H,
+                    corner_radius=20
+                )
+                slot.grid_propagate(False)
+                slot.pack_propagate(False)
+                slots[sid] = {"server": server, "slot": slot, "built": False, "w": {}, "state": {}}
+            else:
+                entry["server"] = server
+
+        order = list(self.servers.keys())
+        if order != dash["order"]:
+            for idx, sid in enumerate(order):
+                row, col = divmod(idx, self.DASH_COLUMNS)
+                slots[sid]["slot"].grid(row=row, column=col,
+                                        padx=self.DASH_CARD_PAD, pady=self.DASH_CARD_PAD, sticky="n")
+            dash["order"] = order
+
+        self._dash_materialize()
+        self._dash_refresh(force=True)
+
+    def _dash_visible_ids(self) -> list[str]:
+        """Servidores cuya tarjeta cae en la vista del scroll (más un margen de una fila)."""
+        dash = self._dash
+        container = dash["container"]
+        canvas = container._parent_canvas
+
+        row_h = self.DASH_CARD_H + 2 * self.DASH_CARD_PAD
+        view_h = canvas.winfo_height()
+        if view_h <= 1:
+            view_h = self.winfo_height()
+        inner_h = max(container.winfo_height(), 1)
+        view_top = canvas.yview()[0] * inner_h
+        y0 = view_top - row_h
+        y1 = view_top + view_h + row_h
+
+        grid_y = dash["grid"].winfo_y()
+        out = []
+        for idx, sid in enumerate(dash["order"]):
+            slot = dash["slots"][sid]["slot"]
+            if slot.winfo_height() > 1:
+                top, h = grid_y + slot.winfo_y(), slot.winfo_height()
+            else:
+                # aún sin geometría: posición estimada por fila
+                top, h = grid_y + (idx // self.DASH_COLUMNS) * row_h, row_h
+            if top + h >= y0 and top <= y1:
+                out.append(sid)
+        return out
+
+    def _dash_materialize(self):
+        """Construye el contenido de las tarjetas visibles que aún son huecos vacíos."""
+        dash = getattr(self, "_dash", None)
+        if not dash or not dash["root"].winfo_ismapped():
+            return
+        for sid in self._dash_visible_ids():
+            entry = dash["slots"][sid]
+            if not entry["built"]:
+                self._dash_build_card(entry)
+                self._dash_update_card(entry, force=True)
+
+    def _dash_tick(self):
+        dash = getattr(self, "_dash", None)
+        if not dash or not dash["root"].winfo_exists():
+            return
+        if dash["root"].winfo_ismapped():
+            with PERF.measure("dashboard_tick"):
+                dash["n"] += 1
+                self._dash_materialize()
+                if dash["n"] % 4 == 0:
+                    self._dash_refresh()
+        self.after(self.DASH_TICK_MS, self._dash_tick)
+
+    def _dash_refresh(self, force: bool = False):
+        """Actualiza las tarjetas construidas y visibles (solo campos que cambiaron)."""
+        dash = getattr(self, "_dash", None)
+        if not dash or not dash["root"].winfo_ismapped():
+            return
+        for sid in self._dash_visible_ids():
+            entry = dash["slots"][sid]
+            if entry["built"]:
+                self._dash_update_card(entry, force=force)
+
+    def _dash_refresh_server(self, server: ServerRuntime):
+        """Refresco inmediato de una tarjeta (p. ej. al terminar el proceso)."""
+        dash = getattr(self, "_dash", None)
+        if not dash:
+            return
+        entry = dash["slots"].get(server.config.id)
+        if entry and entry["built"] and dash["root"].winfo_ismapped():
+            self._dash_update_card(entry)
 
-        for server in self.servers.values():
-            self._server_card(grid, server, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
-
-
-    def _server_card(self, parent, server: ServerRuntime, row: int, col: int):
-        card = ctk.CTkFrame(
-            parent,
-            width=300,
-            height=360,
-            corner_radius=20
-        )
-        card.grid(row=row, column=col, padx=22, pady=22, sticky="n")
-        card.grid_propagate(False)
+    @staticmethod
+    def _server_status(server: ServerRuntime) -> tuple[str, str]:
+        # misma lógica que en _update_console
+        if not server.running:
+            return "OFFLINE", "#ef4444"
+        if server.stopping:
+            return "STOPPING", "#f97316"
+        if server.starting:
+            if server.phase == "preparing_spawn":
+                return f"IN PROGRESS {server.spawn_progress}%", "#f59e0b"
+            return "IN PROGRESS", "#f59e0b"
+        if server.ready:
+            return "ONLINE", "#22c55e"
+        return "IN PROGRESS", "#f59e0b"
+
+    def _dash_java_info(self, server: ServerRuntime) -> tuple[str, str]:
+        java_exe, java_major, _ = self._java_for_server(server.config)
+        req_min, req_max, _ = self._jar_requirement(server.config)
+        if req_min is None:
+            req_min = 17
+        compatible = bool(java_major) and java_major >= req_min and (req_max is None or java_major <= req_max)
+
+        if java_major and compatible:
+            return f"Java {java_major} (OK)", "#22c55e"
+        if java_major:
+            need = f"{req_min}-{req_max}" if req_max else f"{req_min}+"
+            return f"Java {java_major} (Incompatible, requiere {need})", "#ef4444"
+        if java_exe and JAVA_VERSION_STR == "Detectando...":
+            return "Detectando Java...", "#9ca3af"
+        return "Java no detectado", "#f59e0b"
+
+    def _dash_build_card(self, entry: dict):
+        server = entry["server"]
+        card = entry["slot"]
+        w = entry["w"]
 
         # ================= HEADER =================
         header = ctk.CTkFrame(card, height=70, corner_radius=20)
         header.pack(fill="x", padx=8, pady=8)
         header.pack_propagate(False)
 
-        ctk.CTkLabel(
+        w["name"] = ctk.CTkLabel(
             header,
             text=server.config.name,
             font=ctk.CTkFont(size=18, weight="bold"),
             wraplength=240,
             justify="center"
-        ).pack(expand=True)
+        )
+        w["name"].pack(expand=True)
 
         # ================= STATUS =================
         status_frame = ctk.CTkFrame(card, fg_color="transparent")
@@ -1207,61 +5022,19 @@ class EsparcraftLauncher(ctk.CTk):
         perf_frame = ctk.CTkFrame(card, fg_color="transparent")
         perf_frame.pack(anchor="w", padx=20, pady=(0, 10))
 
-        cpu_label = ctk.CTkLabel(perf_frame, text="CPU: -- %")
-        cpu_label.pack(side="left", padx=(0, 15))
-
-        ram_label = ctk.CTkLabel(perf_frame, text="RAM: -- MB")
-        ram_label.pack(side="left")
-
-        def update_performance():
-            update_server_performance(server)
-            if server.cached_cpu is not None:
-                cpu_label.configure(text=f"CPU: {server.cached_cpu:.1f} %")
-                ram_label.configure(text=f"RAM: {server.cached_ram:.0f} MB")
-            else:
-                cpu_label.configure(text="CPU: -- %")
-                ram_label.configure(text="RAM: -- MB")
-
-        # misma lógica que en _update_console
-        def get_status():
-            if not server.running:
-                return "OFFLINE", "#ef4444"
-            if server.stopping:
-                return "STOPPING", "#f97316"
-            if server.starting:
-                return "IN PROGRESS", "#f59e0b"
-            if server.ready:
-                return "ONLINE", "#22c55e"
-            return "IN PROGRESS", "#f59e0b"
+        w["cpu"] = ctk.CTkLabel(perf_frame, text="CPU: -- %")
+        w["cpu"].pack(side="left", padx=(0, 15))
 
-        text, color = get_status()
+        w["ram"] = ctk.CTkLabel(perf_frame, text="RAM: -- MB")
+        w["ram"].pack(side="left")
 
-        status_dot = ctk.CTkLabel(
-            status_frame,
-            text="●",
-            text_color=color,
-            font=ctk.CTkFont(size=14)
-        )
-        status_dot.pack(side="left", padx=(0, 6))
+        w["dot"] = ctk.CTkLabel(status_frame, text="●", font=ctk.CTkFont(size=14))
+        w["dot"].pack(side="left", padx=(0, 6))
 
-        status_label = ctk.CTkLabel(
-            status_frame,
-            text=text,
-            text_color=color
-        )
-        status_label.pack(side="left")
+        w["status"] = ctk.CTkLabel(status_frame, text="")
+        w["status"].pack(side="left")
 
         # ================= JAVA INFO =================
-        if JAVA_MAJOR and JAVA_MAJOR >= 17:
-            java_text = f"Java {JAVA_MAJOR} (OK)"
-            java_color = "#22c55e"
-        elif JAVA_MAJOR:
-            java_text = f"Java {JAVA_MAJOR} (Incompatible)"
-            java_color = "#ef4444"
-        else:
-            java_text = "Java no detectado"
-            java_color = "#f59e0b"
-
         java_frame = ctk.CTkFrame(card, fg_color="transparent")
         java_frame.pack(pady=(6, 12))
 
@@ -1271,11 +5044,8 @@ class EsparcraftLauncher(ctk.CTk):
             font=ctk.CTkFont(size=16)
         ).pack(side="left", padx=(0, 6))
 
-        ctk.CTkLabel(
-            java_frame,
-            text=java_text,
-            text_color=java_color
-        ).pack(side="left")
+        w["java"] = ctk.CTkLabel(java_frame, text="")
+        w["java"].pack(side="left")
 
         # ================= DIVIDER =================
         divider = ctk.CTkFrame(card, height=1, fg_color="#2a2a2a")
@@ -1285,134 +5055,139 @@ class EsparcraftLauncher(ctk.CTk):
         actions = ctk.CTkFrame(card, fg_color="transparent")
         actions.pack(expand=True, fill="x", padx=24)
 
-        main_btn_color = "#2563eb"
-
         # Botón principal (se actualiza dinámicamente)
-        main_button = ctk.CTkButton(
-            actions,
-            text="",
-            fg_color=main_btn_color
-        )
-        main_button.pack(fill="x", pady=6)
+        w["main"] = ctk.CTkButton(actions, text="", fg_color="#2563eb")
+        w["main"].pack(fill="x", pady=6)
 
-        # Botones secundarios
+        # Botones secundarios (leen entry["server"] al pulsar)
         ctk.CTkButton(
             actions,
             text="👥 Jugadores",
             fg_color="#374151",
-            command=lambda s=server: self.open_players_manager(s)
+            command=lambda e=entry: self.open_players_manager(e["server"])
         ).pack(fill="x", pady=4)
 
         ctk.CTkButton(
             actions,
             text="🖥 Abrir consola",
             fg_color="#374151",
-            command=lambda s=server: self.open_console(s)
+            command=lambda e=entry: self.open_console(e["server"])
         ).pack(fill="x", pady=4)
 
         ctk.CTkButton(
             actions,
             text="🧩 Plugins",
             fg_color="#374151",
-            command=lambda s=server: self.open_plugins_manager(s)
+            command=lambda e=entry: self.open_plugins_manager(e["server"])
         ).pack(fill="x", pady=4)
 
         ctk.CTkButton(
             actions,
             text="⚙ Configuración",
             fg_color="#374151",
-            command=lambda s=server: self.open_server_modal(s)
+            command=lambda e=entry: self.open_server_modal(e["server"])
         ).pack(fill="x", pady=(4, 10))
 
-        # ---------- ACTUALIZAR ESTADO + BOTÓN PRINCIPAL ----------
-        def update_status_ui():
-            text, color = get_status()
-            status_dot.configure(text_color=color)
-            status_label.configure(text=text, text_color=color)
+        entry["built"] = True
+        entry["state"] = {}
 
-            # Botón principal según estado real del servidor
-            if not server.running:
+    def _dash_update_card(self, entry: dict, force: bool = False):
+        """Aplica solo los campos que cambiaron desde la última vez."""
+        server = entry["server"]
+        w = entry["w"]
+        old = {} if force else entry["state"]
+
+        update_server_performance(server)
+        if server.cached_cpu is not None:
+            perf = (f"CPU: {server.cached_cpu:.1f} %", f"RAM: {server.cached_ram:.0f} MB")
+        else:
+            perf = ("CPU: -- %", "RAM: -- MB")
+
+        if not server.running:
+            main_mode = "start"
+        elif server.stopping:
+            # ya se está deteniendo -> deshabilitar para evitar spam
+            main_mode = "stopping"
+        else:
+            main_mode = "stop"
+
+        state = {
+            "name": server.config.name,
+            "status": self._server_status(server),
+            "perf": perf,
+            "java": self._dash_java_info(server),
+            "main": main_mode,
+        }
+
+        if old.get("name") != state["name"]:
+            w["name"].configure(text=state["name"])
+        if old.get("status") != state["status"]:
+            text, color = state["status"]
+            w["dot"].configure(text_color=color)
+            w["status"].configure(text=text, text_color=color)
+        if old.get("perf") != state["perf"]:
+            w["cpu"].configure(text=perf[0])
+            w["ram"].configure(text=perf[1])
+        if old.get("java") != state["java"]:
+            text, color = state["java"]
+            w["java"].configure(text=text, text_color=color)
+        if old.get("main") != main_mode:
+            if main_mode == "start":
                 # servidor parado -> botón de iniciar
-                main_button.configure(
+                w["main"].configure(
                     text="▶ Iniciar servidor",
-                    fg_color=main_btn_color,
+                    fg_color="#2563eb",
                     hover_color="#1d4ed8",
                     state="normal",
-                    command=lambda s=server: self.start_server(s)
+                    command=lambda e=entry: self.start_server(e["server"])
+                )
+            elif main_mode == "stopping":
+                w["main"].configure(
+                    text="⏹ Detener servidor",
+                    fg_color="#dc2626",
+                    hover_color="#b91c1c",
+                    state="disabled",
+                    command=lambda: None
                 )
             else:
-                # servidor en marcha -> botón de detener
-                if server.stopping:
-                    # ya se está deteniendo -> deshabilitar para evitar spam
-                    main_button.configure(
-                        text="⏹ Detener servidor",
-                        fg_color="#dc2626",
-                        hover_color="#b91c1c",
-                        state="disabled",
-                        command=lambda: None
-                    )
-                else:
-                    main_button.configure(
-                        text="⏹ Detener servidor",
-                        fg_color="#dc2626",
-                        hover_color="#b91c1c",
-                        state="normal",
-                        command=lambda s=server: self.stop_server_clean(s)
-                    )
-
-        # ---------- LOOP DE REFRESCO DE LA TARJETA ----------
-        def tick():
-            # si la tarjeta ha sido destruida, paramos
-            if not card.winfo_exists():
-                return
-            update_performance()
-            update_status_ui()
-            card.after(1000, tick)
+                w["main"].configure(
+                    text="⏹ Detener servidor",
+                    fg_color="#dc2626",
+                    hover_color="#b91c1c",
+                    state="normal",
+                    command=lambda e=entry: self.stop_server_clean(e["server"])
+                )
 
-        # arranque del loop
-        update_status_ui()
-        tick()
+        entry["state"] = state
 
 
     # ===================== SERVER =====================
     def start_server(self, server: ServerRuntime):
         if server.running:
             return
+        if server.offline_job:
+            server.log_queue.put(f"SYSTEM: No se puede iniciar: {server.offline_job} en curso.")
+            return
 
         cfg = server.config
         jar_path = os.path.join(cfg.path, cfg.jar)
         if not os.path.exists(jar_path):
             return
 
-        java = JAVA_EXE
-        if not java:
-            msg = "ERROR: Java no encontrado. Instala Java 17+ y vuelve a intentar."
-            server.log_queue.put(msg)
+        cpus = self._server_cpus(server)
+        try:
+            cmd, notes = self._server_command(server, cpus)
+        except ValueError as e:
+            server.log_queue.put(f"ERROR: Argumentos JVM inválidos: {e}")
             return
-
-        # Construimos el comando base
-        cmd = [
-            java,
-            f"-Xms{cfg.ram_min}G",
-            f"-Xmx{cfg.ram_max}G",
-        ]
-
-        # 👇 AGREGAMOS LOS ARGUMENTOS JVM ADICIONALES 👇
-        if cfg.jvm_args.strip():  # Si hay argumentos
-            # Dividimos por espacios para convertirlos en una lista
-            extra_args = cfg.jvm_args.split()
-            cmd.extend(extra_args)
-
-        # Añadimos el .jar y el modo nogui
-        cmd.extend(["-jar", jar_path, "nogui"])
-
+        if cmd is None:
+            server.log_queue.put("ERROR: Java no encontrado. Instala Java 17+ y vuelve a intentar.")
+            return
+        for note in notes:
+            server.log_queue.put(f"SYSTEM: {note}")
 
         def run():
-            server.running = True
-            server.starting = True
-            server.ready = False
-            server.stopping = False
-
+            started = server.boot_started
             server.process = subprocess.Popen(
                 cmd,
                 cwd=cfg.path,
@@ -1428,35 +5203,48 @@ class EsparcraftLauncher(ctk.CTk):
             p = psutil.Process(server.process.pid)
             p.cpu_percent(interval=None)
             server._ps_process = p
+            msgs = apply_process_resources(p, cfg, cpus)
+            server.cpu_slots = process_cpu_slots(p, cfg.cpu_limit)
+            if msgs:
+                server.log_queue.put(f"SYSTEM: Recursos: {'; '.join(msgs)}")
 
             for line in server.process.stdout:
-                line = line.rstrip("\r\n")
-                line = self._clean_log_line(line)   # ← limpiar códigos de color
-                server.log_queue.put(line)
+                self._ingest_raw_line(server, line)
 
-                if "Done" in line:
-                    server.ready = True
-                    server.starting = False
-            
             ret = server.process.wait()
+            exited_at = self.now()
 
-            server.running = False
-            server.ready = False
-            server.starting = False
-            server.stopping = False
-
-            for n in list(server._players_online_set):
-                self._player_set_offline(server, n)
-            server._players_online_set.clear()
-            server.players_online.clear()
+            if server.capture is not None:
+                server.capture.close()
+                server.capture = None
 
+            server.running = False
             server.log_queue.put(f"SYSTEM: Proceso finalizado (code={ret})")
 
-            self.after(0, self.show_dashboard)
+            def on_exit():
+                # en el hilo de UI: primero lo que quede en cola (aún con el estado de
+                # arranque), luego se cierra el ciclo y todos offline
+                self._drain_server_queue(server)
+                if server.boot_started == started:   # si no, ya se relanzó: el ciclo es del nuevo
+                    self._lifecycle_exit(server, ret, exited_at)
+                    server.ready = False
+                    server.starting = False
+                    server.stopping = False
+                for n in server.players.online_names():
+                    self._player_set_offline(server, n)
+                self._dash_refresh_server(server)
+
+            self.after(0, on_exit)
 
         msg = "SYSTEM: Iniciando servidor..."
         server.log_queue.put(msg)  # ← Solo queue, QUITAR server.logs.append(msg)
 
+        # estado de arranque en el hilo de UI, antes de que el lector encole líneas
+        server.running = True
+        server.starting = True
+        server.ready = False
+        server.stopping = False
+        server.begin_boot(self.now())
         threading.Thread(target=run, daemon=True).start()
         self.open_console(server)
 
@@ -1464,8 +5252,131 @@ class EsparcraftLauncher(ctk.CTk):
         return textbox.yview()[1] >= 0.99
 
 
+    def _server_command(self, server: ServerRuntime, cpus: Optional[list[int]] = None,
+                        cfg: Optional[ServerConfig] = None,
+                        blocking: bool = True) -> tuple[Optional[list[str]], list[str]]:
+        """
+        Línea de comandos completa (perfil JVM + flags propios) y notas para el log.
+        (None, notas) si no hay Java. ValueError si jvm_args tiene comillas sin cerrar.
+        blocking=False (vista previa) no lee el jar en el hilo de UI.
+        """
+        cfg = cfg or server.config
+        jar_path = os.path.join(cfg.path, cfg.jar)
+        if jar_path.lower().endswith(".py"):
+            # servidor sintético (bench/fake_server.py): se lanza con Python
+            # y los "argumentos JVM" se pasan tal cual al script
+            return [sys.executable, jar_path] + split_jvm_args(cfg.jvm_args) + ["nogui"], []
+
+        # al lanzar sí se espera al requisito del jar: decide qué Java se usa
+        java, java_major, reason = self._java_for_server(cfg, blocking)
+        if not java:
+            return None, []
+        notes = [f"Java {java_major or '?'} ({reason}): {java}"]
+        cores = len(cpus) if cpus else (os.cpu_count() or 1)
+        flags, profile_notes = build_jvm_flags(cfg, java_major, cores, detect_large_pages(cfg.ram_max))
+        return [java] + flags + ["-jar", jar_path, "nogui"], notes + profile_notes
+
+    def _affinity_plan(self) -> dict[str, list[int]]:
+        """Plan de CPUs para todos los servidores en "auto" (peso = RAM máxima), estable aunque no estén en marcha."""
+        autos = [(s.config.id, float(s.config.ram_max)) for s in self.servers.values()
+                 if s.config.cpu_affinity.strip().lower() == "auto"]
+        return plan_affinity(autos, cpu_nodes()) if autos else {}
+
+    def _server_cpus(self, server: ServerRuntime) -> Optional[list[int]]:
+        spec = server.config.cpu_affinity.strip().lower()
+        if not spec:
+            return None
+        if spec == "auto":
+            return self._affinity_plan().get(server.config.id)
+        try:
+            return parse_cpu_list(spec)
+        except ValueError:
+            server.log_queue.put(f"ERROR: Afinidad de CPU inválida: {server.config.cpu_affinity!r}")
+            return None
+
+    def _send_server_command(self, server: ServerRuntime, cmd: str) -> bool:
+        if not server.running or not server.process:
+            return False
+        try:
+            server.process.stdin.write(cmd + "\n")
+            server.process.stdin.flush()
+            return True
+        except Exception:
+            return False
+
+    def backup_server(self, server: ServerRuntime, on_done=None) -> bool:
+        """
+        Copia incremental del mundo como tarea de JOBS. Con el servidor en marcha:
+        save-off, save-all flush, espera el "Saved the game", copia a staging los
+        archivos cambiados y save-on; el hash y el guardado en el almacén van después
+        con el servidor guardando. on_done(resumen | None, error | None) en el hilo de la UI.
+        """
+        if server.offline_job:
+            return False
+        server.offline_job = "copia de seguridad"
+        store = BackupStore(data_path(f"backups_{server.config.id}"))
+        path = server.config.path
+
+        def work(job):
+            summary = None
+            paused_at = None
+            save_off_s = None
+
+            def resume_saving():
+                nonlocal paused_at, save_off_s
+                job.critical = False
+                if paused_at is not None:
+                    self._send_server_command(server, "save-on")
+                    save_off_s = round(time.perf_counter() - paused_at, 3)
+                    paused_at = None
+                lower_thread_priority()   # el resto de la copia ya no tiene prisa
+
+            try:
+                roots = backup_world_roots(path)
+                if not roots:
+                    raise RuntimeError("no se encontró ninguna carpeta de mundo")
+                if not server.running:
+                    lower_thread_priority()
+                else:
+                    waiter = threading.Event()
+                    server._flush_waiter = waiter
+                    if not self._send_server_command(server, "save-off"):
+                        raise RuntimeError("no se pudo enviar save-off")
+                    paused_at = time.perf_counter()
+                    # con el guardado desactivado no se frena, no se pausa ni se limita la I/O:
+                    # el hilo sigue con prioridad normal hasta resume_saving()
+                    job.critical = True
+                    self._send_server_command(server, "save-all flush")
+                    if not waiter.wait(BACKUP_FLUSH_TIMEOUT):
+                        raise RuntimeError("el servidor no confirmó save-all flush")
+                summary = store.snapshot(path, roots, job=job,
+                                         captured=resume_saving if paused_at is not None else None)
+            finally:
+                resume_saving()
+                server._flush_waiter = None
+                server.offline_job = None
+            if save_off_s is not None:
+                summary["save_off_s"] = save_off_s
+                store.annotate(summary["id"], save_off_s=save_off_s)
+            return summary
+
+        def done(summary, error):
+            if summary:
+                server.log_queue.put(
+                    f"SYSTEM: Copia {summary['id']}: {summary['changed']}/{summary['files']} archivos cambiados, "
+                    f"{format_size(summary['new_bytes'])} nuevos"
+                    + (f", save-off {summary['save_off_s']:.1f}s" if "save_off_s" in summary else ""))
+            else:
+                server.log_queue.put(f"ERROR: Copia de seguridad fallida: {error}")
+            if on_done:
+                self.after(0, lambda: on_done(summary, error))
+
+        JOBS.submit(MaintenanceJob("backup", "Copia de seguridad", server, work, on_done=done, defer_priority=True))
+        return True
+
     def stop_server(self, server: ServerRuntime):
         if server.process and server.running:
+            server.set_phase("stopping", self.now())
             try:
                 server.process.stdin.write("stop\n")
                 server.process.stdin.flush()
@@ -1477,6 +5388,7 @@ class EsparcraftLauncher(ctk.CTk):
             try:
                 server.stopping = True
                 server.starting = False
+                server.set_phase("stopping", self.now())
                 server.logs.append("SYSTEM: Deteniéndose...")
                 server.process.stdin.write("stop\n")
                 server.process.stdin.flush()
@@ -1491,11 +5403,12 @@ class EsparcraftLauncher(ctk.CTk):
                 server.process.kill()
                 server.running = False
                 server.logs.append("ERROR: Servidor finalizado forzosamente")
-                self.after(0, self.show_dashboard)
+                self.after(0, lambda: self._dash_refresh_server(server))
             except:
                 pass
 
 
+    @perf_timed("rerender_console")
     def _rerender_console(self):
         if not self.console_widget:
             return
@@ -1622,6 +5535,44 @@ class EsparcraftLauncher(ctk.CTk):
             command=clear_console
         ).pack(side="left", padx=(10, 0))
 
+        # grabación de la salida cruda para replay (bench/replay.py)
+        def toggle_capture():
+            if server.capture is None:
+                safe = re.sub(r"[^A-Za-z0-9_-]+", "_", server.config.name) or "server"
+                path = data_path(f"capture_{safe}_{time.strftime('%Y%m%d_%H%M%S')}.esplog")
+                server.capture = LogCapture(path, time.time())
+                server.logs.append(f"SYSTEM: Grabando log en {path}")
+            else:
+                cap, server.capture = server.capture, None
+                cap.close()
+                server.logs.append(f"SYSTEM: Grabación guardada ({cap.lines} líneas): {cap.path}")
+            capture_btn.configure(text="⏹ Grabando" if server.capture else "⏺ Grabar")
+
+        capture_btn = ctk.CTkButton(
+            left,
+            text="⏹ Grabando" if server.capture else "⏺ Grabar",
+            width=100,
+            fg_color="#374151",
+            command=toggle_capture
+        )
+        capture_btn.pack(side="left", padx=(10, 0))
+
+        ctk.CTkButton(
+            left,
+            text="⏱ Diagnóstico",
+            width=110,
+            fg_color="#374151",
+            command=lambda: self.show_boot_report(server)
+        ).pack(side="left", padx=(10, 0))
+
+        ctk.CTkButton(
+            left,
+            text="🗺 Mundo",
+            width=90,
+            fg_color="#374151",
+            command=lambda: self.show_world_tools(server)
+        ).pack(side="left", padx=(10, 0))
+
         # --- DERECHA: BOTONES ---
         right = ctk.CTkFrame(top_bar, fg_color="transparent")
         right.pack(side="right")
@@ -1691,6 +5642,7 @@ class EsparcraftLauncher(ctk.CTk):
             return "#f59e0b"
         return "#ef4444"
 
+    @perf_timed("update_console")
     def _update_console(self):
         if not self.current_console or not self.console_widget:
             return
@@ -1761,97 +5713,6 @@ class EsparcraftLauncher(ctk.CTk):
         self.after(100, self._update_console)
 
 
-    def _players_render_current(self, root, server: ServerRuntime, query: str, mode: str, list_frame, counter_label):
-        # limpiar contenedor
-        for w in list_frame.winfo_children():
-            w.destroy()
-
-        q = (query or "").strip().lower()
-
-        if mode == "OPS":
-            ops = self._read_ops(server)
-            if q:
-                ops = [o for o in ops if q in (o.get("name", "").lower())]
-
-            counter_label.configure(text=f"{len(ops)} ops")
-
-            if not ops:
-                empty = ctk.CTkFrame(list_frame, fg_color="transparent")
-                empty.pack(fill="both", expand=True, pady=30)
-                ctk.CTkLabel(empty, text="No hay OPs detectados.", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=(0, 6))
-                ctk.CTkLabel(empty, text="Se lee desde ops.json del servidor.", text_color="#9ca3af").pack()
-                return
-
-            for o in ops:
-                card = ctk.CTkFrame(list_frame, corner_radius=14)
-                card.pack(fill="x", padx=10, pady=8)
-                card.grid_columnconfigure(0, weight=1)
-
-                left = ctk.CTkFrame(card, fg_color="transparent")
-                left.grid(row=0, column=0, sticky="w", padx=14, pady=12)
-
-                name = o.get("name", "Unknown")
-                uuid = o.get("uuid", "")
-                level = o.get("level", "")
-                bypass = o.get("bypassesPlayerLimit", False)
-
-                ctk.CTkLabel(left, text=name, font=ctk.CTkFont(size=16, weight="bold")).pack(anchor="w")
-                ctk.CTkLabel(left, text=f"UUID: {uuid}" if uuid else "UUID: —", text_color="#9ca3af").pack(anchor="w", pady=(2, 0))
-
-                right = ctk.CTkFrame(card, fg_color="transparent")
-                right.grid(row=0, column=1, sticky="e", padx=14, pady=12)
-
-                if level != "":
-                    ctk.CTkLabel(
-                        right, text=f"LEVEL {level}", text_color="white",
-                        fg_color="#2563eb", corner_radius=10, padx=10, pady=4
-                    ).pack(side="left", padx=(0, 10))
-
-                if bypass:
-                    ctk.CTkLabel(
-                        right, text="BYPASS", text_color="white",
-                        fg_color="#7c3aed", corner_radius=10, padx=10, pady=4
-                    ).pack(side="left")
-            return
-
-        if mode == "OFFLINE":
-            players = list(server.players_offline)
-            if q:
-                players = [p for p in players if q in p.lower()]
-
-            counter_label.configure(text=f"{len(players)} offline (vistos)")
-
-            if not players:
-                empty = ctk.CTkFrame(list_frame, fg_color="transparent")
-                empty.pack(fill="both", expand=True, pady=30)
-                ctk.CTkLabel(empty, text="No hay jugadores offline aún.", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=(0, 6))
-                ctk.CTkLabel(empty, text="Se llenará cuando alguien entre y luego salga.", text_color="#9ca3af").pack()
-                return
-
-            for name in players:
-                card = ctk.CTkFrame(list_frame, corner_radius=14)
-                card.pack(fill="x", padx=10, pady=8)
-                card.grid_columnconfigure(0, weight=1)
-
-                left = ctk.CTkFrame(card, fg_color="transparent")
-                left.grid(row=0, column=0, sticky="w", padx=14, pady=12)
-
-                ctk.CTkLabel(left, text=name, font=ctk.CTkFont(size=16, weight="bold")).pack(anchor="w")
-                ctk.CTkLabel(left, text="Jugador offline", text_color="#9ca3af").pack(anchor="w", pady=(2, 0))
-
-                right = ctk.CTkFrame(card, fg_color="transparent")
-                right.grid(row=0, column=1, sticky="e", padx=14, pady=12)
-
-                ctk.CTkLabel(
-                    right, text="OFFLINE", text_color="white",
-                    fg_color="#6b7280", corner_radius=10, padx=12, pady=4
-                ).pack(side="left")
-            return
-
-        # Si llega aquí (ONLINE), no hacemos nada: lo maneja incremental
-        counter_label.configure(text="")
-
-
     def show_players_manager(self):
         self._clear_content()
         self._show_sidebar_players_panel(False)
@@ -1907,9 +5768,16 @@ class EsparcraftLauncher(ctk.CTk):
         )
         selector.grid(row=0, column=1, padx=16, pady=(14, 4), sticky="e")
 
+        subtitle_text = f"Servidor: {server.config.name}  •  Modo: Live (logs)"
+        if server.sessions is not None:
+            try:
+                subtitle_text += (f"  •  Únicos: {server.sessions.player_count()}"
+                                  f"  •  Pico 24h: {server.sessions.peak_since(time.time() - 86400)}")
+            except Exception:
+                pass
         subtitle = ctk.CTkLabel(
             header,
-            text=f"Servidor: {server.config.name}  •  Modo: Live (logs)",
+            text=subtitle_text,
             text_color="#9ca3af"
         )
         subtitle.grid(row=1, column=0, padx=16, pady=(0, 4), sticky="w")  # antes (0, 14)
@@ -1933,9 +5801,11 @@ class EsparcraftLauncher(ctk.CTk):
         counter_label = ctk.CTkLabel(toolbar, text="", text_color="#9ca3af")
         counter_label.grid(row=0, column=3, padx=(0, 16), pady=(2, 4), sticky="e")  # antes 12
 
-        # ---------- LISTA ----------
-        list_frame = ctk.CTkScrollableFrame(root, corner_radius=16)
+        # ---------- LISTA (virtual: pool de filas reutilizadas) ----------
+        list_frame = ctk.CTkFrame(root, corner_radius=16)
         list_frame.grid(row=2, column=0, sticky="nsew")
+        list_frame.grid_columnconfigure(0, weight=1)
+        list_frame.grid_rowconfigure(0, weight=1)
 
         # ---------- FOOTER ----------
         footer = ctk.CTkFrame(root, fg_color="transparent")
@@ -1952,39 +5822,63 @@ class EsparcraftLauncher(ctk.CTk):
             "counter_label": counter_label,
             "search_var": search_var,
             "tab_var": tab_var,
-            "cards_offline": {},
-            "cards_ops": {},
-            "cards_online": {},   # name -> frame
+            "vlist": None,
+            "stats": {},          # key -> historial (PlayerSessionDB) de filas ya vistas
         }
-        
-        
+
+        def make_vlist(mode: str):
+            if self._players_ui["vlist"] is not None:
+                self._players_ui["vlist"].destroy()
+            if mode == "ONLINE":
+                vlist = VirtualList(list_frame, 62,
+                                    lambda parent: self._players_ui_make_online_row(server, parent),
+                                    self._players_ui_bind_online_row)
+            elif mode == "OFFLINE":
+                vlist = VirtualList(list_frame, 76,
+                                    self._players_ui_make_offline_row,
+                                    lambda row, item: self._players_ui_bind_offline_row(server, row, item),
+                                    prefetch=lambda view: self._players_ui_prefetch_offline(server, view))
+            else:  # OPS
+                vlist = VirtualList(list_frame, 62, self._players_ui_make_ops_row, self._players_ui_bind_ops_row)
+            vlist.frame.grid(row=0, column=0, sticky="nsew")
+            self._players_ui["vlist"] = vlist
+
+        def sync_current(stale=None):
+            # filtrado + refresh/bind de la lista virtual de la pestaña actual
+            with PERF.measure("players_render_current"):
+                mode = tab_var.get()
+                if mode == "ONLINE":
+                    self._players_ui_sync_online(server, stale)
+                elif mode == "OFFLINE":
+                    self._players_ui_sync_offline(server, stale)
+                else:  # OPS
+                    self._players_ui_sync_ops(server, stale)
+
         self._load_usercache(server)
-        self._players_ui_sync_online(server)
+        make_vlist("ONLINE")
+        sync_current()
         server.players_dirty = False
-        server.players_changed.clear()
+        server.players.changed.clear()
 
         # debounce buscador
         if not hasattr(self, "_players_search_after_id"):
             self._players_search_after_id = None
 
-        def schedule_render(*_):
-            mode = tab_var.get()
-
-            # limpiar contenedor al cambiar de modo (para evitar mezclar)
-            for w in list_frame.winfo_children():
-                w.destroy()
+        def on_tab(*_):
+            # otro tipo de fila: nueva lista virtual (el pool es pequeño)
+            make_vlist(tab_var.get())
+            sync_current()
 
-            if mode == "ONLINE":
-                self._players_ui["cards_online"].clear()
-                self._players_ui_sync_online(server)
-            elif mode == "OFFLINE":
-                self._players_ui["cards_offline"].clear()
-                self._players_ui_sync_offline(server)
-            else:  # OPS
-                self._players_ui_sync_ops(server)
+        def schedule_render(*_):
+            if self._players_search_after_id is not None:
+                try:
+                    self.after_cancel(self._players_search_after_id)
+                except Exception:
+                    pass
+            self._players_search_after_id = self.after(120, sync_current)
 
         search_var.trace_add("write", schedule_render)
-        tab.configure(command=lambda *_: schedule_render())
+        tab.configure(command=on_tab)
 
         # auto-refresh (solo re-render)
         def loop():
@@ -1993,29 +5887,18 @@ class EsparcraftLauncher(ctk.CTk):
             if self.current_players != server.config.id:
                 return
 
-            if server.players_dirty:
-                server.players_dirty = False
-                server.players_changed.clear()
-
-                mode = tab_var.get()
-                if mode == "ONLINE":
-                    self._players_ui_sync_online(server)
-                elif mode == "OFFLINE":
-                    self._players_ui_sync_offline(server)
-                elif mode == "OPS":
-                    self._players_ui_sync_ops(server)
+            with PERF.measure("players_loop"):
+                if server.players_dirty:
+                    server.players_dirty = False
+                    changed = {server.players.display(k) for k in server.players.changed}
+                    server.players.changed.clear()
+                    sync_current(changed)
 
             root.after(250, loop)
 
         loop()
 
-    def _players_ui_make_offline_card(self, server: ServerRuntime, parent, name: str):
-        uuid = self._uuid_for_player(server, name)
-
-        # detectar OP
-        ops_set = { (o.get("name","") or "").lower() for o in self._read_ops(server) }
-        is_op = name.lower() in ops_set
-
+    def _players_ui_make_offline_row(self, parent):
         name_font = ctk.CTkFont(size=12, weight="bold")
         sub_font = ctk.CTkFont(size=10)
 
@@ -2029,19 +5912,21 @@ class EsparcraftLauncher(ctk.CTk):
         top = ctk.CTkFrame(left, fg_color="transparent")
         top.pack(anchor="w")
 
-        name_label = ctk.CTkLabel(top, text=name, font=name_font)
-        name_label.pack(side="left")
+        row._name_label = ctk.CTkLabel(top, text="", font=name_font)
+        row._name_label.pack(side="left")
 
-        if is_op:
-            ctk.CTkLabel(
-                top, text="OP", text_color="white",
-                fg_color="#f59e0b", corner_radius=10, padx=6, pady=1
-            ).pack(side="left", padx=(6, 0))
+        row._op_badge = ctk.CTkLabel(
+            top, text="OP", text_color="white",
+            fg_color="#f59e0b", corner_radius=10, padx=6, pady=1
+        )
 
         # ---- uuid ----
-        ctk.CTkLabel(
-            left, text=f"UUID: {uuid}", font=sub_font, text_color="#9ca3af"
-        ).pack(anchor="w", pady=(2, 0))
+        row._uuid_label = ctk.CTkLabel(left, text="", font=sub_font, text_color="#9ca3af")
+        row._uuid_label.pack(anchor="w", pady=(2, 0))
+
+        # ---- historial (sesiones) ----
+        row._stats_label = ctk.CTkLabel(left, text="", font=sub_font, text_color="#9ca3af")
+        row._stats_label.pack(anchor="w")
 
         right = ctk.CTkFrame(row, fg_color="transparent")
         right.grid(row=0, column=1, sticky="e", padx=10, pady=8)
@@ -2054,52 +5939,60 @@ class EsparcraftLauncher(ctk.CTk):
 
         return row
 
+    def _players_ui_bind_offline_row(self, server: ServerRuntime, row, item: tuple):
+        """item = (name, is_op); el historial sale de la caché que llena el prefetch."""
+        name, is_op = item
+        row._name_label.configure(text=name)
+        row._uuid_label.configure(text=f"UUID: {self._uuid_for_player(server, name)}")
+        self._players_ui_set_badge(row._op_badge, is_op, side="left", padx=(6, 0))
+
+        stats = self._players_ui["stats"].get(PlayerRegistry.key(name))
+        if stats:
+            last = time.strftime("%Y-%m-%d %H:%M", time.localtime(stats["last_seen"]))
+            row._stats_label.configure(
+                text=f"Última vez: {last}  •  Jugado: {format_duration(stats['playtime'])}  •  {stats['sessions']} sesiones"
+            )
+        else:
+            row._stats_label.configure(text="")
 
+    def _players_ui_prefetch_offline(self, server: ServerRuntime, view: list):
+        """Historial de las filas visibles que faltan, en una sola consulta indexada."""
+        cache = self._players_ui["stats"]
+        missing = [PlayerRegistry.key(name) for name, _ in view if PlayerRegistry.key(name) not in cache]
+        if not missing or server.sessions is None:
+            return
+        try:
+            found = server.sessions.players_stats(missing)
+        except Exception:
+            found = {}
+        for key in missing:
+            cache[key] = found.get(key)
 
-    def _players_ui_sync_offline(self, server: ServerRuntime):
+    def _players_ui_sync_offline(self, server: ServerRuntime, stale=None):
         ui = getattr(self, "_players_ui", None)
         if not ui or ui.get("server_id") != server.config.id:
             return
         if ui["tab_var"].get() != "OFFLINE":
             return
 
-        parent = ui["list_frame"]
-        cards = ui["cards_offline"]
         q = ui["search_var"].get().strip().lower()
 
-        self._load_usercache(server)
-        desired = self._get_offline_players(server)
-
-        # eliminar sobrantes
-        for name in list(cards.keys()):
-            if name not in desired:
-                cards[name].destroy()
-                del cards[name]
+        ops_set = self._ops_names(server)
 
-        # crear faltantes
-        for name in desired:
-            if name not in cards:
-                cards[name] = self._players_ui_make_offline_card(server, parent, name)
+        # quienes cambiaron (join/leave) tienen historial nuevo
+        stale_items = None
+        if stale:
+            for name in stale:
+                ui["stats"].pop(PlayerRegistry.key(name), None)
+            stale_items = {(name, name.lower() in ops_set) for name in stale}
 
-        # ordenar / filtrar
-        visible = 0
-        for name in desired:
-            card = cards.get(name)
-            if not card:
-                continue
-            if q and (q not in name.lower()) and (q not in self._uuid_for_player(server, name).lower()):
-                card.grid_forget()
-                continue
-            card.grid(row=visible, column=0, sticky="ew", padx=10, pady=6)
-            visible += 1
+        names = self._search_players(server, q, online=False) if q else self._get_offline_players(server)
+        items = [(name, name.lower() in ops_set) for name in names]
 
-        ui["counter_label"].configure(text=f"{visible} offline")
-    def _players_ui_make_ops_card(self, parent, op: dict):
-        name = op.get("name", "Unknown")
-        uuid = op.get("uuid", "")
-        level = op.get("level", "")
-        bypass = op.get("bypassesPlayerLimit", False)
+        ui["vlist"].set_items(items, stale=stale_items, empty_text="No hay jugadores offline aún.")
+        ui["counter_label"].configure(text=f"{len(items)} offline")
 
+    def _players_ui_make_ops_row(self, parent):
         name_font = ctk.CTkFont(size=12, weight="bold")
         sub_font = ctk.CTkFont(size=10)
 
@@ -2109,54 +6002,613 @@ class EsparcraftLauncher(ctk.CTk):
         left = ctk.CTkFrame(row, fg_color="transparent")
         left.grid(row=0, column=0, sticky="w", padx=10, pady=8)
 
-        ctk.CTkLabel(left, text=name, font=name_font).pack(anchor="w")
-        pretty_uuid = format_uuid_pretty(uuid) if uuid else "—"
-        ctk.CTkLabel(left, text=f"UUID: {pretty_uuid}", font=sub_font, text_color="#9ca3af")\
-            .pack(anchor="w", pady=(2, 0))
+        row._name_label = ctk.CTkLabel(left, text="", font=name_font)
+        row._name_label.pack(anchor="w")
+        row._uuid_label = ctk.CTkLabel(left, text="", font=sub_font, text_color="#9ca3af")
+        row._uuid_label.pack(anchor="w", pady=(2, 0))
 
         right = ctk.CTkFrame(row, fg_color="transparent")
         right.grid(row=0, column=1, sticky="e", padx=10, pady=8)
 
-        if level != "":
-            ctk.CTkLabel(
-                right, text=f"LEVEL {level}", text_color="white",
-                fg_color="#2563eb", corner_radius=10, padx=10, pady=3
-            ).pack(side="left", padx=(0, 8))
+        row._level_badge = ctk.CTkLabel(
+            right, text="", text_color="white",
+            fg_color="#2563eb", corner_radius=10, padx=10, pady=3
+        )
+        row._bypass_badge = ctk.CTkLabel(
+            right, text="BYPASS", text_color="white",
+            fg_color="#7c3aed", corner_radius=10, padx=10, pady=3
+        )
+        return row
 
-        if bypass:
-            ctk.CTkLabel(
-                right, text="BYPASS", text_color="white",
-                fg_color="#7c3aed", corner_radius=10, padx=10, pady=3
-            ).pack(side="left")
+    def _players_ui_bind_ops_row(self, row, op: dict):
+        uuid = op.get("uuid", "")
+        level = op.get("level", "")
 
-        return row
+        row._name_label.configure(text=op.get("name", "Unknown"))
+        pretty_uuid = format_uuid_pretty(uuid) if uuid else "—"
+        row._uuid_label.configure(text=f"UUID: {pretty_uuid}")
 
+        # re-empaquetar en orden fijo: LEVEL, BYPASS
+        row._level_badge.pack_forget()
+        row._bypass_badge.pack_forget()
+        if level != "":
+            row._level_badge.configure(text=f"LEVEL {level}")
+            row._level_badge.pack(side="left", padx=(0, 8))
+        if op.get("bypassesPlayerLimit", False):
+            row._bypass_badge.pack(side="left")
 
-    def _players_ui_sync_ops(self, server: ServerRuntime):
+    def _players_ui_sync_ops(self, server: ServerRuntime, stale=None):
         ui = getattr(self, "_players_ui", None)
         if not ui or ui.get("server_id") != server.config.id:
             return
         if ui["tab_var"].get() != "OPS":
             return
 
-        parent = ui["list_frame"]
         q = ui["search_var"].get().strip().lower()
 
-        ops = self._read_ops(server)
-        if q:
-            ops = [o for o in ops if q in (o.get("name", "").lower())]
+        ops = self._search_json_list(server, "ops.json", parse_ops, q)
+
+        ui["vlist"].set_items(ops, empty_text="No hay OPs detectados (ops.json).")
+        ui["counter_label"].configure(text=f"{len(ops)} ops")
+
+    # ===================== ARRANQUE =====================
+    def show_boot_report(self, server: ServerRuntime):
+        """Ventana con el tiempo de cada plugin en el último arranque y su tendencia."""
+        boots = server.boot_history.boots() if server.boot_history is not None else []
+        rows = plugin_boot_report(boots)
+
+        win = ctk.CTkToplevel(self)
+        win.title(f"Diagnóstico — {server.config.name}")
+        win.geometry("760x560")
+
+        header = ctk.CTkFrame(win, corner_radius=16)
+        header.pack(fill="x", padx=16, pady=(16, 10))
+        ctk.CTkLabel(header, text="Diagnóstico del servidor",
+                     font=ctk.CTkFont(size=20, weight="bold")).pack(anchor="w", padx=16, pady=(12, 2))
+
+        ready = [b["ready_s"] for b in boots[-10:] if b.get("ready_s") is not None]
+        if ready:
+            summary = (f"Último: {ready[-1]:.1f}s hasta Done  •  "
+                       f"media últimos {len(ready)}: {sum(ready) / len(ready):.1f}s  •  "
+                       f"{len(boots)} arranques guardados")
+        else:
+            summary = "Sin arranques registrados todavía (se miden las líneas [Plugin] Loading/Enabling)."
+        ctk.CTkLabel(header, text=summary, text_color="#9ca3af").pack(anchor="w", padx=16, pady=(0, 12))
+
+        tabs = ctk.CTkTabview(win, corner_radius=16)
+        tabs.pack(fill="both", expand=True, padx=16, pady=(0, 16))
+        self._boot_history_table(tabs.add("Historial"), server, boots)
+        self._autosave_table(tabs.add("Guardados"), server)
+        self._login_latency_table(tabs.add("Logins"), server)
+
+        table = ctk.CTkScrollableFrame(tabs.add("Plugins"), corner_radius=16)
+        table.pack(fill="both", expand=True)
+        tabs.set("Plugins")
+        for col, weight in enumerate((3, 2, 1, 1, 1, 1, 2)):
+            table.grid_columnconfigure(col, weight=weight)
+
+        head_font = ctk.CTkFont(size=12, weight="bold")
+        for col, title in enumerate(("Plugin", "Versión", "Load", "Enable", "Total", "Mediana", "")):
+            ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+
+        for i, r in enumerate(rows, start=1):
+            color = "#ef4444" if r["slower"] else None
+            version = r["version"]
+            if r["updated"]:
+                version = f"{r['prev_version']} → {version}"
+            cells = (
+                r["name"], version, f"{r['load']:.2f}s", f"{r['enable']:.2f}s", f"{r['total']:.2f}s",
+                f"{r['median']:.2f}s" if r["median"] is not None else "—",
+            )
+            for col, text in enumerate(cells):
+                kw = {"text_color": color} if color and col in (0, 4) else {}
+                ctk.CTkLabel(table, text=text, **kw).grid(row=i, column=col, sticky="w", padx=6, pady=1)
+
+            flags = []
+            if r["slower"]:
+                flags.append("⚠ más lento")
+            if r["updated"]:
+                flags.append("actualizado")
+            ctk.CTkLabel(table, text="  ".join(flags), text_color="#f59e0b")\
+                .grid(row=i, column=6, sticky="w", padx=6, pady=1)
+
+    def _login_latency_table(self, parent, server: ServerRuntime):
+        """Percentiles de latencia de login (últimas 24 h) y desglose por hora con el pico de jugadores."""
+        since = time.time() - 86400
+        rows, peaks = [], {}
+        if server.sessions is not None:
+            try:
+                server.sessions.flush()
+                rows = server.sessions.logins_since(since)
+                peaks = server.sessions.hourly_peaks_since(since)
+            except Exception:
+                rows = []
+        if not rows:
+            # sin base: lo medido en esta sesión
+            rows = [(ts, None if a is None else a * 1000, None if j is None else j * 1000)
+                    for ts, _, a, j in server.logins if ts >= since]
+        report = login_latency_report(rows, peaks)
+
+        def ms(v):
+            return f"{v / 1000:.2f}s" if v is not None else "—"
+
+        total = report["all"]
+        if total["total"]["n"]:
+            summary = (f"{total['total']['n']} logins (24h)  •  total p50 {ms(total['total']['p50'])}  "
+                       f"p95 {ms(total['total']['p95'])}  p99 {ms(total['total']['p99'])}  •  "
+                       f"auth p95 {ms(total['auth']['p95'])}  •  entrada p95 {ms(total['join']['p95'])}")
+        else:
+            summary = "Sin logins medidos en las últimas 24 h (UUID of player -> logged in -> joined the game)."
+        ctk.CTkLabel(parent, text=summary, text_color="#cbd5e1",
+                     wraplength=680, justify="left").pack(anchor="w", padx=8, pady=(4, 8))
+
+        table = ctk.CTkScrollableFrame(parent, corner_radius=16)
+        table.pack(fill="both", expand=True)
+        for col in range(6):
+            table.grid_columnconfigure(col, weight=1)
+
+        head_font = ctk.CTkFont(size=12, weight="bold")
+        for col, title in enumerate(("Hora", "Logins", "Auth p95", "Entrada p95", "Total p95", "Pico jugadores")):
+            ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+
+        slow = total["total"]["p95"]
+        for i, h in enumerate(report["hours"], start=1):
+            cells = (
+                time.strftime("%d/%m %H:00", time.localtime(h["hour"] * 3600)),
+                str(h["total"]["n"] or h["join"]["n"]),
+                ms(h["auth"]["p95"]), ms(h["join"]["p95"]), ms(h["total"]["p95"]),
+                "—" if h["peak"] is None else str(h["peak"]),
+            )
+            for col, text in enumerate(cells):
+                kw = {}
+                if col == 4 and slow and h["total"]["p95"] is not None and h["total"]["p95"] > 1.5 * slow:
+                    kw["text_color"] = "#ef4444"
+                ctk.CTkLabel(table, text=text, **kw).grid(row=i, column=col, sticky="w", padx=6, pady=1)
+
+    def _autosave_table(self, parent, server: ServerRuntime):
+        """Serie de guardados de mundo de esta sesión: duración, bytes y lag solapado."""
+        saves = list(server.autosaves)
+        if saves:
+            durations = sorted(e["duration"] for e in saves)
+            p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            with_lag = sum(1 for e in saves if e["lag_events"])
+            summary = (f"{len(saves)} guardados  •  p95 {p95:.2f}s  •  máx {durations[-1]:.2f}s  •  "
+                       f"{with_lag} con avisos de lag")
+        else:
+            summary = "Sin guardados medidos en esta sesión (\"Saving chunks...\" -> \"All dimensions are saved\")."
+        ctk.CTkLabel(parent, text=summary, text_color="#cbd5e1").pack(anchor="w", padx=8, pady=(4, 8))
+
+        table = ctk.CTkScrollableFrame(parent, corner_radius=16)
+        table.pack(fill="both", expand=True)
+        for col in range(5):
+            table.grid_columnconfigure(col, weight=1)
+
+        head_font = ctk.CTkFont(size=12, weight="bold")
+        for col, title in enumerate(("Hora", "Tipo", "Duración", "Escrito", "Lag solapado")):
+            ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+
+        for i, e in enumerate(reversed(saves), start=1):
+            written = f"{e['bytes'] / (1024 * 1024):.1f} MB" if e["bytes"] is not None else "—"
+            lag = f"{e['lag_ms']} ms ({e['lag_events']})" if e["lag_events"] else "—"
+            cells = (time.strftime("%H:%M:%S", time.localtime(e["ts"])), e["kind"],
+                     f"{e['duration']:.2f}s", written, lag)
+            for col, text in enumerate(cells):
+                kw = {"text_color": "#ef4444"} if col == 4 and e["lag_events"] else {}
+                ctk.CTkLabel(table, text=text, **kw).grid(row=i, column=col, sticky="w", padx=6, pady=1)
+
+    def _boot_history_table(self, parent, server: ServerRuntime, boots: list[dict]):
+        """Fases del proceso actual y tabla de arranques/paradas anteriores."""
+        if server.running:
+            offsets = server.phase_offsets()
+            now_text = "  →  ".join(f"{p} {t:.1f}s" for p, t in offsets.items())
+            ctk.CTkLabel(parent, text=f"En curso: {now_text}", text_color="#cbd5e1",
+                         wraplength=680, justify="left").pack(anchor="w", padx=8, pady=(4, 8))
+
+        table = ctk.CTkScrollableFrame(parent, corner_radius=16)
+        table.pack(fill="both", expand=True)
+        for col, weight in enumerate((3, 1, 1, 1, 1, 1)):
+            table.grid_columnconfigure(col, weight=weight)
+
+        head_font = ctk.CTkFont(size=12, weight="bold")
+        for col, title in enumerate(("Inicio", "Hasta Done", "Done (server)", "Parada", "Guardado", "Código")):
+            ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+
+        def secs(v):
+            return f"{v:.1f}s" if v is not None else "—"
+
+        for i, r in enumerate(boot_timeline_report(boots), start=1):
+            phases = r["phases"]
+            save_s = None
+            if "saved" in phases and "stopping" in phases:
+                save_s = phases["saved"] - phases["stopping"]
+            cells = (
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["started"])),
+                secs(r["ready_s"]) if r["ready_s"] is not None else "no llegó",
+                secs(r["done_reported_s"]),
+                secs(r["stop_s"]),
+                secs(save_s),
+                "—" if r["exit_code"] is None else str(r["exit_code"]),
+            )
+            for col, text in enumerate(cells):
+                kw = {}
+                if (col == 1 and (r["slow_ready"] or r["ready_s"] is None)) or (col == 3 and r["slow_stop"]):
+                    kw["text_color"] = "#ef4444"
+                ctk.CTkLabel(table, text=text, **kw).grid(row=i, column=col, sticky="w", padx=6, pady=1)
+
+    # ===================== MUNDO =====================
+    def show_world_tools(self, server: ServerRuntime):
+        """Analizador de regiones (.mca): tamaño por dimensión y peores chunks por bytes y entidades."""
+        win = ctk.CTkToplevel(self)
+        win.title(f"Mundo — {server.config.name}")
+        win.geometry("820x600")
+
+        header = ctk.CTkFrame(win, corner_radius=16)
+        header.pack(fill="x", padx=16, pady=(16, 10))
+        ctk.CTkLabel(header, text="Análisis de regiones",
+                     font=ctk.CTkFont(size=20, weight="bold")).pack(anchor="w", padx=16, pady=(12, 2))
+        status = ctk.CTkLabel(header, text=f"Carpeta: {server.config.path}", text_color="#9ca3af")
+        status.pack(anchor="w", padx=16, pady=(0, 6))
+
+        controls = ctk.CTkFrame(header, fg_color="transparent")
+        controls.pack(fill="x", padx=16, pady=(0, 12))
+        nbt_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(controls, text="Contar entidades (más lento)", variable=nbt_var)\
+            .pack(side="left")
+
+        tabs = ctk.CTkTabview(win, corner_radius=16)
+        tabs.pack(fill="both", expand=True, padx=16, pady=(0, 16))
+        tab_dims = tabs.add("Dimensiones")
+        tab_size = tabs.add("Más pesados")
+        tab_ents = tabs.add("Más entidades")
+        self._world_prune_tab(tabs.add("Podar"), server)
+        self._world_backup_tab(tabs.add("Copias"), server)
+        self._world_jobs_tab(tabs.add("Tareas"), server)
+
+        def run():
+            scan_btn.configure(state="disabled")
+            nbt = nbt_var.get()
+            path = server.config.path
+
+            def progress(done, total):
+                if done % 16 == 0 or done == total:
+                    self.after(0, lambda: status.configure(text=f"Analizando regiones... {done}/{total}"))
+
+            def work(job):
+                return scan_world(path, nbt=nbt, progress=progress, job=job)
+
+            def done(report, error):
+                self.after(0, lambda: show(report, error, job.finished - job.started))
+
+            job = JOBS.submit(MaintenanceJob("scan", "Análisis de regiones", server, work, on_done=done))
+
+        def show(report, error, elapsed):
+            if not win.winfo_exists():
+                return
+            scan_btn.configure(state="normal")
+            if error:
+                status.configure(text=f"Análisis detenido: {error}")
+                return
+            chunks = sum(d["chunks"] for d in report["dims"])
+            status.configure(text=f"{report['regions']} regiones, {chunks} chunks en {elapsed:.1f}s")
+            self._world_dims_table(tab_dims, report)
+            self._world_chunks_table(tab_size, report["top_size"], report["nbt"])
+            if report["nbt"]:
+                self._world_chunks_table(tab_ents, report["top_entities"], True)
+            else:
+                self._world_clear(tab_ents)
+                ctk.CTkLabel(tab_ents, text="Marca \"Contar entidades\" para leer el NBT de cada chunk.",
+                             text_color="#9ca3af").pack(anchor="w", padx=8, pady=8)
+
+        scan_btn = ctk.CTkButton(controls, text="🔍 Analizar", width=120, command=run)
+        scan_btn.pack(side="right")
+
+    def _world_prune_tab(self, parent, server: ServerRuntime):
+        """Poda offline por InhabitedTime: primero simulación, y solo con el servidor parado."""
+        form = ctk.CTkFrame(parent, fg_color="transparent")
+        form.pack(fill="x", padx=8, pady=(4, 6))
+        ctk.CTkLabel(form, text="Borrar chunks habitados menos de").pack(side="left")
+        secs_var = ctk.StringVar(value="60")
+        ctk.CTkEntry(form, textvariable=secs_var, width=60).pack(side="left", padx=6)
+        ctk.CTkLabel(form, text="segundos (InhabitedTime, suma de todos los jugadores)").pack(side="left")
+
+        ctk.CTkLabel(parent, text="Zonas protegidas, una por línea: [dimensión] x1 z1 x2 z2 (bloques)",
+                     text_color="#9ca3af").pack(anchor="w", padx=8)
+        areas_box = ctk.CTkTextbox(parent, height=80, font=ctk.CTkFont(family="Consolas", size=12))
+        areas_box.pack(fill="x", padx=8, pady=(2, 6))
+        areas_box.insert("1.0", "-512 -512 512 512   # spawn\n")
+
+        buttons = ctk.CTkFrame(parent, fg_color="transparent")
+        buttons.pack(fill="x", padx=8, pady=(0, 6))
+        result = ctk.CTkLabel(parent, text="", text_color="#cbd5e1", wraplength=720, justify="left")
+        result.pack(anchor="w", padx=8, pady=(0, 6))
+        table_host = ctk.CTkFrame(parent, fg_color="transparent")
+        table_host.pack(fill="both", expand=True)
+
+        def run(dry_run: bool):
+            if not dry_run and (server.running or server.offline_job):
+                messagebox.showerror("Podar", "Detén el servidor antes de podar el mundo.")
+                return
+            try:
+                min_ticks = int(float(secs_var.get().replace(",", ".")) * 20)
+                areas = parse_protected_areas(areas_box.get("1.0", "end"))
+            except ValueError as e:
+                messagebox.showerror("Podar", str(e))
+                return
+            if not dry_run and not messagebox.askyesno(
+                "Podar",
+                "Se reescribirán los archivos de región del mundo y los chunks borrados\n"
+                "se regenerarán si alguien vuelve a pasar. ¿Continuar?\n\n"
+                "Haz una copia de seguridad antes."
+            ):
+                return
+            sim_btn.configure(state="disabled")
+            prune_btn.configure(state="disabled")
+            path = server.config.path
+            if not dry_run:
+                server.offline_job = "poda del mundo"
+
+            def progress(done, total):
+                if done % 16 == 0 or done == total:
+                    self.after(0, lambda: result.configure(text=f"Procesando regiones... {done}/{total}"))
+
+            def work(job):
+                return prune_world(path, min_ticks, areas, dry_run=dry_run, progress=progress, job=job)
+
+            def done(report, error):
+                if error:
+                    report = {"dry_run": dry_run, "error": error}
+                self.after(0, lambda: show(report))
+
+            JOBS.submit(MaintenanceJob("prune", "Simulación de poda" if dry_run else "Poda del mundo",
+                                       server, work, on_done=done))
+
+        def show(report):
+            if not report["dry_run"]:
+                server.offline_job = None
+            if not parent.winfo_exists():
+                return
+            sim_btn.configure(state="normal")
+            prune_btn.configure(state="normal" if not server.running else "disabled")
+            if "error" in report:
+                result.configure(text=f"Error al podar: {report['error']}")
+                return
+            verb = "Se borrarían" if report["dry_run"] else "Borrados"
+            result.configure(text=f"{verb} {report['dropped']} chunks  •  "
+                                  f"{format_size(report['saved'])} {'ahorrables' if report['dry_run'] else 'liberados'}")
+            self._world_clear(table_host)
+            table = ctk.CTkScrollableFrame(table_host, corner_radius=16)
+            table.pack(fill="both", expand=True)
+            head_font = ctk.CTkFont(size=12, weight="bold")
+            for col, title in enumerate(("Dimensión", "Chunks", "A borrar", "Ilegibles", "Antes", "Después")):
+                table.grid_columnconfigure(col, weight=2 if col == 0 else 1)
+                ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                    .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+            for i, d in enumerate(report["dims"], start=1):
+                cells = (d["dim"], str(d["chunks"]), str(d["dropped"]), str(d["unreadable"]),
+                         format_size(d["before"]), format_size(d["after"]))
+                for col, text in enumerate(cells):
+                    ctk.CTkLabel(table, text=text).grid(row=i, column=col, sticky="w", padx=6, pady=1)
+
+        sim_btn = ctk.CTkButton(buttons, text="Simular", width=110, command=lambda: run(True))
+        sim_btn.pack(side="left")
+        prune_btn = ctk.CTkButton(buttons, text="✂ Podar", width=110, fg_color="#dc2626",
+                                  hover_color="#b91c1c", command=lambda: run(False),
+                                  state="normal" if not server.running else "disabled")
+        prune_btn.pack(side="left", padx=(10, 0))
+        if server.running:
+            ctk.CTkLabel(buttons, text="Servidor en marcha: solo simulación",
+                         text_color="#f59e0b").pack(side="left", padx=(10, 0))
+
+    def _world_backup_tab(self, parent, server: ServerRuntime):
+        """Copias incrementales: lanzar una ahora, ver el historial y restaurar en otra carpeta."""
+        store = BackupStore(data_path(f"backups_{server.config.id}"))
+        bar = ctk.CTkFrame(parent, fg_color="transparent")
+        bar.pack(fill="x", padx=8, pady=(4, 6))
+        status = ctk.CTkLabel(bar, text="", text_color="#9ca3af")
+        status.pack(side="left")
+        table_host = ctk.CTkFrame(parent, fg_color="transparent")
+        table_host.pack(fill="both", expand=True)
+
+        def restore(snap_id: str):
+            target = filedialog.askdirectory(title="Carpeta vacía donde restaurar la copia")
+            if not target:
+                return
+            if os.listdir(target):
+                messagebox.showerror("Restaurar", "Elige una carpeta vacía: la copia no sobrescribe mundos.")
+                return
+            status.configure(text=f"Restaurando {snap_id}...")
+
+            def work():
+                try:
+                    n = store.restore(snap_id, target)
+                    msg = f"Restaurados {n} archivos en {target}"
+                except Exception as e:
+                    msg = f"Error al restaurar: {e}"
+                self.after(0, lambda: status.configure(text=msg) if parent.winfo_exists() else None)
+
+            threading.Thread(target=work, daemon=True).start()
+
+        def render():
+            self._world_clear(table_host)
+            snaps = store.snapshots()
+            if not snaps:
+                ctk.CTkLabel(table_host, text="Todavía no hay copias de este servidor.",
+                             text_color="#9ca3af").pack(anchor="w", padx=8, pady=8)
+                return
+            table = ctk.CTkScrollableFrame(table_host, corner_radius=16)
+            table.pack(fill="both", expand=True)
+            head_font = ctk.CTkFont(size=12, weight="bold")
+            titles = ("Fecha", "Archivos", "Cambiados", "Tamaño", "Nuevo", "Save-off", "")
+            for col, title in enumerate(titles):
+                table.grid_columnconfigure(col, weight=2 if col == 0 else 1)
+                ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                    .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+            for i, snap in enumerate(reversed(snaps), start=1):
+                cells = (
+                    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snap["ts"])),
+                    str(snap["files"]), str(snap["changed"]), format_size(snap["size"]),
+                    format_size(snap["new_bytes"]),
+                    f"{snap['save_off_s']:.1f}s" if "save_off_s" in snap else "—",
+                )
+                for col, text in enumerate(cells):
+                    ctk.CTkLabel(table, text=text).grid(row=i, column=col, sticky="w", padx=6, pady=1)
+                ctk.CTkButton(table, text="Restaurar", width=90, fg_color="#374151",
+                              command=lambda sid=snap["id"]: restore(sid))\
+                    .grid(row=i, column=6, sticky="e", padx=6, pady=1)
+
+        def done(summary, error):
+            if not parent.winfo_exists():
+                return
+            backup_btn.configure(state="normal")
+            if error:
+                status.configure(text=f"Error: {error}")
+            else:
+                status.configure(text=f"Copia {summary['id']}: {format_size(summary['new_bytes'])} nuevos "
+                                      f"en {summary['duration']:.1f}s")
+            render()
+
+        def start():
+            if not self.backup_server(server, on_done=done):
+                status.configure(text=f"Ocupado: {server.offline_job}")
+                return
+            backup_btn.configure(state="disabled")
+            status.configure(text="Copiando..." + (" (save-off)" if server.running else ""))
+
+        backup_btn = ctk.CTkButton(bar, text="💾 Copia ahora", width=130, command=start)
+        backup_btn.pack(side="right")
+        render()
+
+    _JOB_STATES = {
+        "queued": "en cola", "running": "en marcha", "paused": "en pausa",
+        "done": "terminada", "error": "error", "cancelled": "cancelada",
+    }
+
+    def _world_jobs_tab(self, parent, server: ServerRuntime):
+        """Tareas de mantenimiento del servidor: progreso, límite de I/O, pausa y cancelación."""
+        ctk.CTkLabel(parent, text=f"Prioridad baja de CPU/disco. Se frenan solas con \"Can't keep up\" "
+                                  f"o CPU ≥ {JOB_CPU_BACKOFF:.0f}%.",
+                     text_color="#9ca3af").pack(anchor="w", padx=8, pady=(4, 6))
+        table = ctk.CTkScrollableFrame(parent, corner_radius=16)
+        table.pack(fill="both", expand=True)
+        for col, weight in enumerate((3, 2, 1, 1, 1, 1, 1)):
+            table.grid_columnconfigure(col, weight=weight)
+        head_font = ctk.CTkFont(size=12, weight="bold")
+        for col, title in enumerate(("Tarea", "Estado", "Progreso", "Leído", "MB/s", "", "")):
+            ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+
+        rows = {}    # job -> (widgets, labels que se refrescan)
+
+        def build(job, r):
+            widgets = [ctk.CTkLabel(table, text=job.title)]
+            state_lbl, prog_lbl, bytes_lbl = ctk.CTkLabel(table, text=""), ctk.CTkLabel(table, text=""), \
+                ctk.CTkLabel(table, text="")
+            widgets += [state_lbl, prog_lbl, bytes_lbl]
+            limit_var = ctk.StringVar(value=f"{job.io_limit / (1024 * 1024):g}")
+            limit_entry = ctk.CTkEntry(table, textvariable=limit_var, width=60)
+
+            def apply_limit(event=None):
+                try:
+                    job.io_limit = max(0, int(float(limit_var.get().replace(",", ".")) * 1024 * 1024))
+                except ValueError:
+                    limit_var.set(f"{job.io_limit / (1024 * 1024):g}")
+
+            limit_entry.bind("<Return>", apply_limit)
+            limit_entry.bind("<FocusOut>", apply_limit)
+            pause_btn = ctk.CTkButton(table, text="⏸", width=36, fg_color="#374151",
+                                      command=lambda: job.resume() if job.paused else job.pause())
+            cancel_btn = ctk.CTkButton(table, text="✕", width=36, fg_color="#dc2626",
+                                       hover_color="#b91c1c", command=job.cancel)
+            widgets += [limit_entry, pause_btn, cancel_btn]
+            for col, w in enumerate(widgets):
+                w.grid(row=r, column=col, sticky="w", padx=6, pady=1)
+            rows[job] = (widgets, state_lbl, prog_lbl, bytes_lbl, pause_btn, cancel_btn)
+
+        def refresh():
+            if not parent.winfo_exists():
+                return
+            jobs = JOBS.for_server(server)
+            if list(rows) != jobs:
+                for widgets, *_ in rows.values():
+                    for w in widgets:
+                        w.destroy()
+                rows.clear()
+                for r, job in enumerate(jobs, start=1):
+                    build(job, r)
+            for job, (_, state_lbl, prog_lbl, bytes_lbl, pause_btn, cancel_btn) in rows.items():
+                text = self._JOB_STATES.get(job.state, job.state)
+                color = None
+                if job.finished is None and job.backing_off:
+                    text += f" (frenada ×{job.factor:g})"
+                    color = "#f59e0b"
+                elif job.state == "error":
+                    text += f": {job.error}"
+                    color = "#ef4444"
+                state_lbl.configure(text=text, text_color=color or "#e5e7eb")
+                done, total = job.progress
+                prog_lbl.configure(text=f"{done}/{total}" if total else "—")
+                bytes_lbl.configure(text=format_size(job.bytes_done))
+                live = job.finished is None
+                pause_btn.configure(text="▶" if job.paused else "⏸", state="normal" if live else "disabled")
+                cancel_btn.configure(state="normal" if live else "disabled")
+            self.after(1000, refresh)
+
+        refresh()
 
-        # reconstrucción simple (ops suelen ser pocos)
+    @staticmethod
+    def _world_clear(parent):
         for w in parent.winfo_children():
             w.destroy()
 
-        visible = 0
-        for op in ops:
-            card = self._players_ui_make_ops_card(parent, op)
-            card.grid(row=visible, column=0, sticky="ew", padx=10, pady=6)
-            visible += 1
+    def _world_dims_table(self, parent, report: dict):
+        self._world_clear(parent)
+        if not report["dims"]:
+            ctk.CTkLabel(parent, text="No se encontraron carpetas region/ con archivos .mca.",
+                         text_color="#9ca3af").pack(anchor="w", padx=8, pady=8)
+            return
+        table = ctk.CTkScrollableFrame(parent, corner_radius=16)
+        table.pack(fill="both", expand=True)
+        titles = ["Dimensión", "Regiones", "Chunks", "En disco", "Datos", "Externos", "Corruptos"]
+        if report["nbt"]:
+            titles += ["Entidades", "Tiles"]
+        head_font = ctk.CTkFont(size=12, weight="bold")
+        for col, title in enumerate(titles):
+            table.grid_columnconfigure(col, weight=2 if col == 0 else 1)
+            ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+        for i, d in enumerate(report["dims"], start=1):
+            cells = [d["dim"], str(d["regions"]), str(d["chunks"]), format_size(d["bytes"]),
+                     format_size(d["used"]), str(d["external"]), str(d["corrupt"])]
+            if report["nbt"]:
+                cells += [str(d["entities"]), str(d["tiles"])]
+            for col, text in enumerate(cells):
+                kw = {"text_color": "#ef4444"} if col in (5, 6) and text != "0" else {}
+                ctk.CTkLabel(table, text=text, **kw).grid(row=i, column=col, sticky="w", padx=6, pady=1)
+
+    def _world_chunks_table(self, parent, rows: list[tuple], nbt: bool):
+        """rows = [(bytes, dimensión, cx, cz, externo, entidades, tiles)]."""
+        self._world_clear(parent)
+        table = ctk.CTkScrollableFrame(parent, corner_radius=16)
+        table.pack(fill="both", expand=True)
+        titles = ["Dimensión", "Chunk", "Bloque (x, z)", "Tamaño"] + (["Entidades", "Tiles"] if nbt else [])
+        head_font = ctk.CTkFont(size=12, weight="bold")
+        for col, title in enumerate(titles):
+            table.grid_columnconfigure(col, weight=2 if col == 0 else 1)
+            ctk.CTkLabel(table, text=title, font=head_font, text_color="#cbd5e1")\
+                .grid(row=0, column=col, sticky="w", padx=6, pady=(4, 6))
+        for i, (size, dim, cx, cz, external, entities, tiles) in enumerate(rows, start=1):
+            cells = [dim, f"{cx}, {cz}", f"{cx * 16}, {cz * 16}",
+                     format_size(size) + (" (.mcc)" if external else "")]
+            if nbt:
+                cells += ["—" if entities is None else str(entities), "—" if tiles is None else str(tiles)]
+            for col, text in enumerate(cells):
+                kw = {"text_color": "#ef4444"} if col == 3 and size >= CHUNK_OVERSIZED else {}
+                ctk.CTkLabel(table, text=text, **kw).grid(row=i, column=col, sticky="w", padx=6, pady=1)
 
-        ui["counter_label"].configure(text=f"{visible} ops")
     # ===================== PLUGINS =====================
     def open_plugins_manager(self, server: ServerRuntime):
         self.current_plugins = server.config.id
@@ -2178,15 +6630,59 @@ class EsparcraftLauncher(ctk.CTk):
                     "file": file,
                     "name": name,
                     "enabled": enabled,
-                    "path": os.path.join(plugins_dir, file)
+                    "path": os.path.join(plugins_dir, file),
+                    "meta": None,
                 })
         except FileNotFoundError:
             pass
 
+        # metadatos (plugin.yml): de la cache con un stat; el resto en segundo plano
+        if self._plugin_meta_cache is None:
+            self._plugin_meta_cache = load_plugin_meta_cache()
+        missing = []
+        for it in items:
+            it["meta"] = cached_plugin_meta(it["path"], self._plugin_meta_cache)
+            if it["meta"] is None:
+                missing.append(it["path"])
+        if missing:
+            self._plugins_scan_async(plugins_dir, missing)
+
         items.sort(key=lambda x: x["name"].lower())
         self._plugins_cache[plugins_dir] = items
         return items
 
+    def _plugins_scan_async(self, plugins_dir: str, jar_paths: list[str]):
+        """Lee plugin.yml de los jars sin cache en un pool y repinta la vista al terminar."""
+        if plugins_dir in self._plugins_scanning:
+            return
+        self._plugins_scanning.add(plugins_dir)
+
+        def work():
+            # la cache compartida solo se toca en el hilo de la UI (_plugins_apply_meta)
+            results = []
+            try:
+                with PERF.measure("plugins_scan"):
+                    results = scan_plugins_meta(jar_paths)
+            finally:
+                self.after(0, lambda: self._plugins_apply_meta(plugins_dir, results))
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _plugins_apply_meta(self, plugins_dir: str, results: list[tuple]):
+        try:
+            metas = merge_plugin_meta(self._plugin_meta_cache, results) if results else {}
+        finally:
+            self._plugins_scanning.discard(plugins_dir)
+        items = self._plugins_cache.get(plugins_dir)
+        if items is None or not metas:
+            return
+        for it in items:
+            if it["path"] in metas:
+                it["meta"] = metas[it["path"]]
+        view = self._plugins_view
+        if view and view["dir"] == plugins_dir:
+            view["render"]()
+
 
     def _toggle_plugin_file(self, plugins_dir: str, filename: str, enabled: bool):
         src = os.path.join(plugins_dir, filename)
@@ -2218,7 +6714,9 @@ class EsparcraftLauncher(ctk.CTk):
 
         server = self.servers[self.current_plugins]
         plugins_dir = os.path.join(server.config.path, "plugins")
-        os.makedirs(plugins_dir, exist_ok=True)
+        if not os.path.isdir(plugins_dir):
+            os.makedirs(plugins_dir, exist_ok=True)
+            self._watch_server(server)
 
         # ---------- Layout base ----------
         root = ctk.CTkFrame(self.content, corner_radius=0)
@@ -2398,6 +6896,34 @@ class EsparcraftLauncher(ctk.CTk):
                     text_color="#9ca3af"
                 ).pack(anchor="w", pady=(2, 0))
 
+                # metadatos de plugin.yml / paper-plugin.yml
+                meta = it.get("meta")
+                if meta is None:
+                    meta_text = "Leyendo plugin.yml..."
+                elif meta.get("error"):
+                    meta_text = f"⚠ {meta['error']}"
+                else:
+                    parts = []
+                    if meta.get("version"):
+                        parts.append(f"v{meta['version']}")
+                    if meta.get("authors"):
+                        parts.append(", ".join(meta["authors"][:3]))
+                    if meta.get("api_version"):
+                        parts.append(f"API {meta['api_version']}")
+                    if meta.get("paper"):
+                        parts.append("Paper")
+                    meta_text = "  •  ".join(parts)
+                if meta_text:
+                    ctk.CTkLabel(left, text=meta_text, text_color="#9ca3af",
+                                 font=ctk.CTkFont(size=11)).pack(anchor="w")
+                if meta and (meta.get("depend") or meta.get("softdepend")):
+                    deps = ", ".join(meta.get("depend", []))
+                    soft = ", ".join(meta.get("softdepend", []))
+                    dep_text = "  •  ".join(t for t in (f"Requiere: {deps}" if deps else "",
+                                                        f"Opcional: {soft}" if soft else "") if t)
+                    ctk.CTkLabel(left, text=dep_text, text_color="#6b7280",
+                                 font=ctk.CTkFont(size=11)).pack(anchor="w")
+
                 # Derecha (badge + switch + menu)
                 right = ctk.CTkFrame(card, fg_color="transparent")
                 right.grid(row=0, column=1, sticky="e", padx=14, pady=12)
@@ -2457,16 +6983,11 @@ class EsparcraftLauncher(ctk.CTk):
 
         # eventos
         def schedule_render(*_):
-            if self._players_search_after_id is not None:
+            if self._plugins_search_after_id is not None:
                 try:
-                    self.after_cancel(self._players_search_after_id)
+                    self.after_cancel(self._plugins_search_after_id)
                 except Exception:
                     pass
-            self._players_search_after_id = self.after(
-                120,
-                lambda: (setattr(server, "players_dirty", False),
-                        self._players_render_current(root, server, search_var.get(), tab_var.get(), list_frame, counter_label))
-            )
 
             # programa un render corto (debounce)
             self._plugins_search_after_id = self.after(140, render)
@@ -2478,6 +6999,11 @@ class EsparcraftLauncher(ctk.CTk):
         search_var.trace_add("write", on_search)                                 
         filter_menu.configure(command=lambda *_: render())
 
+        def render_if_alive():
+            if list_frame.winfo_exists():
+                render()
+
+        self._plugins_view = {"server_id": server.config.id, "dir": plugins_dir, "render": render_if_alive}
         render()
 
     # ===================== DATA =====================
@@ -2494,10 +7020,106 @@ class EsparcraftLauncher(ctk.CTk):
             for data in json.load(f):
                 cfg = ServerConfig(**data)
                 self.servers[cfg.id] = ServerRuntime(cfg)
+                self._attach_storage(self.servers[cfg.id])
+                self._watch_server(self.servers[cfg.id])
+
+    SERVER_WATCH_FILES = {"usercache.json", "ops.json", "banned-players.json", "whitelist.json", "server.properties"}
+
+    def _watch_server(self, server: ServerRuntime):
+        """(Re)registra la raíz y plugins/ del servidor en el watcher."""
+        key = server.config.id
+        self._fs_watcher.unwatch(key)
+        root = (server.config.path or "").strip()
+        if not root or not os.path.isdir(root):
+            return
+        self._fs_watcher.watch(key, root, self.SERVER_WATCH_FILES)
+        plugins_dir = os.path.join(root, "plugins")
+        if os.path.isdir(plugins_dir):
+            self._fs_watcher.watch(key, plugins_dir)
+        JSON_CACHE.trusted_dirs = self._fs_watcher.trusted_dirs()
+
+    def _on_fs_untrust(self, directories: Optional[set]):
+        # hilo del watcher: se sustituye el set entero (asignación atómica) para que
+        # el hilo de UI vuelva a validar por stat antes de que llegue la recarga
+        if directories is None:
+            JSON_CACHE.trusted_dirs = set()
+        else:
+            JSON_CACHE.trusted_dirs = JSON_CACHE.trusted_dirs - directories
+
+    def _on_fs_changes(self, key: str, changes: dict):
+        # hilo del watcher -> hilo de UI
+        try:
+            self.after(0, lambda: self._apply_fs_changes(key, changes))
+        except RuntimeError:
+            pass   # ventana ya destruida
+
+    def _apply_fs_changes(self, key: str, changes: dict):
+        server = self.servers.get(key)
+        if server is None:
+            return
+        root = os.path.abspath(server.config.path)
+        plugins_dir = os.path.join(server.config.path, "plugins")
+
+        for directory, names in changes.items():
+            if directory == os.path.abspath(plugins_dir):
+                self._plugins_cache.pop(plugins_dir, None)
+                view = self._plugins_view
+                if view and view["server_id"] == key:
+                    view["render"]()
+            elif directory == root:
+                if names is None:
+                    # watch perdido o eventos desbordados: cualquier fichero pudo cambiar
+                    names = set(self.SERVER_WATCH_FILES)
+                for name in names:
+                    JSON_CACHE.invalidate(os.path.join(server.config.path, name))
+                if names & {"usercache.json", "ops.json", "banned-players.json"}:
+                    if "usercache.json" in names:
+                        self._load_usercache(server)
+                    server.players_dirty = True   # el loop de la vista de jugadores re-sincroniza
+                    if self.console_widget is not None and getattr(self, "_sidebar_players_state", None):
+                        self._sidebar_players_render()
+
+        # ya invalidadas: las carpetas con watch vivo vuelven a ser de confianza
+        reread = {d for d, names in changes.items() if names is None}
+        if reread:
+            JSON_CACHE.trusted_dirs = JSON_CACHE.trusted_dirs | (reread & self._fs_watcher.trusted_dirs())
+
+    def _attach_storage(self, server: ServerRuntime):
+        """Historial persistente del servidor en data_path: sesiones (players_<id>.db) y arranques (boots_<id>.json)."""
+        if server.sessions is None:
+            server.sessions = PlayerSessionDB(data_path(f"players_{server.config.id}.db"))
+            server.sessions.start()
+        if server.boot_history is None:
+            server.boot_history = BootHistory(data_path(f"boots_{server.config.id}.json"))
+
+    def _sessions_preload(self, server: ServerRuntime):
+        """Jugadores conocidos de sesiones anteriores -> registro en memoria."""
+        self._load_usercache(server)
+        if server.sessions is None:
+            return
+        try:
+            for name in server.sessions.known_names():
+                server.players.add_known(name)
+        except Exception:
+            pass
+
+    def _on_close(self):
+        self._fs_watcher.stop()
+        for server in self.servers.values():
+            if server.sessions is not None:
+                server.sessions.close()
+        self.destroy()
 
     def _clear_content(self):
         self.console_widget = None
+        self._plugins_view = None
+        # el dashboard se conserva (solo se oculta) para no reconstruir tarjetas
+        dash = getattr(self, "_dash", None)
+        keep = dash["root"] if dash else None
         for w in self.content.winfo_children():
+            if w is keep:
+                w.pack_forget()
+                continue
             w.destroy()
 
             
@@ -2527,7 +7149,9 @@ class EsparcraftLauncher(ctk.CTk):
         tabview = ctk.CTkTabview(frame)
         tabview.pack(fill="both", expand=True)
 
-        tab_config = tabview.add("Configuración")
+        # con recursos y perfil JVM ya no cabe: la pestaña de configuración hace scroll
+        tab_config = ctk.CTkScrollableFrame(tabview.add("Configuración"), fg_color="transparent")
+        tab_config.pack(fill="both", expand=True)
         tab_props = tabview.add("server.properties")
 
         cfg = server.config if server else None
@@ -2599,10 +7223,28 @@ class EsparcraftLauncher(ctk.CTk):
             variable=auto_restart_var
         ).pack(anchor="w", pady=15)
 
-        ctk.CTkLabel(tab_config, text="Argumentos JVM adicionales").pack(anchor="w", pady=(15, 0))
+        # Perfil de ajuste de la JVM (genera los flags según RAM, Java y CPUs)
+        ctk.CTkLabel(tab_config, text="Perfil JVM").pack(anchor="w", pady=(15, 0))
+        profile_choices = {"Ninguno (solo flags propios)": ""}
+        for key, prof in JVM_PROFILES.items():
+            profile_choices[f"{prof['title']} (v{max(prof['versions'])})"] = key
+        cur_profile, cur_pin = parse_jvm_profile(cfg.jvm_profile if cfg else "g1-minecraft")
+        profile_var = ctk.StringVar(
+            value=next((k for k, v in profile_choices.items() if v == cur_profile), "Ninguno (solo flags propios)"))
+        profile_row = ctk.CTkFrame(tab_config, fg_color="transparent")
+        profile_row.pack(fill="x", pady=5)
+        ctk.CTkOptionMenu(profile_row, variable=profile_var, values=list(profile_choices.keys()))\
+            .pack(side="left", fill="x", expand=True)
+        # fijar la versión actual del perfil: no cambia al actualizar el launcher
+        pin_version = cur_pin
+        pin_var = ctk.BooleanVar(value=cur_pin is not None)
+        pin_check = ctk.CTkCheckBox(profile_row, text="Fijar versión", variable=pin_var)
+        pin_check.pack(side="left", padx=(10, 0))
+
+        ctk.CTkLabel(tab_config, text="Flags propios (sustituyen a los del perfil)").pack(anchor="w", pady=(10, 0))
         ctk.CTkLabel(
             tab_config, 
-            text="(Ej: -Djava.net.preferIPv4Stack=true -XX:+UseG1GC)",
+            text='(Ej: -XX:MaxGCPauseMillis=100 "-Dmi.prop=con espacios"  !-XX:+AlwaysPreTouch para quitar uno)',
             font=ctk.CTkFont(size=11),
             text_color="#9ca3af"
         ).pack(anchor="w")
@@ -2612,6 +7254,103 @@ class EsparcraftLauncher(ctk.CTk):
         if cfg:
             jvm_args.insert(0, cfg.jvm_args)  # Carga los args si existen
 
+        def selected_profile() -> str:
+            key = profile_choices.get(profile_var.get(), "")
+            if not key or not pin_var.get():
+                return key
+            versions = JVM_PROFILES[key]["versions"]
+            version = pin_version if key == cur_profile and pin_version in versions else max(versions)
+            return f"{key}@{version}"
+
+        # Runtime Java (Automático = según el jar del servidor)
+        ctk.CTkLabel(tab_config, text="Java").pack(anchor="w", pady=(10, 0))
+        java_choices = {"Automático": ""}
+        for r in self.java_runtimes:
+            java_choices[f"Java {r['major']} — {r['path']}"] = r["path"]
+        if cfg and cfg.java and cfg.java not in java_choices.values():
+            java_choices[f"Java ? — {cfg.java}"] = cfg.java
+
+        current_java = next((k for k, v in java_choices.items() if cfg and v == cfg.java), "Automático")
+        java_var = ctk.StringVar(value=current_java)
+        ctk.CTkOptionMenu(
+            tab_config,
+            variable=java_var,
+            values=list(java_choices.keys())
+        ).pack(fill="x", pady=5)
+
+        # Recursos: afinidad, prioridad y límites cgroup (Linux)
+        ctk.CTkLabel(tab_config, text="CPUs").pack(anchor="w", pady=(10, 0))
+        ctk.CTkLabel(
+            tab_config,
+            text=f"(vacío = todas, auto = reparto automático, ej: 0-3,8-11 — {os.cpu_count() or '?'} CPUs)",
+            font=ctk.CTkFont(size=11),
+            text_color="#9ca3af"
+        ).pack(anchor="w")
+        affinity_var = ctk.StringVar(value=cfg.cpu_affinity if cfg else "")
+        ctk.CTkEntry(tab_config, textvariable=affinity_var).pack(fill="x", pady=5)
+        if cfg and cfg.cpu_affinity.strip().lower() == "auto":
+            planned = self._affinity_plan().get(cfg.id)
+            if planned:
+                ctk.CTkLabel(tab_config, text=f"Plan actual: CPUs {format_cpu_list(planned)}",
+                             font=ctk.CTkFont(size=11), text_color="#9ca3af").pack(anchor="w")
+
+        ctk.CTkLabel(tab_config, text="Prioridad del proceso").pack(anchor="w", pady=(10, 0))
+        priority_var = ctk.StringVar(value=cfg.priority if cfg and cfg.priority in PROCESS_PRIORITIES else "normal")
+        ctk.CTkOptionMenu(tab_config, variable=priority_var, values=list(PROCESS_PRIORITIES)).pack(fill="x", pady=5)
+
+        limits_row = ctk.CTkFrame(tab_config, fg_color="transparent")
+        limits_row.pack(fill="x", pady=(10, 0))
+        ctk.CTkLabel(limits_row, text="Límite CPUs (cgroup)").pack(side="left")
+        cpu_limit_var = ctk.StringVar(value=f"{cfg.cpu_limit:g}" if cfg else "0")
+        ctk.CTkEntry(limits_row, textvariable=cpu_limit_var, width=60).pack(side="left", padx=(6, 16))
+        ctk.CTkLabel(limits_row, text="Límite RAM GB (cgroup)").pack(side="left")
+        mem_limit_var = ctk.StringVar(value=str(cfg.memory_limit_gb) if cfg else "0")
+        ctk.CTkEntry(limits_row, textvariable=mem_limit_var, width=60).pack(side="left", padx=6)
+        ctk.CTkLabel(tab_config, text="(0 = sin límite; solo Linux con cgroup v2)",
+                     font=ctk.CTkFont(size=11), text_color="#9ca3af").pack(anchor="w")
+
+        # Vista previa de la línea de comandos final
+        ctk.CTkLabel(tab_config, text="Línea de comandos").pack(anchor="w", pady=(10, 0))
+        preview = ctk.CTkTextbox(tab_config, height=110, wrap="word",
+                                 font=ctk.CTkFont(family="Consolas", size=11))
+        preview.pack(fill="x", pady=5)
+        preview_job = {"id": None}
+
+        def refresh_preview():
+            preview_job["id"] = None
+            try:
+                tmp = ServerConfig(
+                    id=cfg.id if cfg else "preview", name=name.get(), jar=jar_var.get(), path=path_var.get(),
+                    ram_min=ram_min_val.get(), ram_max=ram_max_val.get(), jvm_args=jvm_args.get(),
+                    java=java_choices.get(java_var.get(), ""), jvm_profile=selected_profile(),
+                )
+                spec = affinity_var.get().strip().lower()
+                cpus = None
+                if spec == "auto" and cfg:
+                    cpus = self._affinity_plan().get(cfg.id)
+                elif spec and spec != "auto":
+                    cpus = parse_cpu_list(spec)
+                cmd, notes = self._server_command(server, cpus, cfg=tmp, blocking=False)
+                text = format_command_line(cmd) if cmd else "Java no encontrado"
+                if notes:
+                    text += "\n\n" + "\n".join(f"• {n}" for n in notes)
+            except ValueError as e:
+                text = f"Argumentos inválidos: {e}"
+            preview.configure(state="normal")
+            preview.delete("1.0", "end")
+            preview.insert("1.0", text)
+            preview.configure(state="disabled")
+
+        def schedule_preview(*_):
+            if preview_job["id"] is not None:
+                modal.after_cancel(preview_job["id"])
+            preview_job["id"] = modal.after(250, refresh_preview)
+
+        for var in (profile_var, pin_var, java_var, affinity_var, jar_var, path_var, ram_min_val, ram_max_val):
+            var.trace_add("write", schedule_preview)
+        jvm_args.bind("<KeyRelease>", schedule_preview)
+        refresh_preview()
+
         # =====================================================
         #    ESTADO PARA server.properties Y VARIABLES DE UI
         # =====================================================
@@ -2983,6 +7722,21 @@ class EsparcraftLauncher(ctk.CTk):
         # =====================================================
 
         def save():
+            affinity = affinity_var.get().strip()
+            try:
+                split_jvm_args(jvm_args.get())
+            except ValueError as e:
+                messagebox.showerror("Argumentos JVM", f"Revisa las comillas de los flags propios: {e}")
+                return
+            try:
+                if affinity and affinity.lower() != "auto":
+                    parse_cpu_list(affinity)
+                cpu_limit = max(0.0, float(cpu_limit_var.get().replace(",", ".") or 0))
+                memory_limit = max(0, int(mem_limit_var.get() or 0))
+            except ValueError:
+                messagebox.showerror("Recursos", "Revisa las CPUs y los límites: deben ser números.")
+                return
+
             new_cfg = ServerConfig(
                 id=cfg.id if cfg else str(uuid4()),
                 name=name.get(),
@@ -2991,13 +7745,21 @@ class EsparcraftLauncher(ctk.CTk):
                 ram_min=ram_min_val.get(),
                 ram_max=ram_max_val.get(),
                 auto_restart=auto_restart_var.get(),
-                jvm_args=jvm_args.get()  # 👈 GUARDAMOS LOS ARGUMENTOS
+                jvm_args=jvm_args.get(),  # 👈 GUARDAMOS LOS ARGUMENTOS
+                jvm_profile=selected_profile(),
+                java=java_choices.get(java_var.get(), ""),
+                cpu_affinity=affinity,
+                priority=priority_var.get(),
+                cpu_limit=cpu_limit,
+                memory_limit_gb=memory_limit,
             )
 
             if cfg and cfg.id in self.servers:
                 self.servers[cfg.id].config = new_cfg
             else:
                 self.servers[new_cfg.id] = ServerRuntime(new_cfg)
+                self._attach_storage(self.servers[new_cfg.id])
+            self._watch_server(self.servers[new_cfg.id])
 
             self._save_servers()
 
@@ -3065,5 +7827,32 @@ class EsparcraftLauncher(ctk.CTk):
 
 
 # ===================== MAIN =====================
+_APP_CLASS = None
+
+
+def launcher_app_class():
+    """
+    Clase de la ventana, creada al pedirla: importar el módulo (bench/replay.py,
+    bench/startup.py) no carga customtkinter ni Tk.
+    """
+    global _APP_CLASS
+    if _APP_CLASS is None:
+        ctk.set_appearance_mode("dark")
+        ctk.set_default_color_theme("dark-blue")
+
+        class EsparcraftLauncher(_LauncherApp, ctk.CTk):
+            __qualname__ = "EsparcraftLauncher"
+
+        _APP_CLASS = EsparcraftLauncher
+    return _APP_CLASS
+
+
+def __getattr__(name):
+    # launcher.EsparcraftLauncher sigue existiendo para quien importa el módulo
+    if name == "EsparcraftLauncher":
+        return launcher_app_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
-    EsparcraftLauncher().mainloop()
+    launcher_app_class()().mainloop()
@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=['customtkinter', 'psutil'],   # se importan en diferido (_LazyModule)
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],